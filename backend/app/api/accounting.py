@@ -0,0 +1,1233 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.core.database import get_db, get_tenant_db
+from app.core.middleware import require_auth, get_tenant_company, require_company_admin
+from app.schemas.accounting import (
+    JournalEntryPage, JournalEntryLinePage, TransactionPage, BulkReversalRequest, BulkReversalResponse,
+    TransactionResponse, CreateTransactionRequest, ImportTransactionsRequest,
+    ImportTransactionsResponse, DuplicateTransactionGroup,
+    QueuePostingsRequest, QueuePostingsResponse, QueuedPostingResponse,
+    BalanceSnapshotRequest, BalanceSnapshotResponse, BalanceSeriesResponse,
+    DashboardSummaryResponse, RollupRebuildResponse,
+    ProjectionStatus, ProjectionRebuildResponse, ProjectedBalanceResponse, ChainVerificationResponse,
+    PeriodCloseRequest, PeriodCloseResponse, PeriodCloseResult,
+    LedgerArchiveRequest, LedgerArchiveResponse,
+    UpsertFxRatesRequest, FetchFxRatesRequest, UpsertFxRatesResponse, FxRateResponse,
+    TrialBalanceResponse, UpsertBudgetsRequest, UpsertBudgetsResponse, BudgetResponse, BudgetVsActualResponse,
+    CreateCategorizationRuleRequest, CategorizationRuleResponse, CategorizationPreviewRequest, CategorizationPreviewResult,
+    SearchPage
+)
+from app.services.ledger_service import list_journal_entries, list_journal_entry_lines, list_transactions
+from app.services.search_service import search_descriptions
+from app.services.statement_service import get_statement_account, stream_account_statement
+from app.services.accounting_service import (
+    create_balance_snapshots, create_transaction_with_journal, import_transactions,
+    find_unbalanced_entries
+)
+from app.services.reversal_service import reverse_journal_entries
+from app.services.dedup_service import DuplicateTransactionError, find_duplicate_transactions
+from app.services.idempotency_service import run_idempotent, IdempotencyKeyMismatchError
+from app.services.posting_queue_service import enqueue_postings, get_queued_posting
+from app.services.fx_service import upsert_rates, load_rates_from_api, list_rates, get_trial_balance
+from app.services.budget_service import upsert_budgets, list_budgets, get_budget_vs_actual
+from app.services.categorization_service import (
+    create_categorization_rule, list_categorization_rules, deactivate_categorization_rule, preview_categorization
+)
+from app.models.company_setting import CompanySetting
+from app.services.balance_series_service import get_balance_series
+from app.services.rollup_service import get_dashboard_summary, rebuild_ledger_rollups
+from app.services.projection_service import get_projection_status, rebuild_projection, get_projected_balances
+from app.services.hash_chain_service import verify_hash_chain, list_chain_verifications
+from app.services.period_close_service import close_period, list_period_closes
+from app.services.archive_service import archive_closed_periods
+from app.services.pagination import InvalidCursorError
+from datetime import date
+from decimal import Decimal
+from typing import Optional, List
+
+router = APIRouter()
+
+@router.get("/journal-entries", response_model=JournalEntryPage)
+async def get_journal_entries(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    is_posted: Optional[bool] = None,
+    chart_account_id: Optional[int] = None,
+    ascending: bool = False,
+    db: Session = Depends(get_db)
+):
+    """List journal entries (keyset paginated on entry_date, id)"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return list_journal_entries(
+                tenant_db,
+                company_id=company.id,
+                limit=limit,
+                cursor=cursor,
+                date_from=date_from,
+                date_to=date_to,
+                is_posted=is_posted,
+                chart_account_id=chart_account_id,
+                ascending=ascending
+            )
+        finally:
+            tenant_db.close()
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching journal entries: {str(e)}"
+        )
+
+@router.get("/journal-entries/unbalanced", response_model=List[int])
+async def get_unbalanced_journal_entries(
+    request: Request,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """Ids of journal entries whose debits and credits do not match (ledger integrity check)"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return find_unbalanced_entries(tenant_db, date_from=date_from, date_to=date_to)
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error checking journal entries: {str(e)}"
+        )
+
+@router.post("/journal-entries/reversals", response_model=BulkReversalResponse)
+async def post_journal_entry_reversals(
+    request_data: BulkReversalRequest,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+):
+    """Reverse every posted journal entry matching the filters in one transaction (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        def reverse():
+            summary = reverse_journal_entries(
+                tenant_db,
+                created_by=person.id,
+                **request_data.model_dump()
+            )
+            return BulkReversalResponse.model_validate(summary).model_dump(mode="json")
+
+        try:
+            result, replayed = run_idempotent(
+                tenant_db, idempotency_key, f"POST {request.url.path}",
+                request_data.model_dump(mode="json"), person.id, reverse
+            )
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return result
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error reversing journal entries: {str(e)}"
+        )
+
+@router.get("/journal-entry-lines", response_model=JournalEntryLinePage)
+async def get_journal_entry_lines(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    chart_account_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    is_posted: Optional[bool] = None,
+    ascending: bool = False,
+    db: Session = Depends(get_db)
+):
+    """List ledger lines (keyset paginated on entry_date, id)"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return list_journal_entry_lines(
+                tenant_db,
+                limit=limit,
+                cursor=cursor,
+                chart_account_id=chart_account_id,
+                date_from=date_from,
+                date_to=date_to,
+                is_posted=is_posted,
+                ascending=ascending
+            )
+        finally:
+            tenant_db.close()
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching journal entry lines: {str(e)}"
+        )
+
+@router.get("/transactions", response_model=TransactionPage)
+async def get_transactions(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    account_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    is_posted: Optional[bool] = None,
+    ascending: bool = False,
+    db: Session = Depends(get_db)
+):
+    """List transactions (keyset paginated on transaction_date, id)"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return list_transactions(
+                tenant_db,
+                limit=limit,
+                cursor=cursor,
+                account_id=account_id,
+                category_id=category_id,
+                date_from=date_from,
+                date_to=date_to,
+                is_posted=is_posted,
+                ascending=ascending
+            )
+        finally:
+            tenant_db.close()
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching transactions: {str(e)}"
+        )
+
+@router.get("/search", response_model=SearchPage)
+async def search(
+    request: Request,
+    q: str = Query(..., max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    sources: Optional[List[str]] = Query(None),
+    account_id: Optional[int] = None,
+    chart_account_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+    db: Session = Depends(get_db)
+):
+    """Search transaction, journal entry and line descriptions (best match first, keyset paginated)"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return search_descriptions(
+                tenant_db,
+                q=q,
+                limit=limit,
+                cursor=cursor,
+                sources=sources,
+                account_id=account_id,
+                chart_account_id=chart_account_id,
+                date_from=date_from,
+                date_to=date_to,
+                min_amount=min_amount,
+                max_amount=max_amount
+            )
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching: {str(e)}"
+        )
+
+@router.post("/transactions", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
+async def post_transaction(
+    request_data: CreateTransactionRequest,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+):
+    """Record a deposit or withdrawal and post its journal entry (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        def create():
+            transaction, _ = create_transaction_with_journal(
+                tenant_db,
+                account_id=request_data.account_id,
+                transaction_type=request_data.transaction_type,
+                amount=request_data.amount,
+                description=request_data.description,
+                transaction_date=request_data.transaction_date,
+                created_by=person.id,
+                company_id=company.id,
+                category_id=request_data.category_id
+            )
+            return TransactionResponse.model_validate(transaction).model_dump(mode="json")
+
+        try:
+            result, replayed = run_idempotent(
+                tenant_db, idempotency_key, f"POST {request.url.path}",
+                request_data.model_dump(mode="json"), person.id, create
+            )
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return result
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except DuplicateTransactionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating transaction: {str(e)}"
+        )
+
+@router.post("/transactions/import", response_model=ImportTransactionsResponse)
+async def post_transactions_import(
+    request_data: ImportTransactionsRequest,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+):
+    """Bulk-record transactions for an account, skipping ones already recorded (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        def import_all():
+            return import_transactions(
+                tenant_db,
+                account_id=request_data.account_id,
+                transactions=[transaction.model_dump() for transaction in request_data.transactions],
+                created_by=person.id,
+                company_id=company.id,
+                tenant_key=company.database_name if request_data.auto_categorize else None
+            )
+
+        try:
+            result, replayed = run_idempotent(
+                tenant_db, idempotency_key, f"POST {request.url.path}",
+                request_data.model_dump(mode="json"), person.id, import_all
+            )
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return result
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error importing transactions: {str(e)}"
+        )
+
+@router.get("/transactions/duplicates", response_model=List[DuplicateTransactionGroup])
+async def get_duplicate_transactions(
+    request: Request,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db)
+):
+    """Groups of already-stored transactions with identical content"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return find_duplicate_transactions(tenant_db, limit=limit)
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error scanning for duplicate transactions: {str(e)}"
+        )
+
+@router.post("/posting-queue", response_model=QueuePostingsResponse, status_code=status.HTTP_202_ACCEPTED)
+async def post_posting_queue(
+    request_data: QueuePostingsRequest,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+):
+    """Accept transactions for asynchronous posting and return their queue ids (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        def enqueue():
+            queue_ids = enqueue_postings(
+                tenant_db,
+                [transaction.model_dump() for transaction in request_data.transactions],
+                created_by=person.id
+            )
+            return {"queue_ids": queue_ids}
+
+        try:
+            result, replayed = run_idempotent(
+                tenant_db, idempotency_key, f"POST {request.url.path}",
+                request_data.model_dump(mode="json"), person.id, enqueue
+            )
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return result
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error queueing postings: {str(e)}"
+        )
+
+@router.get("/posting-queue/{queue_id}", response_model=QueuedPostingResponse)
+async def get_posting_queue_item(
+    queue_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Status of a queued posting"""
+    company = get_tenant_company(request, db)
+
+    tenant_db_gen = get_tenant_db(company.id, company.database_name)
+    tenant_db = next(tenant_db_gen)
+
+    try:
+        item = get_queued_posting(tenant_db, queue_id)
+        if not item:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Queued posting not found"
+            )
+        return item
+    finally:
+        tenant_db.close()
+
+@router.get("/accounts/{account_id}/statement")
+async def get_account_statement(
+    account_id: int,
+    request: Request,
+    date_from: date,
+    date_to: date,
+    db: Session = Depends(get_db)
+):
+    """Stream an account statement with running balances"""
+    company = get_tenant_company(request, db)
+
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must not be before date_from"
+        )
+
+    tenant_db_gen = get_tenant_db(company.id, company.database_name)
+    tenant_db = next(tenant_db_gen)
+
+    try:
+        account, chart_account = get_statement_account(tenant_db, account_id)
+    except ValueError as e:
+        tenant_db.close()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+    def stream():
+        # The session must outlive the endpoint and is closed once streaming ends
+        try:
+            yield from stream_account_statement(tenant_db, account, chart_account, date_from, date_to)
+        finally:
+            tenant_db.close()
+
+    return StreamingResponse(stream(), media_type="application/json")
+
+@router.post("/balance-snapshots", response_model=BalanceSnapshotResponse)
+async def post_balance_snapshots(
+    request_data: BalanceSnapshotRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Snapshot all chart account balances as of a date (admin/owner only)"""
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            count = create_balance_snapshots(tenant_db, request_data.as_of_date)
+            return BalanceSnapshotResponse(as_of_date=request_data.as_of_date, accounts=count)
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating balance snapshots: {str(e)}"
+        )
+
+@router.get("/balances/series", response_model=BalanceSeriesResponse)
+async def get_balances_series(
+    request: Request,
+    date_from: date,
+    date_to: date,
+    chart_account_ids: List[int] = Query(...),
+    interval: str = Query("month", pattern="^(day|week|month)$"),
+    db: Session = Depends(get_db)
+):
+    """Balance matrix for a set of chart accounts over a daily/weekly/monthly date grid"""
+    company = get_tenant_company(request, db)
+
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must not be before date_from"
+        )
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return get_balance_series(tenant_db, chart_account_ids, date_from, date_to, interval)
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error computing balance series: {str(e)}"
+        )
+
+@router.get("/dashboard/summary", response_model=DashboardSummaryResponse)
+async def get_dashboard(
+    request: Request,
+    date_from: date,
+    date_to: date,
+    grain: str = Query("month", pattern="^(day|month)$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Dashboard totals by account, category and period from the rollup cube. The cube is a
+    projection of the event log, so postings show up once the projection worker has
+    applied them (about one PROJECTION_POLL_MS); GET /projections shows the backlog.
+    """
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return get_dashboard_summary(tenant_db, date_from, date_to, grain)
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching dashboard summary: {str(e)}"
+        )
+
+@router.post("/rollups/rebuild", response_model=RollupRebuildResponse)
+async def post_rollups_rebuild(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Rebuild the dashboard rollup cube from posted lines (admin/owner only)"""
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return RollupRebuildResponse(rows=rebuild_ledger_rollups(tenant_db))
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error rebuilding rollups: {str(e)}"
+        )
+
+@router.get("/projections", response_model=List[ProjectionStatus])
+async def get_projections(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Event log checkpoint and backlog of every projected read model"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return get_projection_status(tenant_db)
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching projections: {str(e)}"
+        )
+
+@router.post("/projections/{name}/rebuild", response_model=ProjectionRebuildResponse)
+async def post_projection_rebuild(
+    name: str,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Replay the whole event log into a projection (admin/owner only)"""
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return ProjectionRebuildResponse(name=name, events=rebuild_projection(tenant_db, name))
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error rebuilding projection: {str(e)}"
+        )
+
+@router.get("/balances/projected", response_model=List[ProjectedBalanceResponse])
+async def get_balances_projected(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """All-time balance per chart account from the event-log projection"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return get_projected_balances(tenant_db)
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching projected balances: {str(e)}"
+        )
+
+@router.post("/hash-chain/verify", response_model=ChainVerificationResponse)
+async def post_hash_chain_verify(
+    request: Request,
+    full: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Verify journal entries sealed since the last verification, or the whole chain with full (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return verify_hash_chain(
+                tenant_db, company.id, company.database_name, full=full, created_by=person.id
+            )
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error verifying hash chain: {str(e)}"
+        )
+
+@router.get("/hash-chain/verifications", response_model=List[ChainVerificationResponse])
+async def get_hash_chain_verifications(
+    request: Request,
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """Recent hash chain verification runs, newest first"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return list_chain_verifications(tenant_db, limit)
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching hash chain verifications: {str(e)}"
+        )
+
+@router.get("/period-closes", response_model=List[PeriodCloseResponse])
+async def get_period_closes(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """List closed accounting periods, latest first"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return [PeriodCloseResponse.model_validate(close) for close in list_period_closes(tenant_db)]
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching period closes: {str(e)}"
+        )
+
+@router.post("/period-closes", response_model=PeriodCloseResult)
+async def post_period_close(
+    request_data: PeriodCloseRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Close revenue and expense accounts through a date and lock the period (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return close_period(
+                tenant_db,
+                period_end=request_data.period_end,
+                created_by=person.id,
+                company_id=company.id,
+                year_end=request_data.year_end
+            )
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error closing period: {str(e)}"
+        )
+
+@router.post("/archive", response_model=LedgerArchiveResponse)
+async def post_ledger_archive(
+    request_data: LedgerArchiveRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Move posted lines of closed months to the compressed archive (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return archive_closed_periods(tenant_db, created_by=person.id, through=request_data.through)
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error archiving ledger: {str(e)}"
+        )
+
+@router.get("/fx-rates", response_model=List[FxRateResponse])
+async def get_fx_rates(
+    request: Request,
+    base_currency: Optional[str] = None,
+    quote_currency: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db)
+):
+    """List exchange rates, latest first"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return list_rates(
+                tenant_db,
+                base_currency=base_currency,
+                quote_currency=quote_currency,
+                date_from=date_from,
+                date_to=date_to,
+                limit=limit
+            )
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching exchange rates: {str(e)}"
+        )
+
+@router.post("/fx-rates", response_model=UpsertFxRatesResponse)
+async def post_fx_rates(
+    request_data: UpsertFxRatesRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Add or replace exchange rates (admin/owner only)"""
+    require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            rates = upsert_rates(tenant_db, [rate.model_dump() for rate in request_data.rates], source="api")
+            return {"rates": rates}
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error saving exchange rates: {str(e)}"
+        )
+
+@router.post("/fx-rates/fetch", response_model=UpsertFxRatesResponse)
+async def post_fx_rates_fetch(
+    request_data: FetchFxRatesRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Load daily rates for a base currency from the configured rate API (admin/owner only)"""
+    require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            rates = load_rates_from_api(
+                tenant_db, request_data.base_currency, request_data.date_from, request_data.date_to
+            )
+            return {"rates": rates}
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching exchange rates: {str(e)}"
+        )
+
+@router.get("/trial-balance", response_model=TrialBalanceResponse)
+async def get_trial_balance_report(
+    request: Request,
+    as_of: Optional[date] = None,
+    reporting_currency: Optional[str] = Query(None, min_length=3, max_length=3),
+    db: Session = Depends(get_db)
+):
+    """Trial balance through a date, translated into the reporting currency (default: company currency)"""
+    company = get_tenant_company(request, db)
+    company_setting = db.query(CompanySetting).filter(CompanySetting.company_id == company.id).first()
+    base_currency = company_setting.currency if company_setting else "USD"
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return get_trial_balance(
+                tenant_db,
+                tenant_key=company.database_name,
+                as_of=as_of or date.today(),
+                base_currency=base_currency,
+                reporting_currency=reporting_currency
+            )
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error building trial balance: {str(e)}"
+        )
+
+@router.get("/budgets", response_model=List[BudgetResponse])
+async def get_budgets(
+    request: Request,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    chart_account_ids: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """List budgets by month and chart account"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return list_budgets(tenant_db, date_from=date_from, date_to=date_to, chart_account_ids=chart_account_ids)
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching budgets: {str(e)}"
+        )
+
+@router.post("/budgets", response_model=UpsertBudgetsResponse)
+async def post_budgets(
+    request_data: UpsertBudgetsRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Add or replace monthly budgets per chart account (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            budgets = upsert_budgets(
+                tenant_db, [budget.model_dump() for budget in request_data.budgets], created_by=person.id
+            )
+            return {"budgets": budgets}
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error saving budgets: {str(e)}"
+        )
+
+@router.get("/budget-vs-actual", response_model=BudgetVsActualResponse)
+async def get_budget_vs_actual_report(
+    request: Request,
+    date_from: date,
+    date_to: date,
+    chart_account_ids: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Budget against posted actuals per chart account and month, with variances"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return get_budget_vs_actual(
+                tenant_db,
+                tenant_key=company.database_name,
+                date_from=date_from,
+                date_to=date_to,
+                chart_account_ids=chart_account_ids
+            )
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error building budget vs actual report: {str(e)}"
+        )
+
+@router.get("/categorization-rules", response_model=List[CategorizationRuleResponse])
+async def get_categorization_rules(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """List categorization rules in the order they are tried, with hit statistics"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return list_categorization_rules(tenant_db)
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching categorization rules: {str(e)}"
+        )
+
+@router.post("/categorization-rules", response_model=CategorizationRuleResponse, status_code=status.HTTP_201_CREATED)
+async def post_categorization_rule(
+    request_data: CreateCategorizationRuleRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Create a categorization rule (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return create_categorization_rule(tenant_db, request_data.model_dump(), created_by=person.id)
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating categorization rule: {str(e)}"
+        )
+
+@router.delete("/categorization-rules/{rule_id}", response_model=CategorizationRuleResponse)
+async def delete_categorization_rule(
+    rule_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Deactivate a categorization rule, keeping its hit statistics (admin/owner only)"""
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return deactivate_categorization_rule(tenant_db, rule_id)
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error deactivating categorization rule: {str(e)}"
+        )
+
+@router.post("/categorization-rules/preview", response_model=List[CategorizationPreviewResult])
+async def post_categorization_preview(
+    request_data: CategorizationPreviewRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Show which rule and category the current rules would assign to each row"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return preview_categorization(
+                tenant_db, company.database_name,
+                [transaction.model_dump() for transaction in request_data.transactions]
+            )
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error testing categorization rules: {str(e)}"
+        )
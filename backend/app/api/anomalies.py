@@ -0,0 +1,128 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query, Header
+from sqlalchemy.orm import Session
+from app.core.database import get_db, get_tenant_db
+from app.core.middleware import require_auth, get_tenant_company, require_company_admin
+from app.models.tenant.transaction_anomaly import AnomalySignal, AnomalyStatus
+from app.schemas.anomaly import (
+    TransactionAnomalyResponse, ReviewAnomalyRequest, ScanAnomaliesRequest, ScanAnomaliesResponse
+)
+from app.services.anomaly_service import list_anomalies, review_anomaly, scan_transaction_anomalies
+from app.services.idempotency_service import run_idempotent, IdempotencyKeyMismatchError
+from typing import List, Optional
+
+router = APIRouter()
+
+@router.get("", response_model=List[TransactionAnomalyResponse])
+async def get_anomalies(
+    request: Request,
+    anomaly_status: Optional[AnomalyStatus] = Query(AnomalyStatus.OPEN, alias="status"),
+    signal: Optional[AnomalySignal] = None,
+    account_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Flagged transactions for review, oldest first; page with after_id"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            anomalies = list_anomalies(
+                tenant_db,
+                status=anomaly_status,
+                signal=signal,
+                account_id=account_id,
+                after_id=after_id,
+                limit=limit
+            )
+            return [TransactionAnomalyResponse.model_validate(anomaly) for anomaly in anomalies]
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching anomalies: {str(e)}"
+        )
+
+@router.post("/{anomaly_id}/review", response_model=TransactionAnomalyResponse)
+async def post_anomaly_review(
+    anomaly_id: int,
+    request_data: ReviewAnomalyRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Dismiss, confirm or reopen a flag"""
+    person = require_auth(request, db)
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            anomaly = review_anomaly(tenant_db, anomaly_id, request_data.status, person.id)
+            return TransactionAnomalyResponse.model_validate(anomaly)
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error reviewing anomaly: {str(e)}"
+        )
+
+@router.post("/scan", response_model=ScanAnomaliesResponse)
+async def post_anomaly_scan(
+    request_data: ScanAnomaliesRequest,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+):
+    """Flag transactions posted since the last scan, one batch of ledger events (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        def scan():
+            result = scan_transaction_anomalies(tenant_db, created_by=person.id, batch_size=request_data.batch_size)
+            return ScanAnomaliesResponse.model_validate(result).model_dump(mode="json")
+
+        try:
+            result, replayed = run_idempotent(
+                tenant_db, idempotency_key, f"POST {request.url.path}",
+                request_data.model_dump(mode="json"), person.id, scan
+            )
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return result
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error scanning for anomalies: {str(e)}"
+        )
@@ -0,0 +1,126 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query, Header
+from sqlalchemy.orm import Session
+from app.core.database import get_db, get_tenant_db
+from app.core.middleware import require_auth, get_tenant_company, require_company_admin
+from app.models.tenant.fixed_asset import FixedAsset
+from app.schemas.fixed_asset import (
+    CreateFixedAssetRequest, FixedAssetResponse,
+    DepreciationRunRequest, DepreciationRunResponse
+)
+from app.services.depreciation_service import create_fixed_asset, run_depreciation
+from app.services.idempotency_service import run_idempotent, IdempotencyKeyMismatchError
+from typing import List, Optional
+
+router = APIRouter()
+
+@router.get("", response_model=List[FixedAssetResponse])
+async def list_fixed_assets(
+    request: Request,
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """List fixed assets, paginated by id"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            query = tenant_db.query(FixedAsset).filter(FixedAsset.company_id == company.id)
+            if after_id:
+                query = query.filter(FixedAsset.id > after_id)
+            assets = query.order_by(FixedAsset.id).limit(limit).all()
+            return [FixedAssetResponse.model_validate(asset) for asset in assets]
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching fixed assets: {str(e)}"
+        )
+
+@router.post("", response_model=FixedAssetResponse)
+async def post_fixed_asset(
+    request_data: CreateFixedAssetRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Register a fixed asset (admin/owner only)"""
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            asset = create_fixed_asset(tenant_db, company.id, request_data.model_dump())
+            return FixedAssetResponse.model_validate(asset)
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating fixed asset: {str(e)}"
+        )
+
+@router.post("/depreciation-runs", response_model=DepreciationRunResponse)
+async def post_depreciation_run(
+    request_data: DepreciationRunRequest,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+):
+    """Run and post month-end depreciation for all assets (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        def run():
+            result = run_depreciation(
+                tenant_db,
+                period_end=request_data.period_end,
+                created_by=person.id,
+                company_id=company.id,
+                group_by_asset_group=request_data.group_by_asset_group
+            )
+            return DepreciationRunResponse.model_validate(result).model_dump(mode="json")
+
+        try:
+            result, replayed = run_idempotent(
+                tenant_db, idempotency_key, f"POST {request.url.path}",
+                request_data.model_dump(mode="json"), person.id, run
+            )
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return result
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error running depreciation: {str(e)}"
+        )
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from sqlalchemy.orm import Session
+from app.core.database import get_db, get_tenant_db
+from app.core.middleware import get_tenant_company
+from app.schemas.cashflow import CashflowForecastResponse
+from app.services.cashflow_service import get_cashflow_forecast
+from typing import Optional, List
+
+router = APIRouter()
+
+@router.get("/forecast", response_model=CashflowForecastResponse)
+async def get_forecast(
+    request: Request,
+    periods: int = Query(12, ge=1, le=120),
+    history_months: int = Query(36, ge=3, le=240),
+    account_ids: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Projected monthly cash flows and balances per account"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return get_cashflow_forecast(
+                tenant_db,
+                tenant_key=company.database_name,
+                periods=periods,
+                history_months=history_months,
+                account_ids=account_ids
+            )
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error computing cash flow forecast: {str(e)}"
+        )
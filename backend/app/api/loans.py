@@ -0,0 +1,145 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Header
+from sqlalchemy.orm import Session
+from app.core.database import get_db, get_tenant_db
+from app.core.middleware import require_auth, get_tenant_company, require_company_admin
+from app.models.tenant.loan import Loan
+from app.schemas.loan import (
+    CreateLoanRequest, LoanResponse, LoanScheduleRow,
+    PostLoanPaymentsRequest, PostLoanPaymentsResponse
+)
+from app.services.loan_service import create_loan, get_loan_schedule, post_due_loan_payments
+from app.services.idempotency_service import run_idempotent, IdempotencyKeyMismatchError
+from typing import List, Optional
+
+router = APIRouter()
+
+@router.get("", response_model=List[LoanResponse])
+async def list_loans(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """List loans and debts for current company"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            loans = tenant_db.query(Loan).filter(
+                Loan.company_id == company.id
+            ).order_by(Loan.id).all()
+            return [LoanResponse.model_validate(loan) for loan in loans]
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching loans: {str(e)}"
+        )
+
+@router.post("", response_model=LoanResponse)
+async def post_loan(
+    request_data: CreateLoanRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Create a loan (admin/owner only)"""
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            loan = create_loan(tenant_db, company.id, request_data.model_dump())
+            return LoanResponse.model_validate(loan)
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating loan: {str(e)}"
+        )
+
+@router.get("/{loan_id}/schedule", response_model=List[LoanScheduleRow])
+async def get_schedule(
+    loan_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Full amortization schedule for a loan"""
+    company = get_tenant_company(request, db)
+
+    tenant_db_gen = get_tenant_db(company.id, company.database_name)
+    tenant_db = next(tenant_db_gen)
+
+    try:
+        loan = tenant_db.query(Loan).filter(Loan.id == loan_id).first()
+        if not loan:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Loan not found"
+            )
+        return get_loan_schedule(loan)
+    finally:
+        tenant_db.close()
+
+@router.post("/post-payments", response_model=PostLoanPaymentsResponse)
+async def post_payments(
+    request_data: PostLoanPaymentsRequest,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+):
+    """Post all loan payments due through a date in bulk (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        def post():
+            result = post_due_loan_payments(
+                tenant_db,
+                through_date=request_data.through_date,
+                created_by=person.id,
+                company_id=company.id
+            )
+            return PostLoanPaymentsResponse.model_validate(result).model_dump(mode="json")
+
+        try:
+            result, replayed = run_idempotent(
+                tenant_db, idempotency_key, f"POST {request.url.path}",
+                request_data.model_dump(mode="json"), person.id, post
+            )
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return result
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error posting loan payments: {str(e)}"
+        )
@@ -0,0 +1,103 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from sqlalchemy.orm import Session
+from app.core.database import get_db, get_tenant_db
+from app.core.middleware import require_auth, get_tenant_company, require_company_admin
+from app.schemas.reconciliation import (
+    ImportStatementLinesRequest, ImportStatementLinesResponse, StatementLineResponse,
+    ReconcileRequest, ReconcileResponse
+)
+from app.services.reconciliation_service import import_statement_lines, list_statement_lines, reconcile
+from typing import List, Optional
+
+router = APIRouter()
+
+@router.get("/statement-lines", response_model=List[StatementLineResponse])
+async def get_statement_lines(
+    request: Request,
+    account_id: int,
+    after_id: Optional[int] = None,
+    reconciled: Optional[bool] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """List imported bank statement lines with their matched transaction"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return list_statement_lines(tenant_db, account_id, limit, after_id, reconciled)
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching statement lines: {str(e)}"
+        )
+
+@router.post("/statement-lines", response_model=ImportStatementLinesResponse)
+async def post_statement_lines(
+    request_data: ImportStatementLinesRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Import bank statement lines for an account (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            imported = import_statement_lines(
+                tenant_db,
+                request_data.account_id,
+                [line.model_dump() for line in request_data.lines],
+                imported_by=person.id
+            )
+            return ImportStatementLinesResponse(imported=imported)
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error importing statement lines: {str(e)}"
+        )
+
+@router.post("/run", response_model=ReconcileResponse)
+async def post_reconciliation_run(
+    request_data: ReconcileRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Match unreconciled statement lines to transactions and store the links (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            return reconcile(
+                tenant_db,
+                created_by=person.id,
+                account_id=request_data.account_id,
+                window_days=request_data.window_days,
+                min_score=request_data.min_score
+            )
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error reconciling statement lines: {str(e)}"
+        )
@@ -0,0 +1,150 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query, Header
+from sqlalchemy.orm import Session
+from datetime import date
+from app.core.database import get_db, get_tenant_db
+from app.core.middleware import require_auth, get_tenant_company, require_company_admin
+from app.models.tenant.recurring_transaction import RecurringTransaction
+from app.schemas.recurring import (
+    CreateRecurringTransactionRequest, RecurringTransactionResponse, RecurringOccurrenceRow,
+    PostRecurringTransactionsRequest, PostRecurringTransactionsResponse
+)
+from app.services.recurring_service import (
+    create_recurring_transaction, get_upcoming_occurrences, post_due_recurring_transactions
+)
+from app.services.idempotency_service import run_idempotent, IdempotencyKeyMismatchError
+from typing import List, Optional
+
+router = APIRouter()
+
+@router.get("", response_model=List[RecurringTransactionResponse])
+async def list_recurring_transactions(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """List recurring transaction templates for current company"""
+    company = get_tenant_company(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            templates = tenant_db.query(RecurringTransaction).filter(
+                RecurringTransaction.company_id == company.id
+            ).order_by(RecurringTransaction.id).all()
+            return [RecurringTransactionResponse.model_validate(template) for template in templates]
+        finally:
+            tenant_db.close()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching recurring transactions: {str(e)}"
+        )
+
+@router.post("", response_model=RecurringTransactionResponse)
+async def post_recurring_transaction(
+    request_data: CreateRecurringTransactionRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Create a recurring transaction template (admin/owner only)"""
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        try:
+            template = create_recurring_transaction(tenant_db, company.id, request_data.model_dump())
+            return RecurringTransactionResponse.model_validate(template)
+        finally:
+            tenant_db.close()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating recurring transaction: {str(e)}"
+        )
+
+@router.get("/{template_id}/upcoming", response_model=List[RecurringOccurrenceRow])
+async def get_upcoming(
+    template_id: int,
+    request: Request,
+    through_date: date = Query(...),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Occurrences of a template not yet posted, through a date"""
+    company = get_tenant_company(request, db)
+
+    tenant_db_gen = get_tenant_db(company.id, company.database_name)
+    tenant_db = next(tenant_db_gen)
+
+    try:
+        template = tenant_db.query(RecurringTransaction).filter(RecurringTransaction.id == template_id).first()
+        if not template:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Recurring transaction not found"
+            )
+        return get_upcoming_occurrences(template, through_date, limit)
+    finally:
+        tenant_db.close()
+
+@router.post("/post-due", response_model=PostRecurringTransactionsResponse)
+async def post_due(
+    request_data: PostRecurringTransactionsRequest,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+):
+    """Post every recurring transaction occurrence due through a date in one batch (admin/owner only)"""
+    person = require_auth(request, db)
+    company = require_company_admin(request, db)
+
+    try:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+
+        def post():
+            result = post_due_recurring_transactions(
+                tenant_db,
+                through_date=request_data.through_date,
+                created_by=person.id,
+                company_id=company.id
+            )
+            return PostRecurringTransactionsResponse.model_validate(result).model_dump(mode="json")
+
+        try:
+            result, replayed = run_idempotent(
+                tenant_db, idempotency_key, f"POST {request.url.path}",
+                request_data.model_dump(mode="json"), person.id, post
+            )
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return result
+        except Exception:
+            tenant_db.rollback()
+            raise
+        finally:
+            tenant_db.close()
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error posting recurring transactions: {str(e)}"
+        )
@@ -0,0 +1,34 @@
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TenantCache:
+    """
+    Process-local cache of computed results per tenant.
+    Each entry is stored with a watermark (e.g. the latest posting id); a lookup with a
+    different watermark is a miss, so results are recomputed only after new postings.
+    """
+
+    def __init__(self, max_entries_per_tenant: int = 64):
+        self.max_entries_per_tenant = max_entries_per_tenant
+        self._entries: Dict[Hashable, Dict[Hashable, Tuple[Any, Any]]] = {}
+        self._lock = Lock()
+
+    def get(self, tenant: Hashable, key: Hashable, watermark: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(tenant, {}).get(key)
+        if entry is None or entry[0] != watermark:
+            return None
+        return entry[1]
+
+    def set(self, tenant: Hashable, key: Hashable, watermark: Any, value: Any):
+        with self._lock:
+            tenant_entries = self._entries.setdefault(tenant, {})
+            if key not in tenant_entries and len(tenant_entries) >= self.max_entries_per_tenant:
+                # Evict the oldest entry (dicts keep insertion order)
+                tenant_entries.pop(next(iter(tenant_entries)))
+            tenant_entries[key] = (watermark, value)
+
+    def invalidate(self, tenant: Hashable):
+        with self._lock:
+            self._entries.pop(tenant, None)
@@ -18,6 +18,28 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     
+    # Tenant ledger partitioning: "" (off), "year" (fiscal year) or "month"
+    TENANT_PARTITION_INTERVAL: str = ""
+    FISCAL_YEAR_START_MONTH: int = 1
+    
+    # How long a posting request's Idempotency-Key is remembered for replay
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    
+    # Write-behind posting queue: postings per commit, and how long a partial batch may wait
+    POSTING_QUEUE_BATCH_SIZE: int = 500
+    POSTING_QUEUE_MAX_DELAY_MS: int = 200
+    
+    # Ledger event projections: events applied per commit, and how often the worker polls
+    PROJECTION_BATCH_SIZE: int = 1000
+    PROJECTION_POLL_MS: int = 500
+    
+    # Chain positions per hash chain verification segment (the unit of parallel verification)
+    HASH_CHAIN_SEGMENT_SIZE: int = 10000
+    
+    # Exchange rate API returning {"base", "rates": {quote: rate}} or {"base", "rates": {date: {quote: rate}}}
+    # (e.g. https://api.frankfurter.app/{start}..{end}?from={base}); empty disables fetching
+    FX_RATES_API_URL: str = ""
+    
     # CORS
     CORS_ORIGINS: str = "http://localhost:5173"
     
@@ -4,6 +4,7 @@ from app.core.database import get_db
 from app.models.session import Session as SessionModel
 from app.models.person import Person
 from app.models.company import Company
+from app.models.person_company import PersonCompany
 from datetime import datetime
 from typing import Optional
 
@@ -65,3 +66,33 @@ def require_super_admin(request: Request, db: Session) -> Person:
         )
     return person
 
+def get_tenant_company(request: Request, db: Session) -> Company:
+    """Require authentication and return the current company with a tenant database"""
+    require_auth(request, db)
+    company = get_current_company(request, db)
+
+    if not company or not company.database_name:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Company database not found"
+        )
+
+    return company
+
+def require_company_admin(request: Request, db: Session) -> Company:
+    """Require owner/admin role in the current company"""
+    person = require_auth(request, db)
+    company = get_tenant_company(request, db)
+
+    person_company = db.query(PersonCompany).filter(
+        PersonCompany.person_id == person.id,
+        PersonCompany.company_id == company.id
+    ).first()
+
+    if not person_company or person_company.role not in ["owner", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin or owner access required"
+        )
+
+    return company
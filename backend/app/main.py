@@ -29,10 +29,17 @@ app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 app.include_router(rbac.router, prefix="/api/rbac", tags=["rbac"])
 
 # Import and include new routers
-from app.api import company, subscription, subscription_plan
+from app.api import company, subscription, subscription_plan, accounting, cashflows, loans, assets, reconciliation, recurring, anomalies
 app.include_router(company.router, prefix="/api/company", tags=["company"])
 app.include_router(subscription.router, prefix="/api/subscription", tags=["subscription"])
 app.include_router(subscription_plan.router, prefix="/api/admin", tags=["admin-subscription-plans"])
+app.include_router(accounting.router, prefix="/api/accounting", tags=["accounting"])
+app.include_router(cashflows.router, prefix="/api/cashflows", tags=["cashflows"])
+app.include_router(loans.router, prefix="/api/loans", tags=["loans"])
+app.include_router(assets.router, prefix="/api/assets", tags=["assets"])
+app.include_router(reconciliation.router, prefix="/api/reconciliation", tags=["reconciliation"])
+app.include_router(recurring.router, prefix="/api/recurring-transactions", tags=["recurring-transactions"])
+app.include_router(anomalies.router, prefix="/api/anomalies", tags=["anomalies"])
 
 @app.get("/")
 async def root():
@@ -9,6 +9,23 @@ from .journal_entry import JournalEntry
 from .journal_entry_line import JournalEntryLine
 from .transaction import Transaction, TransactionType
 from .category import Category, CategoryType
+from .balance_snapshot import AccountBalanceSnapshot
+from .ledger_rollup import LedgerRollup
+from .loan import Loan, LoanPayment, DebtType, AmortizationMethod
+from .fixed_asset import FixedAsset, DepreciationRun, AssetDepreciation, DepreciationMethod
+from .period_close import PeriodClose
+from .ledger_archive import LedgerArchiveBatch, LedgerArchiveRun
+from .reconciliation import BankStatementLine, ReconciliationLink, MatchType
+from .idempotency_key import IdempotencyKey
+from .posting_queue import PostingQueueItem, PostingStatus
+from .fx_rate import FxRate
+from .ledger_event import LedgerEvent, ProjectionCheckpoint
+from .projected_balance import ProjectedBalance
+from .chain_verification import ChainVerification
+from .recurring_transaction import RecurringTransaction, RecurringOccurrence, RecurrenceFrequency
+from .budget import Budget
+from .categorization_rule import CategorizationRule
+from .transaction_anomaly import TransactionAnomaly, AnomalyScan, AnomalySignal, AnomalyStatus
 
 __all__ = [
     "Role",
@@ -26,5 +43,38 @@ __all__ = [
     "TransactionType",
     "Category",
     "CategoryType",
+    "AccountBalanceSnapshot",
+    "LedgerRollup",
+    "Loan",
+    "LoanPayment",
+    "DebtType",
+    "AmortizationMethod",
+    "FixedAsset",
+    "DepreciationRun",
+    "AssetDepreciation",
+    "DepreciationMethod",
+    "PeriodClose",
+    "LedgerArchiveBatch",
+    "LedgerArchiveRun",
+    "BankStatementLine",
+    "ReconciliationLink",
+    "MatchType",
+    "IdempotencyKey",
+    "PostingQueueItem",
+    "PostingStatus",
+    "FxRate",
+    "LedgerEvent",
+    "ProjectionCheckpoint",
+    "ProjectedBalance",
+    "ChainVerification",
+    "RecurringTransaction",
+    "RecurringOccurrence",
+    "RecurrenceFrequency",
+    "Budget",
+    "CategorizationRule",
+    "TransactionAnomaly",
+    "AnomalyScan",
+    "AnomalySignal",
+    "AnomalyStatus",
 ]
 
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, Date, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.models.tenant.role import Base
+
+
+class AccountBalanceSnapshot(Base):
+    """Cumulative posted debit/credit totals per chart account through the end of as_of_date"""
+    __tablename__ = "account_balance_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    chart_account_id = Column(Integer, ForeignKey("chart_of_accounts.id"), nullable=False, index=True)
+    as_of_date = Column(Date, nullable=False, index=True)
+    total_debits = Column(Numeric(15, 2), nullable=False, default=0.00)
+    total_credits = Column(Numeric(15, 2), nullable=False, default=0.00)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    chart_account = relationship("ChartOfAccount")
+    
+    # One snapshot per account per day
+    __table_args__ = (
+        UniqueConstraint("chart_account_id", "as_of_date", name="uq_balance_snapshot_account_date"),
+    )
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, Date, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.models.tenant.role import Base
+
+
+class Budget(Base):
+    """Budgeted amount for one chart account and month, in the account's normal balance direction"""
+    __tablename__ = "budgets"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    chart_account_id = Column(Integer, ForeignKey("chart_of_accounts.id"), nullable=False, index=True)
+    period_start = Column(Date, nullable=False, index=True)  # First day of the month
+    amount = Column(Numeric(15, 2), nullable=False)
+    notes = Column(String, nullable=True)
+    created_by = Column(Integer, nullable=True)  # References control DB people.id
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    chart_account = relationship("ChartOfAccount")
+    
+    # One budget per account and month
+    __table_args__ = (
+        UniqueConstraint("chart_account_id", "period_start", name="uq_budget_account_period"),
+    )
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Enum, Numeric, Boolean, DateTime, JSON
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.models.tenant.role import Base
+from app.models.tenant.transaction import TransactionType
+
+
+class CategorizationRule(Base):
+    """
+    Assigns a category to transactions whose description contains one of the keywords or
+    matches the pattern, optionally limited to an amount range, type and account.
+    The first matching rule by (priority, id) wins.
+    """
+    __tablename__ = "categorization_rules"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
+    priority = Column(Integer, nullable=False, default=100)  # Lower runs first
+    keywords = Column(JSON, nullable=True)  # Whole words or phrases, case-insensitive
+    pattern = Column(String, nullable=True)  # Regular expression, case-insensitive
+    min_amount = Column(Numeric(15, 2), nullable=True)
+    max_amount = Column(Numeric(15, 2), nullable=True)
+    transaction_type = Column(Enum(TransactionType), nullable=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True)
+    is_active = Column(Boolean, default=True, nullable=False)
+    hit_count = Column(BigInteger, nullable=False, default=0)  # Transactions categorized by this rule
+    last_hit_at = Column(DateTime, nullable=True)
+    created_by = Column(Integer, nullable=True)  # References control DB people.id
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    category = relationship("Category")
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from datetime import datetime
+from app.models.tenant.role import Base
+
+
+class ChainVerification(Base):
+    """An audit run over the journal entry hash chain; the next run resumes after verified_through"""
+    __tablename__ = "chain_verifications"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    verified_from = Column(BigInteger, nullable=False)  # First chain position checked
+    verified_through = Column(BigInteger, nullable=False)  # Last position known intact (verified_from - 1 if none)
+    verified_hash = Column(String(64), nullable=True)  # chain_hash at verified_through
+    entry_count = Column(Integer, nullable=False, default=0)
+    broken_position = Column(BigInteger, nullable=True)  # First position whose hash did not match
+    segment_count = Column(Integer, nullable=False, default=1)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_by = Column(Integer, nullable=True)  # References control DB person; null when run from a script
@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Numeric, Boolean, Date, DateTime
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from app.models.tenant.role import Base
+
+
+class DepreciationMethod(str, enum.Enum):
+    """Depreciation methods supported by the period-end run"""
+    STRAIGHT_LINE = "straight_line"
+    DECLINING_BALANCE = "declining_balance"
+
+
+class FixedAsset(Base):
+    """Fixed asset register entry"""
+    __tablename__ = "fixed_assets"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    asset_group = Column(String, nullable=True, index=True)  # e.g. "vehicles", "it_equipment"
+    acquisition_date = Column(Date, nullable=False)
+    cost = Column(Numeric(15, 2), nullable=False)
+    salvage_value = Column(Numeric(15, 2), nullable=False, default=0.00)
+    useful_life_months = Column(Integer, nullable=False)
+    method = Column(Enum(DepreciationMethod), nullable=False, default=DepreciationMethod.STRAIGHT_LINE)
+    declining_factor = Column(Numeric(5, 2), nullable=False, default=2.00)  # 2.00 = double declining balance
+    accumulated_depreciation = Column(Numeric(15, 2), nullable=False, default=0.00)
+    asset_chart_account_id = Column(Integer, ForeignKey("chart_of_accounts.id"), nullable=False)
+    expense_chart_account_id = Column(Integer, ForeignKey("chart_of_accounts.id"), nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    company_id = Column(Integer, nullable=False, index=True)  # References control DB company
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class DepreciationRun(Base):
+    """A posted period-end depreciation run"""
+    __tablename__ = "depreciation_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    period_end = Column(Date, nullable=False, unique=True, index=True)  # Last day of the month; one run per month
+    asset_count = Column(Integer, nullable=False)
+    total_amount = Column(Numeric(15, 2), nullable=False)
+    journal_entry_count = Column(Integer, nullable=False)
+    created_by = Column(Integer, nullable=False)  # References control DB people.id
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    charges = relationship("AssetDepreciation", back_populates="run", cascade="all, delete-orphan")
+
+
+class AssetDepreciation(Base):
+    """Per-asset depreciation charge of a run"""
+    __tablename__ = "asset_depreciations"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("depreciation_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+    asset_id = Column(Integer, ForeignKey("fixed_assets.id"), nullable=False, index=True)
+    amount = Column(Numeric(15, 2), nullable=False)
+    journal_entry_id = Column(Integer, ForeignKey("journal_entries.id"), nullable=False)
+    
+    # Relationships
+    run = relationship("DepreciationRun", back_populates="charges")
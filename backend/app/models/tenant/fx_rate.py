@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, UniqueConstraint
+from datetime import datetime
+from app.models.tenant.role import Base
+
+
+class FxRate(Base):
+    """Exchange rate on a date: 1 unit of base_currency = rate units of quote_currency"""
+    __tablename__ = "fx_rates"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    rate_date = Column(Date, nullable=False)
+    base_currency = Column(String(3), nullable=False)
+    quote_currency = Column(String(3), nullable=False)
+    rate = Column(Numeric(20, 10), nullable=False)
+    source = Column(String, nullable=True)  # e.g. file name or API host
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # One rate per pair per day; also serves pair lookups ordered by date
+    __table_args__ = (
+        UniqueConstraint("base_currency", "quote_currency", "rate_date", name="uq_fx_rate_pair_date"),
+    )
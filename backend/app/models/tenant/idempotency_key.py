@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from datetime import datetime
+from app.models.tenant.role import Base
+
+
+class IdempotencyKey(Base):
+    """Result of a posting request made with an Idempotency-Key header, replayed on retries"""
+    __tablename__ = "idempotency_keys"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(255), nullable=False, unique=True)  # Client-supplied Idempotency-Key header
+    scope = Column(String(255), nullable=False)  # Endpoint the key was first used on, e.g. "POST /api/accounting/transactions"
+    request_hash = Column(String(64), nullable=False)  # sha256 of the request body
+    response_body = Column(JSON, nullable=True)  # Null until the request has completed
+    created_by = Column(Integer, nullable=False)  # References control DB people.id
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models.tenant.role import Base
@@ -16,10 +16,24 @@ class JournalEntry(Base):
     created_by = Column(Integer, nullable=False, index=True)  # References control DB people.id
     company_id = Column(Integer, nullable=False, index=True)  # References control DB company
     is_posted = Column(Boolean, default=False, nullable=False)  # Prevents editing after posting
+    reversal_of_id = Column(Integer, ForeignKey("journal_entries.id"), nullable=True, unique=True, index=True)  # Entry this one reverses
+    chain_position = Column(BigInteger, nullable=True, unique=True, index=True)  # Place in the hash chain, set when sealed
+    chain_hash = Column(String(64), nullable=True)  # sha256 over the entry, its lines and the previous entry's chain_hash
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
     lines = relationship("JournalEntryLine", back_populates="journal_entry", cascade="all, delete-orphan")
     transactions = relationship("Transaction", back_populates="journal_entry")
+    
+    # Composite indexes backing keyset pagination on (entry_date, id)
+    __table_args__ = (
+        Index("ix_journal_entries_entry_date_id", "entry_date", "id"),
+        Index("ix_journal_entries_is_posted_entry_date_id", "is_posted", "entry_date", "id"),
+        # Trigram index for description search (substring and word similarity)
+        Index(
+            "ix_journal_entries_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}
+        ),
+    )
 
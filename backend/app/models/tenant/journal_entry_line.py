@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, String, DateTime, CheckConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, String, DateTime, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models.tenant.role import Base
@@ -15,6 +15,7 @@ class JournalEntryLine(Base):
     credit_amount = Column(Numeric(15, 2), nullable=True, default=0.00)
     description = Column(String, nullable=True)
     reference = Column(String, nullable=True)
+    entry_date = Column(DateTime, nullable=False)  # Denormalized from journal_entries.entry_date for ledger range scans
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
@@ -29,5 +30,13 @@ class JournalEntryLine(Base):
             "(credit_amount IS NOT NULL AND credit_amount >= 0 AND debit_amount IS NULL)",
             name="check_debit_credit_exclusive"
         ),
+        # Composite indexes backing keyset pagination on (entry_date, id)
+        Index("ix_journal_entry_lines_account_entry_date_id", "chart_account_id", "entry_date", "id"),
+        Index("ix_journal_entry_lines_entry_date_id", "entry_date", "id"),
+        # Trigram index for description search (substring and word similarity)
+        Index(
+            "ix_journal_entry_lines_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}
+        ),
     )
 
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, Numeric, Date, DateTime, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.models.tenant.role import Base
+
+
+class LedgerArchiveBatch(Base):
+    """Posted journal lines of one chart account for one month, moved out of journal_entry_lines"""
+    __tablename__ = "ledger_archive_batches"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    chart_account_id = Column(Integer, ForeignKey("chart_of_accounts.id"), nullable=False, index=True)
+    month_start = Column(Date, nullable=False)
+    line_count = Column(Integer, nullable=False)
+    total_debits = Column(Numeric(15, 2), nullable=False, default=0.00)
+    total_credits = Column(Numeric(15, 2), nullable=False, default=0.00)
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed columnar JSON of the lines
+    run_id = Column(Integer, ForeignKey("ledger_archive_runs.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    chart_account = relationship("ChartOfAccount")
+    
+    __table_args__ = (
+        UniqueConstraint("chart_account_id", "month_start", name="uq_ledger_archive_batch_account_month"),
+    )
+
+
+class LedgerArchiveRun(Base):
+    """An archival job; lines dated on or before archived_through live in ledger_archive_batches"""
+    __tablename__ = "ledger_archive_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    archived_from = Column(Date, nullable=True)  # Null for the first run
+    archived_through = Column(Date, nullable=False, unique=True, index=True)
+    line_count = Column(Integer, nullable=False, default=0)
+    batch_count = Column(Integer, nullable=False, default=0)
+    archived_bytes = Column(BigInteger, nullable=False, default=0)  # Heap size of the moved rows
+    archive_bytes = Column(BigInteger, nullable=False, default=0)  # Compressed payload size
+    hot_bytes_before = Column(BigInteger, nullable=False, default=0)
+    hot_bytes_after = Column(BigInteger, nullable=False, default=0)
+    created_by = Column(Integer, nullable=False)  # References control DB person
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, JSON, Index
+from datetime import datetime
+from app.models.tenant.role import Base
+
+
+class LedgerEvent(Base):
+    """
+    Append-only posting event log; read models are projected from it.
+    `id` is the sequence number. Rows are never updated or deleted (enforced by trigger).
+    """
+    __tablename__ = "ledger_events"
+    
+    id = Column(BigInteger, primary_key=True)
+    xact_id = Column(BigInteger, nullable=False)  # Writing transaction, orders events by commit safety
+    event_type = Column(String, nullable=False)  # "entry_posted" or "archived_month" (history before the log)
+    journal_entry_id = Column(Integer, nullable=True)  # Null for archived_month
+    category_id = Column(Integer, nullable=False, default=0)  # 0 = uncategorized
+    entry_date = Column(DateTime, nullable=False)
+    lines = Column(JSON, nullable=False)  # [{chart_account_id, debit, credit, line_count}], amounts in minor units
+    recorded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        # Projections read in (xact_id, id) order after their checkpoint
+        Index("ix_ledger_events_xact_id_id", "xact_id", "id"),
+        # Latest posting into a date range, the watermark of cached period reports
+        Index("ix_ledger_events_entry_date_id", "entry_date", "id"),
+    )
+
+
+class ProjectionCheckpoint(Base):
+    """Position in the event log up to which a projection has been applied"""
+    __tablename__ = "projection_checkpoints"
+    
+    name = Column(String, primary_key=True)
+    xact_id = Column(BigInteger, nullable=False, default=0)
+    event_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
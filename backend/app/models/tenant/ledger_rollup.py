@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, Date, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.models.tenant.role import Base
+
+
+class LedgerRollup(Base):
+    """Pre-aggregated posted ledger totals per (grain, date bucket, chart account, category)"""
+    __tablename__ = "ledger_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    grain = Column(String, nullable=False)  # "day" or "month"
+    bucket_date = Column(Date, nullable=False)  # First day of the bucket
+    chart_account_id = Column(Integer, ForeignKey("chart_of_accounts.id"), nullable=False, index=True)
+    category_id = Column(Integer, nullable=False, default=0)  # 0 = uncategorized, keeps the unique key NULL-free
+    debit_total = Column(Numeric(15, 2), nullable=False, default=0.00)
+    credit_total = Column(Numeric(15, 2), nullable=False, default=0.00)
+    line_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    chart_account = relationship("ChartOfAccount")
+    
+    # The unique key doubles as the range-scan index for dashboard queries
+    __table_args__ = (
+        UniqueConstraint("grain", "bucket_date", "chart_account_id", "category_id", name="uq_ledger_rollup_key"),
+    )
@@ -0,0 +1,68 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Numeric, Boolean, Date, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from app.models.tenant.role import Base
+
+
+class DebtType(str, enum.Enum):
+    """Kinds of borrowing tracked by the loans and debt management modules"""
+    TERM_LOAN = "term_loan"
+    MORTGAGE = "mortgage"
+    CREDIT_LINE = "credit_line"
+    OTHER_DEBT = "other_debt"
+
+
+class AmortizationMethod(str, enum.Enum):
+    """How principal is repaid over the term"""
+    ANNUITY = "annuity"  # Level payment
+    STRAIGHT_LINE = "straight_line"  # Level principal
+    INTEREST_ONLY = "interest_only"  # Principal repaid at maturity
+
+
+class Loan(Base):
+    """Borrowing repaid on a monthly schedule"""
+    __tablename__ = "loans"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    lender = Column(String, nullable=True)
+    debt_type = Column(Enum(DebtType), nullable=False, default=DebtType.TERM_LOAN)
+    amortization_method = Column(Enum(AmortizationMethod), nullable=False, default=AmortizationMethod.ANNUITY)
+    principal = Column(Numeric(15, 2), nullable=False)
+    annual_interest_rate = Column(Numeric(7, 4), nullable=False)  # e.g. 0.0650 for 6.5%
+    term_months = Column(Integer, nullable=False)
+    start_date = Column(Date, nullable=False)  # First payment falls one month later
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)  # Account payments are made from
+    liability_chart_account_id = Column(Integer, ForeignKey("chart_of_accounts.id"), nullable=False)
+    interest_chart_account_id = Column(Integer, ForeignKey("chart_of_accounts.id"), nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
+    company_id = Column(Integer, nullable=False, index=True)  # References control DB company
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    account = relationship("Account")
+    payments = relationship("LoanPayment", back_populates="loan", cascade="all, delete-orphan")
+
+
+class LoanPayment(Base):
+    """A posted scheduled payment, split into principal and interest"""
+    __tablename__ = "loan_payments"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    loan_id = Column(Integer, ForeignKey("loans.id", ondelete="CASCADE"), nullable=False, index=True)
+    period_number = Column(Integer, nullable=False)
+    due_date = Column(Date, nullable=False, index=True)
+    principal_amount = Column(Numeric(15, 2), nullable=False)
+    interest_amount = Column(Numeric(15, 2), nullable=False)
+    journal_entry_id = Column(Integer, ForeignKey("journal_entries.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    loan = relationship("Loan", back_populates="payments")
+    
+    # Each scheduled period is posted once
+    __table_args__ = (
+        UniqueConstraint("loan_id", "period_number", name="uq_loan_payment_period"),
+    )
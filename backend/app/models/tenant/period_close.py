@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, Date, DateTime
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.models.tenant.role import Base
+
+
+class PeriodClose(Base):
+    """A closed accounting period; no postings may be dated on or before period_end"""
+    __tablename__ = "period_closes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    period_start = Column(Date, nullable=True)  # Null for the first close (everything before period_end)
+    period_end = Column(Date, nullable=False, unique=True, index=True)
+    net_income = Column(Numeric(15, 2), nullable=False, default=0.00)
+    journal_entry_id = Column(Integer, ForeignKey("journal_entries.id"), nullable=True)  # Null when there was nothing to close
+    closed_by = Column(Integer, nullable=False)  # References control DB person
+    closed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    journal_entry = relationship("JournalEntry")
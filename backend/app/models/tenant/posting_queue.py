@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Numeric, Date, DateTime, Index
+from datetime import datetime
+import enum
+from app.models.tenant.role import Base
+from app.models.tenant.transaction import TransactionType
+
+
+class PostingStatus(str, enum.Enum):
+    """Lifecycle of a queued posting"""
+    QUEUED = "queued"
+    POSTED = "posted"
+    DUPLICATE = "duplicate"  # Same content as an existing transaction; nothing was posted
+    FAILED = "failed"
+
+
+class PostingQueueItem(Base):
+    """A transaction accepted for asynchronous posting; the worker posts queued items in batches"""
+    __tablename__ = "posting_queue"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    transaction_type = Column(Enum(TransactionType), nullable=False)
+    amount = Column(Numeric(15, 2), nullable=False)
+    description = Column(String, nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    transaction_date = Column(Date, nullable=False)
+    status = Column(Enum(PostingStatus), nullable=False, default=PostingStatus.QUEUED)
+    transaction_id = Column(Integer, nullable=True)  # No foreign key: transactions may be partitioned
+    error = Column(String, nullable=True)
+    created_by = Column(Integer, nullable=False)  # References control DB people.id
+    enqueued_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # The worker claims the oldest queued items
+        Index("ix_posting_queue_status_id", "status", "id"),
+    )
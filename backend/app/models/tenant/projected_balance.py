@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.models.tenant.role import Base
+
+
+class ProjectedBalance(Base):
+    """All-time posted totals per chart account in minor units, projected from ledger_events"""
+    __tablename__ = "projected_balances"
+    
+    chart_account_id = Column(Integer, ForeignKey("chart_of_accounts.id"), primary_key=True)
+    debit_minor = Column(BigInteger, nullable=False, default=0)
+    credit_minor = Column(BigInteger, nullable=False, default=0)
+    line_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    chart_account = relationship("ChartOfAccount")
@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Numeric, Date, DateTime, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from app.models.tenant.role import Base
+
+
+class MatchType(str, enum.Enum):
+    """How a statement line was matched to a transaction"""
+    EXACT = "exact"  # Same account, amount and date
+    FUZZY = "fuzzy"  # Same account and amount within the date window, scored by description
+
+
+class BankStatementLine(Base):
+    """A line imported from a bank statement, to be reconciled against transactions"""
+    __tablename__ = "bank_statement_lines"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    statement_date = Column(Date, nullable=False)
+    amount = Column(Numeric(15, 2), nullable=False)  # Signed: positive = money in, negative = money out
+    description = Column(String, nullable=False)
+    reference = Column(String, nullable=True)
+    imported_by = Column(Integer, nullable=False)  # References control DB person
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    account = relationship("Account")
+    
+    __table_args__ = (
+        Index("ix_bank_statement_lines_account_date", "account_id", "statement_date"),
+    )
+
+
+class ReconciliationLink(Base):
+    """One-to-one link between a statement line and the transaction it reconciles"""
+    __tablename__ = "reconciliation_links"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    statement_line_id = Column(Integer, ForeignKey("bank_statement_lines.id", ondelete="CASCADE"), nullable=False, unique=True)
+    # No foreign key: a partitioned transactions table has a composite primary key
+    transaction_id = Column(Integer, nullable=False, unique=True)
+    match_type = Column(Enum(MatchType), nullable=False)
+    score = Column(Numeric(5, 4), nullable=False)
+    created_by = Column(Integer, nullable=False)  # References control DB person
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    statement_line = relationship("BankStatementLine")
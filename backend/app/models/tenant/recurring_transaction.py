@@ -0,0 +1,65 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Numeric, Boolean, Date, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from app.models.tenant.role import Base
+from app.models.tenant.transaction import TransactionType
+
+
+class RecurrenceFrequency(str, enum.Enum):
+    """Base period of a recurring schedule, as RRULE FREQ"""
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+
+
+class RecurringTransaction(Base):
+    """Template for a deposit or withdrawal repeated on an RRULE-like schedule"""
+    __tablename__ = "recurring_transactions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    transaction_type = Column(Enum(TransactionType), nullable=False)
+    amount = Column(Numeric(15, 2), nullable=False)
+    description = Column(String, nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    counter_chart_account_id = Column(Integer, ForeignKey("chart_of_accounts.id"), nullable=True)  # Revenue/expense side, e.g. 5300 for rent
+    frequency = Column(Enum(RecurrenceFrequency), nullable=False)
+    interval = Column(Integer, nullable=False, default=1)  # Every n periods
+    by_weekday = Column(Integer, nullable=True)  # Weekly only: 0 = Monday .. 6 = Sunday
+    by_month_day = Column(Integer, nullable=True)  # Monthly/yearly: 1-31, clipped to month end
+    start_date = Column(Date, nullable=False)  # No occurrence before it
+    until_date = Column(Date, nullable=True)  # Last possible occurrence date
+    occurrence_limit = Column(Integer, nullable=True)  # RRULE COUNT
+    occurrences_posted = Column(Integer, nullable=False, default=0)
+    last_posted_date = Column(Date, nullable=True)
+    is_active = Column(Boolean, default=True, nullable=False)
+    company_id = Column(Integer, nullable=False, index=True)  # References control DB company
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Relationships
+    account = relationship("Account")
+    occurrences = relationship("RecurringOccurrence", back_populates="recurring_transaction", cascade="all, delete-orphan")
+
+
+class RecurringOccurrence(Base):
+    """A materialized occurrence of a recurring transaction"""
+    __tablename__ = "recurring_occurrences"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recurring_transaction_id = Column(Integer, ForeignKey("recurring_transactions.id", ondelete="CASCADE"), nullable=False, index=True)
+    occurrence_number = Column(Integer, nullable=False)  # 1-based position in the schedule
+    occurrence_date = Column(Date, nullable=False, index=True)
+    transaction_id = Column(Integer, nullable=True)  # Null when the content already existed; no FK as transactions may be partitioned
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    recurring_transaction = relationship("RecurringTransaction", back_populates="occurrences")
+
+    # Each occurrence is materialized once
+    __table_args__ = (
+        UniqueConstraint("recurring_transaction_id", "occurrence_number", name="uq_recurring_occurrence_number"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Enum, Numeric, String, DateTime, Date
+from sqlalchemy import Column, Integer, ForeignKey, Enum, Numeric, String, DateTime, Date, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
 import enum
@@ -24,6 +24,7 @@ class Transaction(Base):
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)
     transaction_date = Column(Date, nullable=False, index=True)
     journal_entry_id = Column(Integer, ForeignKey("journal_entries.id"), nullable=True, index=True)
+    content_hash = Column(String(64), nullable=True)  # Fingerprint of account, date, type, amount and description
     created_by = Column(Integer, nullable=False, index=True)  # References control DB people.id
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -32,4 +33,18 @@ class Transaction(Base):
     account = relationship("Account", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
     journal_entry = relationship("JournalEntry", back_populates="transactions")
+    
+    # Composite indexes backing keyset pagination on (transaction_date, id)
+    __table_args__ = (
+        Index("ix_transactions_transaction_date_id", "transaction_date", "id"),
+        Index("ix_transactions_account_transaction_date_id", "account_id", "transaction_date", "id"),
+        Index("ix_transactions_category_transaction_date_id", "category_id", "transaction_date", "id"),
+        # Rejects duplicate content per account; includes transaction_date so it also works when partitioned
+        Index("uq_transactions_account_date_content_hash", "account_id", "transaction_date", "content_hash", unique=True),
+        # Trigram index for description search (substring and word similarity)
+        Index(
+            "ix_transactions_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}
+        ),
+    )
 
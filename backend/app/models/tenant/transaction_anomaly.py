@@ -0,0 +1,64 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, Enum, Numeric, Float, Date, DateTime, JSON, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from app.models.tenant.role import Base
+
+
+class AnomalySignal(str, enum.Enum):
+    """Why a transaction was flagged"""
+    AMOUNT_ZSCORE = "amount_zscore"  # Amount far from the group mean in standard deviations
+    AMOUNT_IQR = "amount_iqr"  # Amount far outside the group's interquartile range
+    FREQUENCY_CHANGE = "frequency_change"  # Many more transactions in the group than usual
+    BURST = "burst"  # Repeats of the same amount and description within a few days
+
+
+class AnomalyStatus(str, enum.Enum):
+    """Review state of a flag"""
+    OPEN = "open"
+    DISMISSED = "dismissed"
+    CONFIRMED = "confirmed"
+
+
+class AnomalyScan(Base):
+    """A run of the anomaly detection job; the next run resumes after its log position"""
+    __tablename__ = "anomaly_scans"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    from_event_id = Column(BigInteger, nullable=False)  # Log position the scan started after
+    through_xact_id = Column(BigInteger, nullable=False)  # Log position scanned through
+    through_event_id = Column(BigInteger, nullable=False)
+    event_count = Column(Integer, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    flag_count = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_by = Column(Integer, nullable=True)  # References control DB person; null when run from a script
+
+
+class TransactionAnomaly(Base):
+    """A transaction flagged by the anomaly detection job, for review"""
+    __tablename__ = "transaction_anomalies"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    transaction_id = Column(Integer, nullable=False, index=True)  # No FK: transactions may be partitioned
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    transaction_date = Column(Date, nullable=False)
+    amount = Column(Numeric(15, 2), nullable=False)
+    signal = Column(Enum(AnomalySignal), nullable=False)
+    score = Column(Float, nullable=False)  # Signal strength, e.g. the z-score
+    details = Column(JSON, nullable=True)  # Baseline figures behind the flag
+    status = Column(Enum(AnomalyStatus), nullable=False, default=AnomalyStatus.OPEN, index=True)
+    reviewed_by = Column(Integer, nullable=True)  # References control DB people.id
+    reviewed_at = Column(DateTime, nullable=True)
+    scan_id = Column(Integer, ForeignKey("anomaly_scans.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    scan = relationship("AnomalyScan")
+    
+    # A signal flags a transaction once
+    __table_args__ = (
+        UniqueConstraint("transaction_id", "signal", name="uq_transaction_anomaly_signal"),
+    )
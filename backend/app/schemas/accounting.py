@@ -0,0 +1,396 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
+from datetime import datetime, date
+from decimal import Decimal
+
+class JournalEntryResponse(BaseModel):
+    id: int
+    entry_number: str
+    entry_date: datetime
+    description: str
+    reference: Optional[str]
+    created_by: int
+    company_id: int
+    is_posted: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class JournalEntryLineResponse(BaseModel):
+    id: int
+    journal_entry_id: int
+    chart_account_id: int
+    entry_date: datetime
+    debit_amount: Optional[Decimal]
+    credit_amount: Optional[Decimal]
+    description: Optional[str]
+    reference: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+class TransactionResponse(BaseModel):
+    id: int
+    account_id: int
+    transaction_type: str
+    amount: Decimal
+    description: str
+    category_id: Optional[int]
+    transaction_date: date
+    journal_entry_id: Optional[int]
+    created_by: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class TransactionInput(BaseModel):
+    transaction_type: Literal["deposit", "withdrawal"]
+    amount: Decimal = Field(gt=0)
+    description: str
+    transaction_date: date
+    category_id: Optional[int] = None
+
+class BulkReversalRequest(BaseModel):
+    entry_ids: Optional[List[int]] = Field(None, max_length=100000)
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    reference: Optional[str] = None
+    description: Optional[str] = None  # ILIKE pattern, e.g. "%March import%"
+    entered_by: Optional[int] = None  # Person who created the original entries
+    reversal_date: Optional[date] = None  # Default: today
+    reason: Optional[str] = None
+    dry_run: bool = False
+
+class BulkReversalResponse(BaseModel):
+    matched: int
+    already_reversed: int
+    archived: int
+    reversed: int
+    line_count: int
+    total_amount: Decimal
+    reversal_date: date
+    first_entry_number: Optional[str]
+    last_entry_number: Optional[str]
+    dry_run: bool
+
+class CreateTransactionRequest(TransactionInput):
+    account_id: int
+
+class ImportTransactionsRequest(BaseModel):
+    account_id: int
+    transactions: List[TransactionInput] = Field(max_length=10000)
+    auto_categorize: bool = True  # Apply categorization rules to rows without a category
+
+class ImportTransactionsResponse(BaseModel):
+    imported: int
+    duplicates: int
+    categorized: int = 0
+    transaction_ids: List[int]
+
+class DuplicateTransactionGroup(BaseModel):
+    account_id: int
+    transaction_date: date
+    content_hash: str
+    transaction_ids: List[int]
+
+class QueuePostingsRequest(BaseModel):
+    transactions: List[CreateTransactionRequest] = Field(min_length=1, max_length=10000)
+
+class QueuePostingsResponse(BaseModel):
+    queue_ids: List[int]
+
+class QueuedPostingResponse(BaseModel):
+    id: int
+    account_id: int
+    status: str
+    transaction_id: Optional[int]
+    error: Optional[str]
+    enqueued_at: datetime
+    processed_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class JournalEntryPage(BaseModel):
+    items: List[JournalEntryResponse]
+    next_cursor: Optional[str] = None
+    approximate_total: Optional[int] = None
+
+class JournalEntryLinePage(BaseModel):
+    items: List[JournalEntryLineResponse]
+    next_cursor: Optional[str] = None
+    approximate_total: Optional[int] = None
+
+class TransactionPage(BaseModel):
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None
+    approximate_total: Optional[int] = None
+
+class BalanceSnapshotRequest(BaseModel):
+    as_of_date: date
+
+class BalanceSnapshotResponse(BaseModel):
+    as_of_date: date
+    accounts: int
+
+class BalanceSeriesItem(BaseModel):
+    chart_account_id: int
+    account_code: str
+    account_name: str
+    balances: List[Decimal]
+
+class BalanceSeriesResponse(BaseModel):
+    interval: str
+    dates: List[date]
+    series: List[BalanceSeriesItem]
+
+class DashboardAccountTotal(BaseModel):
+    chart_account_id: int
+    account_code: str
+    account_name: str
+    account_type: str
+    debit_total: Decimal
+    credit_total: Decimal
+    balance_change: Decimal
+    line_count: int
+
+class DashboardCategoryTotal(BaseModel):
+    category_id: Optional[int]
+    category_name: Optional[str]
+    debit_total: Decimal
+    credit_total: Decimal
+    line_count: int
+
+class DashboardPeriodTotal(BaseModel):
+    bucket_date: date
+    revenue: Decimal
+    expenses: Decimal
+
+class DashboardSummaryResponse(BaseModel):
+    date_from: date
+    date_to: date
+    grain: str
+    revenue: Decimal
+    expenses: Decimal
+    net_income: Decimal
+    by_account: List[DashboardAccountTotal]
+    by_category: List[DashboardCategoryTotal]
+    by_period: List[DashboardPeriodTotal]
+
+class RollupRebuildResponse(BaseModel):
+    rows: int
+
+class ProjectionStatus(BaseModel):
+    name: str
+    event_id: int
+    pending_events: int
+    updated_at: Optional[datetime]
+
+class ProjectionRebuildResponse(BaseModel):
+    name: str
+    events: int
+
+class ChainVerificationResponse(BaseModel):
+    id: int
+    verified_from: int
+    verified_through: int
+    verified_hash: Optional[str]
+    entry_count: int
+    broken_position: Optional[int]
+    segment_count: int
+    started_at: datetime
+    finished_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ProjectedBalanceResponse(BaseModel):
+    chart_account_id: int
+    account_code: str
+    account_name: str
+    total_debits: Decimal
+    total_credits: Decimal
+    balance: Decimal
+    line_count: int
+
+class PeriodCloseRequest(BaseModel):
+    period_end: date
+    year_end: bool = False
+
+class PeriodCloseResponse(BaseModel):
+    period_start: Optional[date]
+    period_end: date
+    net_income: Decimal
+    journal_entry_id: Optional[int]
+    closed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class PeriodCloseResult(PeriodCloseResponse):
+    accounts_closed: int
+
+class LedgerArchiveRequest(BaseModel):
+    through: Optional[date] = None  # Defaults to the latest closed period
+
+class LedgerArchiveResponse(BaseModel):
+    archived_through: date
+    line_count: int
+    batch_count: int
+    archived_bytes: int
+    archive_bytes: int
+    hot_bytes_before: int
+    hot_bytes_after: int
+    reclaimed_bytes: int
+
+class FxRateInput(BaseModel):
+    rate_date: date
+    base_currency: str = Field(min_length=3, max_length=3)
+    quote_currency: str = Field(min_length=3, max_length=3)
+    rate: Decimal = Field(gt=0)
+
+class UpsertFxRatesRequest(BaseModel):
+    rates: List[FxRateInput] = Field(min_length=1, max_length=100000)
+
+class FetchFxRatesRequest(BaseModel):
+    base_currency: str = Field(min_length=3, max_length=3)
+    date_from: date
+    date_to: date
+
+class UpsertFxRatesResponse(BaseModel):
+    rates: int
+
+class FxRateResponse(BaseModel):
+    rate_date: date
+    base_currency: str
+    quote_currency: str
+    rate: Decimal
+    source: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+class TrialBalanceAccount(BaseModel):
+    chart_account_id: int
+    account_code: str
+    account_name: str
+    account_type: str
+    currency: str
+    debit_total: Decimal
+    credit_total: Decimal
+    reporting_debit_total: Decimal
+    reporting_credit_total: Decimal
+
+class TrialBalanceResponse(BaseModel):
+    as_of: date
+    reporting_currency: str
+    accounts: List[TrialBalanceAccount]
+    total_debits: Decimal
+    total_credits: Decimal
+    translation_difference: Decimal
+
+class BudgetInput(BaseModel):
+    chart_account_id: int
+    period_start: date  # Any day of the budgeted month
+    amount: Decimal
+    notes: Optional[str] = None
+
+class UpsertBudgetsRequest(BaseModel):
+    budgets: List[BudgetInput] = Field(min_length=1, max_length=100000)
+
+class UpsertBudgetsResponse(BaseModel):
+    budgets: int
+
+class BudgetResponse(BaseModel):
+    id: int
+    chart_account_id: int
+    period_start: date
+    amount: Decimal
+    notes: Optional[str]
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class BudgetVarianceCell(BaseModel):
+    budget: Decimal
+    actual: Decimal
+    variance: Decimal
+    variance_pct: Optional[float]  # Null where nothing is budgeted
+    favorable: bool
+
+class BudgetVsActualAccount(BaseModel):
+    chart_account_id: int
+    account_code: str
+    account_name: str
+    account_type: str
+    periods: List[BudgetVarianceCell]
+    total: BudgetVarianceCell
+
+class BudgetVsActualResponse(BaseModel):
+    date_from: date
+    date_to: date
+    periods: List[date]
+    accounts: List[BudgetVsActualAccount]
+    generated_at: datetime
+    cached: bool
+
+class CreateCategorizationRuleRequest(BaseModel):
+    name: str
+    category_id: int
+    priority: int = 100  # Lower runs first
+    keywords: Optional[List[str]] = Field(None, max_length=1000)
+    pattern: Optional[str] = None  # Regular expression, case-insensitive
+    min_amount: Optional[Decimal] = Field(None, ge=0)
+    max_amount: Optional[Decimal] = Field(None, ge=0)
+    transaction_type: Optional[Literal["deposit", "withdrawal"]] = None
+    account_id: Optional[int] = None
+
+class CategorizationRuleResponse(BaseModel):
+    id: int
+    name: str
+    category_id: int
+    priority: int
+    keywords: Optional[List[str]]
+    pattern: Optional[str]
+    min_amount: Optional[Decimal]
+    max_amount: Optional[Decimal]
+    transaction_type: Optional[str]
+    account_id: Optional[int]
+    is_active: bool
+    hit_count: int
+    last_hit_at: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class CategorizationPreviewRow(BaseModel):
+    description: str
+    amount: Decimal
+    transaction_type: Literal["deposit", "withdrawal"]
+    account_id: Optional[int] = None
+
+class CategorizationPreviewRequest(BaseModel):
+    transactions: List[CategorizationPreviewRow] = Field(min_length=1, max_length=10000)
+
+class CategorizationPreviewResult(BaseModel):
+    rule_id: Optional[int]
+    category_id: Optional[int]
+
+class SearchResult(BaseModel):
+    source: Literal["transactions", "journal_entries", "journal_entry_lines"]
+    id: int
+    journal_entry_id: Optional[int]
+    account_id: Optional[int]
+    chart_account_id: Optional[int]
+    entry_date: date  # Transaction date, or the entry date
+    amount: Decimal
+    description: Optional[str]
+    score: float  # Word similarity to the query, plus 1 for a substring match
+
+class SearchPage(BaseModel):
+    items: List[SearchResult]
+    next_cursor: Optional[str] = None
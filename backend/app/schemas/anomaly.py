@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any
+from datetime import datetime, date
+from decimal import Decimal
+from app.models.tenant.transaction_anomaly import AnomalySignal, AnomalyStatus
+
+class TransactionAnomalyResponse(BaseModel):
+    id: int
+    transaction_id: int
+    account_id: int
+    category_id: Optional[int]
+    transaction_date: date
+    amount: Decimal
+    signal: AnomalySignal
+    score: float
+    details: Optional[Dict[str, Any]]
+    status: AnomalyStatus
+    reviewed_by: Optional[int]
+    reviewed_at: Optional[datetime]
+    scan_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ReviewAnomalyRequest(BaseModel):
+    status: AnomalyStatus
+
+class ScanAnomaliesRequest(BaseModel):
+    batch_size: Optional[int] = Field(default=None, ge=1, le=200000)  # Ledger events to read
+
+class ScanAnomaliesResponse(BaseModel):
+    scan_id: int
+    events: int
+    transactions: int
+    flags: int
+    pending: int  # Events still to scan
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime, date
+from decimal import Decimal
+
+class AccountForecastResponse(BaseModel):
+    account_id: int
+    account_name: str
+    currency: str
+    current_balance: Decimal
+    trend_per_month: Decimal
+    recurring_monthly: Decimal
+    projected_flows: List[Decimal]
+    projected_balances: List[Decimal]
+
+class CashflowForecastResponse(BaseModel):
+    generated_at: datetime
+    periods: List[date]
+    accounts: List[AccountForecastResponse]
+    cached: bool
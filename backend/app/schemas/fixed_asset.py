@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime, date
+from decimal import Decimal
+from app.models.tenant.fixed_asset import DepreciationMethod
+
+class CreateFixedAssetRequest(BaseModel):
+    name: str
+    asset_group: Optional[str] = None
+    acquisition_date: date
+    cost: Decimal = Field(gt=0)
+    salvage_value: Decimal = Field(default=Decimal("0.00"), ge=0)
+    useful_life_months: int = Field(gt=0, le=1200)
+    method: DepreciationMethod = DepreciationMethod.STRAIGHT_LINE
+    declining_factor: Decimal = Field(default=Decimal("2.00"), gt=0)
+    asset_chart_account_id: Optional[int] = None
+    expense_chart_account_id: Optional[int] = None
+
+class FixedAssetResponse(BaseModel):
+    id: int
+    name: str
+    asset_group: Optional[str]
+    acquisition_date: date
+    cost: Decimal
+    salvage_value: Decimal
+    useful_life_months: int
+    method: DepreciationMethod
+    declining_factor: Decimal
+    accumulated_depreciation: Decimal
+    asset_chart_account_id: int
+    expense_chart_account_id: int
+    is_active: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class DepreciationRunRequest(BaseModel):
+    period_end: date  # Last day of the month to depreciate
+    group_by_asset_group: bool = False
+
+class DepreciationRunResponse(BaseModel):
+    period_end: date
+    asset_count: int
+    total_amount: Decimal
+    journal_entries: int
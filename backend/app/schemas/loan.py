@@ -0,0 +1,54 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime, date
+from decimal import Decimal
+from app.models.tenant.loan import DebtType, AmortizationMethod
+
+class CreateLoanRequest(BaseModel):
+    name: str
+    lender: Optional[str] = None
+    debt_type: DebtType = DebtType.TERM_LOAN
+    amortization_method: AmortizationMethod = AmortizationMethod.ANNUITY
+    principal: Decimal = Field(gt=0)
+    annual_interest_rate: Decimal = Field(ge=0)
+    term_months: int = Field(gt=0, le=600)
+    start_date: date
+    account_id: int
+    liability_chart_account_id: Optional[int] = None
+    interest_chart_account_id: Optional[int] = None
+
+class LoanResponse(BaseModel):
+    id: int
+    name: str
+    lender: Optional[str]
+    debt_type: DebtType
+    amortization_method: AmortizationMethod
+    principal: Decimal
+    annual_interest_rate: Decimal
+    term_months: int
+    start_date: date
+    account_id: int
+    liability_chart_account_id: int
+    interest_chart_account_id: int
+    is_active: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class LoanScheduleRow(BaseModel):
+    period_number: int
+    due_date: date
+    principal_amount: Decimal
+    interest_amount: Decimal
+    payment_amount: Decimal
+    remaining_balance: Decimal
+
+class PostLoanPaymentsRequest(BaseModel):
+    through_date: date
+
+class PostLoanPaymentsResponse(BaseModel):
+    journal_entries: int
+    payments: int
+    principal_total: Decimal
+    interest_total: Decimal
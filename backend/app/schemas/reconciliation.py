@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime, date
+from decimal import Decimal
+
+class StatementLineInput(BaseModel):
+    statement_date: date
+    amount: Decimal  # Positive = money in, negative = money out
+    description: str
+    reference: Optional[str] = None
+
+class ImportStatementLinesRequest(BaseModel):
+    account_id: int
+    lines: List[StatementLineInput] = Field(max_length=100000)
+
+class ImportStatementLinesResponse(BaseModel):
+    imported: int
+
+class StatementLineResponse(BaseModel):
+    id: int
+    account_id: int
+    statement_date: date
+    amount: Decimal
+    description: str
+    reference: Optional[str]
+    transaction_id: Optional[int]
+    match_type: Optional[str]
+    score: Optional[Decimal]
+
+class ReconcileRequest(BaseModel):
+    account_id: Optional[int] = None  # All accounts when omitted
+    window_days: int = Field(default=3, ge=0, le=60)
+    min_score: float = Field(default=0.4, ge=0, le=1)
+
+class ReconcileResponse(BaseModel):
+    exact_matches: int
+    fuzzy_matches: int
+    unmatched_statement_lines: int
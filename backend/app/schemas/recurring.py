@@ -0,0 +1,65 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime, date
+from decimal import Decimal
+from app.models.tenant.transaction import TransactionType
+from app.models.tenant.recurring_transaction import RecurrenceFrequency
+
+class CreateRecurringTransactionRequest(BaseModel):
+    name: str
+    account_id: int
+    transaction_type: TransactionType
+    amount: Decimal = Field(gt=0)
+    description: str
+    category_id: Optional[int] = None
+    counter_chart_account_id: Optional[int] = None
+    counter_account_code: Optional[str] = None  # e.g. "5300" for rent
+    rrule: Optional[str] = None  # e.g. "FREQ=MONTHLY;BYMONTHDAY=1"; overrides the schedule fields
+    frequency: Optional[RecurrenceFrequency] = None
+    interval: int = Field(default=1, ge=1, le=1000)
+    by_weekday: Optional[int] = Field(default=None, ge=0, le=6)
+    by_month_day: Optional[int] = Field(default=None, ge=1, le=31)
+    start_date: date
+    until_date: Optional[date] = None
+    occurrence_limit: Optional[int] = Field(default=None, gt=0)
+
+class RecurringTransactionResponse(BaseModel):
+    id: int
+    name: str
+    account_id: int
+    transaction_type: TransactionType
+    amount: Decimal
+    description: str
+    category_id: Optional[int]
+    counter_chart_account_id: Optional[int]
+    frequency: RecurrenceFrequency
+    interval: int
+    by_weekday: Optional[int]
+    by_month_day: Optional[int]
+    start_date: date
+    until_date: Optional[date]
+    occurrence_limit: Optional[int]
+    occurrences_posted: int
+    last_posted_date: Optional[date]
+    is_active: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class RecurringOccurrenceRow(BaseModel):
+    occurrence_number: int
+    occurrence_date: date
+
+class PostRecurringTransactionsRequest(BaseModel):
+    through_date: date
+
+class PostRecurringTransactionsResponse(BaseModel):
+    templates: int
+    occurrences: int
+    transactions: int
+    duplicates: int
+    deposit_total: Decimal
+    withdrawal_total: Decimal
+    first_date: Optional[date]
+    last_date: Optional[date]
@@ -0,0 +1,52 @@
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.database import SessionLocal, get_tenant_db
+from app.models.company import Company
+from app.models.person_company import PersonCompany
+from app.services.archive_service import archive_closed_periods
+
+def archive_all_ledgers():
+    """Archive closed-period ledger lines for every tenant database"""
+    db = SessionLocal()
+    try:
+        companies = db.query(Company).filter(
+            Company.database_name.isnot(None)
+        ).all()
+        
+        for company in companies:
+            # Scheduled runs are recorded against the company owner
+            owner = db.query(PersonCompany).filter(
+                PersonCompany.company_id == company.id,
+                PersonCompany.role == "owner"
+            ).first()
+            if not owner:
+                print(f"Skipped '{company.database_name}': no owner")
+                continue
+            
+            tenant_db_gen = get_tenant_db(company.id, company.database_name)
+            tenant_db = next(tenant_db_gen)
+            try:
+                report = archive_closed_periods(tenant_db, created_by=owner.person_id)
+                print(
+                    f"Archived {report['line_count']} lines through {report['archived_through']} "
+                    f"for '{company.database_name}': {report['archived_bytes']} bytes moved, "
+                    f"{report['archive_bytes']} bytes compressed, {report['reclaimed_bytes']} bytes reclaimed"
+                )
+            except ValueError as e:
+                tenant_db.rollback()
+                print(f"Skipped '{company.database_name}': {e}")
+            except Exception as e:
+                tenant_db.rollback()
+                print(f"Error archiving ledger for '{company.database_name}': {e}")
+            finally:
+                tenant_db.close()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    archive_all_ledgers()
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import argparse
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+from app.services.money import find_unbalanced, from_minor, validate_entry_lines
+
+def decimal_validation(entry_index, debits, credits) -> int:
+    """The previous approach: per-line Decimal(str(...)) conversion and Decimal sums"""
+    totals = {}
+    for position, debit, credit in zip(entry_index, debits, credits):
+        debit_amount = Decimal(str(debit or 0))
+        credit_amount = Decimal(str(credit or 0))
+        if (debit_amount > 0) == (credit_amount > 0):
+            raise ValueError("Line must have either a debit or a credit amount")
+        total_debits, total_credits = totals.get(position, (Decimal("0.00"), Decimal("0.00")))
+        totals[position] = (total_debits + debit_amount, total_credits + credit_amount)
+    return sum(1 for total_debits, total_credits in totals.values() if total_debits != total_credits)
+
+def benchmark_money(lines: int, lines_per_entry: int, seed: int):
+    """Time validating `lines` journal lines with Decimals versus int64 minor units"""
+    rng = np.random.default_rng(seed)
+    entries = lines // lines_per_entry
+    entry_index = np.repeat(np.arange(entries), lines_per_entry)
+    
+    # Balanced entries: every line but the last is a debit, the last credits their sum
+    debit_minor = rng.integers(1, 10_000_000, size=(entries, lines_per_entry), dtype=np.int64)
+    debit_minor[:, -1] = 0
+    credit_minor = np.zeros_like(debit_minor)
+    credit_minor[:, -1] = debit_minor.sum(axis=1)
+    debit_minor = debit_minor.reshape(-1)
+    credit_minor = credit_minor.reshape(-1)
+    
+    # What Numeric(15, 2) columns arrive as through the driver
+    debit_decimals = [from_minor(value) if value else None for value in debit_minor.tolist()]
+    credit_decimals = [from_minor(value) if value else None for value in credit_minor.tolist()]
+    
+    start = time.perf_counter()
+    unbalanced = decimal_validation(entry_index.tolist(), debit_decimals, credit_decimals)
+    decimal_seconds = time.perf_counter() - start
+    assert unbalanced == 0
+    
+    start = time.perf_counter()
+    one_sided = (debit_minor > 0) != (credit_minor > 0)
+    assert one_sided.all() and not len(find_unbalanced(entry_index, debit_minor, credit_minor))
+    minor_seconds = time.perf_counter() - start
+    
+    # Line dicts coming from Python callers still pay one conversion per amount
+    entry_dicts = [
+        {"lines": [
+            {"debit_amount": debit_decimals[i], "credit_amount": credit_decimals[i]}
+            for i in range(position * lines_per_entry, (position + 1) * lines_per_entry)
+        ]}
+        for position in range(entries)
+    ]
+    start = time.perf_counter()
+    validate_entry_lines(entry_dicts)
+    boundary_seconds = time.perf_counter() - start
+    
+    print(f"{len(entry_index):,} lines in {entries:,} entries")
+    print(f"Decimal loop:                  {decimal_seconds:.3f}s")
+    print(f"int64 minor units (from SQL):  {minor_seconds:.3f}s ({decimal_seconds / minor_seconds:.0f}x)")
+    print(f"Decimal lines -> minor units:  {boundary_seconds:.3f}s ({decimal_seconds / boundary_seconds:.1f}x)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark journal line validation in Decimal vs minor units")
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--lines-per-entry", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark_money(args.lines, args.lines_per_entry, args.seed)
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import uuid
+import argparse
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.database import SessionLocal, get_tenant_db
+from app.models.company import Company
+from app.models.person_company import PersonCompany
+from app.models.tenant.account import Account
+from app.services.accounting_service import create_transaction_with_journal
+from app.services.posting_queue_service import enqueue_postings, drain_posting_queue
+
+def benchmark_posting_queue(company_id: int, count: int, batch_size: int):
+    """
+    Compare posts/sec of the synchronous path (one commit per posting) with the queue
+    (one commit per acknowledged posting, then one commit per batch when posting).
+    Writes real postings: run it against a scratch tenant.
+    """
+    db = SessionLocal()
+    try:
+        company = db.query(Company).filter(Company.id == company_id).first()
+        if not company or not company.database_name:
+            print(f"Company {company_id} has no tenant database")
+            return
+        owner = db.query(PersonCompany).filter(
+            PersonCompany.company_id == company.id,
+            PersonCompany.role == "owner"
+        ).first()
+        if not owner:
+            print(f"Company {company_id} has no owner")
+            return
+    finally:
+        db.close()
+    
+    tenant_db_gen = get_tenant_db(company.id, company.database_name)
+    tenant_db = next(tenant_db_gen)
+    try:
+        account = tenant_db.query(Account).order_by(Account.id).first()
+        if not account:
+            print(f"'{company.database_name}' has no accounts")
+            return
+        
+        # Distinct descriptions so the content-hash index does not drop any posting
+        run_id = uuid.uuid4().hex[:8]
+        def transaction(path: str, i: int):
+            return {
+                "account_id": account.id,
+                "transaction_type": "deposit",
+                "amount": Decimal("1.00"),
+                "description": f"Posting benchmark {run_id} {path} #{i}",
+                "transaction_date": date.today()
+            }
+        
+        start = time.perf_counter()
+        for i in range(count):
+            create_transaction_with_journal(
+                tenant_db, created_by=owner.person_id, company_id=company.id, **transaction("sync", i)
+            )
+        sync_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for i in range(count):
+            enqueue_postings(tenant_db, [transaction("queue", i)], owner.person_id)
+        enqueue_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        totals = drain_posting_queue(tenant_db, company.id, batch_size=batch_size)
+        drain_seconds = time.perf_counter() - start
+        
+        print(f"Synchronous: {count} postings in {sync_seconds:.2f}s ({count / sync_seconds:.0f} posts/sec)")
+        print(f"Queue acknowledge: {count} postings in {enqueue_seconds:.2f}s ({count / enqueue_seconds:.0f} acks/sec)")
+        print(
+            f"Queue posting (batch size {batch_size}): {totals['posted']} posted in {drain_seconds:.2f}s "
+            f"({totals['posted'] / drain_seconds:.0f} posts/sec)"
+        )
+        print(f"Queue end to end: {count / (enqueue_seconds + drain_seconds):.0f} posts/sec")
+    finally:
+        tenant_db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the posting queue against synchronous posting")
+    parser.add_argument("--company-id", type=int, required=True)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    benchmark_posting_queue(args.company_id, args.count, args.batch_size)
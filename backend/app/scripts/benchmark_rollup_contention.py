@@ -0,0 +1,144 @@
+import os
+import sys
+import time
+import argparse
+import threading
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.core.database import SessionLocal, get_tenant_db_connection_string
+from app.models.company import Company
+from app.models.tenant.chart_of_accounts import ChartOfAccount
+from app.services.accounting_service import create_posted_journal_entries, _default_counter_accounts
+from app.services.ledger_event_service import CURRENT_XACT_SQL
+from app.services.rollup_service import apply_events_to_rollups
+
+OWN_EVENTS_QUERY = text(f"SELECT id FROM ledger_events WHERE xact_id = {CURRENT_XACT_SQL}")
+
+def _entry(chart_account_id: int, counter_account_id: int, i: int) -> dict:
+    return {
+        "entry_date": date.today(),
+        "description": f"Rollup contention benchmark #{i}",
+        "lines": [
+            {"chart_account_id": chart_account_id, "debit_amount": Decimal("1.00")},
+            {"chart_account_id": counter_account_id, "credit_amount": Decimal("1.00")}
+        ]
+    }
+
+def run_posters(TenantSession, company_id: int, chart_account_id: int, counter_account_id: int,
+                workers: int, postings: int, inline: bool, hold_ms: int) -> float:
+    """
+    Run `workers` threads each posting `postings` entries to the account; returns posts/sec.
+    With `inline` every posting also adds its event to the rollup cube, as postings did
+    before the cube became a projection.
+    """
+    errors = []
+
+    def poster():
+        session = TenantSession()
+        try:
+            for i in range(postings):
+                create_posted_journal_entries(
+                    session, [_entry(chart_account_id, counter_account_id, i)], 0, company_id
+                )
+                if inline:
+                    apply_events_to_rollups(session, session.execute(OWN_EVENTS_QUERY).scalars().all())
+                # Stands in for the rest of a posting transaction, which holds its row locks until commit
+                session.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": hold_ms / 1000})
+                session.rollback()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=poster) for _ in range(workers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return workers * postings / seconds
+
+def run_projection_writer(TenantSession, company_id: int, chart_account_id: int, counter_account_id: int,
+                          count: int) -> float:
+    """Apply `count` posted events to the rollup cube in one batch, as the projection worker does; returns events/sec"""
+    session = TenantSession()
+    try:
+        create_posted_journal_entries(
+            session, [_entry(chart_account_id, counter_account_id, i) for i in range(count)], 0, company_id
+        )
+        event_ids = session.execute(OWN_EVENTS_QUERY).scalars().all()
+        start = time.perf_counter()
+        apply_events_to_rollups(session, event_ids)
+        seconds = time.perf_counter() - start
+        session.rollback()
+    finally:
+        session.close()
+    return len(event_ids) / seconds
+
+def benchmark_rollup_contention(company_id: int, account_code: str, workers: int, postings: int, hold_ms: int):
+    """
+    Many parallel posters against one chart account, with the rollup cube written inside
+    each posting (every poster upserts the account's rollup rows and queues on their
+    locks) and as a projection (postings only append events; the single projection
+    writer adds them in batches). Every transaction is rolled back, so nothing is
+    written and it is safe to run against a live tenant.
+    """
+    db = SessionLocal()
+    try:
+        company = db.query(Company).filter(Company.id == company_id).first()
+        if not company or not company.database_name:
+            print(f"Company {company_id} has no tenant database")
+            return
+    finally:
+        db.close()
+
+    tenant_engine = create_engine(
+        get_tenant_db_connection_string(company.id, company.database_name),
+        pool_size=workers, max_overflow=0, echo=False
+    )
+    TenantSession = sessionmaker(autocommit=False, autoflush=False, bind=tenant_engine)
+    try:
+        tenant_db = TenantSession()
+        try:
+            chart_account = tenant_db.query(ChartOfAccount).filter(
+                ChartOfAccount.account_code == account_code
+            ).first()
+            revenue_account, _ = _default_counter_accounts(tenant_db, company.id)
+        finally:
+            tenant_db.close()
+        if not chart_account or not revenue_account:
+            print(f"'{company.database_name}' has no account {account_code} or no revenue account")
+            return
+
+        print(f"{workers} posters x {postings} postings to account {account_code}, {hold_ms}ms per transaction")
+        for label, inline in (("Rollup written by each posting", True), ("Rollup as a projection", False)):
+            rate = run_posters(
+                TenantSession, company.id, chart_account.id, revenue_account.id, workers, postings, inline, hold_ms
+            )
+            print(f"{label}: {rate:.0f} posts/sec")
+        rate = run_projection_writer(
+            TenantSession, company.id, chart_account.id, revenue_account.id, workers * postings
+        )
+        print(f"Projection writer: {rate:.0f} events/sec applied in one batch")
+    finally:
+        tenant_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark hot-account contention on the rollup cube")
+    parser.add_argument("--company-id", type=int, required=True)
+    parser.add_argument("--account-code", default="1000")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--postings", type=int, default=50)
+    parser.add_argument("--hold-ms", type=int, default=5)
+    args = parser.parse_args()
+    benchmark_rollup_contention(args.company_id, args.account_code, args.workers, args.postings, args.hold_ms)
@@ -30,6 +30,10 @@ python -m app.scripts.seed_modules || echo "Warning: Module seeding failed"
 echo "Seeding subscription plans..."
 python -m app.scripts.seed_subscription_plans || echo "Warning: Subscription plan seeding failed"
 
+# Upgrade existing tenant databases to the current tenant schema
+echo "Migrating tenant schemas..."
+python -m app.scripts.migrate_tenant_schemas || echo "Warning: Tenant schema migration failed"
+
 # Run database migrations (if using Alembic)
 # alembic upgrade head
 
@@ -0,0 +1,51 @@
+import os
+import sys
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.database import SessionLocal, get_tenant_db
+from app.models.company import Company
+from app.services.fx_service import fetch_rates_from_api, parse_rates_csv, upsert_rates
+
+def load_fx_rates(file: str = None, base: str = None, date_from: date = None, date_to: date = None):
+    """Load exchange rates from a CSV file (date,base,quote,rate) or the rate API into every tenant"""
+    if file:
+        rates = parse_rates_csv(Path(file).read_text())
+        source = Path(file).name
+    else:
+        rates = fetch_rates_from_api(base, date_from, date_to)
+        source = "api"
+    print(f"Loaded {len(rates)} rates from {file or 'the rate API'}")
+    
+    db = SessionLocal()
+    try:
+        companies = db.query(Company).filter(
+            Company.database_name.isnot(None)
+        ).all()
+        
+        for company in companies:
+            tenant_db_gen = get_tenant_db(company.id, company.database_name)
+            tenant_db = next(tenant_db_gen)
+            try:
+                count = upsert_rates(tenant_db, rates, source=source)
+                print(f"Saved {count} rates to '{company.database_name}'")
+            except Exception as e:
+                tenant_db.rollback()
+                print(f"Error saving rates for '{company.database_name}': {e}")
+            finally:
+                tenant_db.close()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load exchange rates into all tenant databases")
+    parser.add_argument("--file", help="CSV file with columns date,base,quote,rate")
+    parser.add_argument("--base", default="USD", help="Base currency to fetch from FX_RATES_API_URL")
+    parser.add_argument("--date-from", type=date.fromisoformat, default=date.today() - timedelta(days=7))
+    parser.add_argument("--date-to", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+    load_fx_rates(args.file, args.base, args.date_from, args.date_to)
@@ -0,0 +1,34 @@
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine
+from app.core.database import SessionLocal, get_tenant_db_connection_string
+from app.models.company import Company
+from app.services.tenant_db import upgrade_tenant_schema
+
+def migrate_tenant_schemas():
+    """Bring every existing tenant database up to the current tenant schema"""
+    db = SessionLocal()
+    try:
+        companies = db.query(Company).filter(
+            Company.database_name.isnot(None)
+        ).all()
+        
+        for company in companies:
+            try:
+                connection_string = get_tenant_db_connection_string(company.id, company.database_name)
+                tenant_engine = create_engine(connection_string, echo=False)
+                upgrade_tenant_schema(tenant_engine)
+                tenant_engine.dispose()
+                print(f"Migrated tenant database '{company.database_name}'")
+            except Exception as e:
+                print(f"Error migrating tenant database '{company.database_name}': {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate_tenant_schemas()
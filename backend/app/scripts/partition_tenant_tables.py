@@ -0,0 +1,61 @@
+import os
+import sys
+import argparse
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine
+from app.core.config import settings
+from app.core.database import SessionLocal, get_tenant_db_connection_string
+from app.models.company import Company
+from app.models.tenant.role import Base as TenantBase
+from app.services.partition_service import (
+    PARTITION_INTERVALS, apply_partitioning, check_partition_pruning, period_start, next_period
+)
+
+def partition_tenant_tables(interval: str, verify: bool = False):
+    """Partition ledger tables of every tenant in place and roll partitions forward"""
+    db = SessionLocal()
+    try:
+        companies = db.query(Company).filter(
+            Company.database_name.isnot(None)
+        ).all()
+        
+        for company in companies:
+            try:
+                connection_string = get_tenant_db_connection_string(company.id, company.database_name)
+                tenant_engine = create_engine(connection_string, echo=False)
+                with tenant_engine.begin() as conn:
+                    converted = apply_partitioning(conn, interval)
+                    # Recreate model indexes on the new partitioned tables
+                    for table in TenantBase.metadata.sorted_tables:
+                        for index in table.indexes:
+                            index.create(bind=conn, checkfirst=True)
+                for table, was_converted in converted.items():
+                    state = "partitioned" if was_converted else "already partitioned"
+                    print(f"{company.database_name}.{table}: {state}")
+                
+                if verify:
+                    start = period_start(date.today(), interval)
+                    with tenant_engine.connect() as conn:
+                        report = check_partition_pruning(conn, start, next_period(start, interval))
+                    for name, result in report.items():
+                        print(
+                            f"  {name}: scans {len(result['scanned'])} of {result['partitions']} "
+                            f"{result['table']} partitions ({', '.join(result['scanned'])})"
+                        )
+                tenant_engine.dispose()
+            except Exception as e:
+                print(f"Error partitioning tenant database '{company.database_name}': {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Range-partition tenant ledger tables")
+    parser.add_argument("--interval", choices=PARTITION_INTERVALS, default=settings.TENANT_PARTITION_INTERVAL or "year")
+    parser.add_argument("--verify", action="store_true", help="EXPLAIN report queries and show pruned partitions")
+    args = parser.parse_args()
+    partition_tenant_tables(args.interval, args.verify)
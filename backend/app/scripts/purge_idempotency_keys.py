@@ -0,0 +1,35 @@
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.database import SessionLocal, get_tenant_db
+from app.models.company import Company
+from app.services.idempotency_service import purge_expired_idempotency_keys
+
+def purge_all_idempotency_keys():
+    """Delete expired Idempotency-Key records from every tenant database (run from cron)"""
+    db = SessionLocal()
+    try:
+        companies = db.query(Company).filter(
+            Company.database_name.isnot(None)
+        ).all()
+        
+        for company in companies:
+            tenant_db_gen = get_tenant_db(company.id, company.database_name)
+            tenant_db = next(tenant_db_gen)
+            try:
+                deleted = purge_expired_idempotency_keys(tenant_db)
+                print(f"Purged {deleted} expired idempotency keys from '{company.database_name}'")
+            except Exception as e:
+                tenant_db.rollback()
+                print(f"Error purging idempotency keys for '{company.database_name}': {e}")
+            finally:
+                tenant_db.close()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    purge_all_idempotency_keys()
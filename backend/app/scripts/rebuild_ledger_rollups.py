@@ -0,0 +1,35 @@
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.database import SessionLocal, get_tenant_db
+from app.models.company import Company
+from app.services.rollup_service import rebuild_ledger_rollups
+
+def rebuild_all_ledger_rollups():
+    """Backfill or rebuild the dashboard rollup cube for every tenant database"""
+    db = SessionLocal()
+    try:
+        companies = db.query(Company).filter(
+            Company.database_name.isnot(None)
+        ).all()
+        
+        for company in companies:
+            tenant_db_gen = get_tenant_db(company.id, company.database_name)
+            tenant_db = next(tenant_db_gen)
+            try:
+                rows = rebuild_ledger_rollups(tenant_db)
+                print(f"Rebuilt {rows} rollup rows for '{company.database_name}'")
+            except Exception as e:
+                tenant_db.rollback()
+                print(f"Error rebuilding rollups for '{company.database_name}': {e}")
+            finally:
+                tenant_db.close()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_all_ledger_rollups()
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.database import SessionLocal, get_tenant_db_connection_string
+from app.models.company import Company
+from app.services.posting_queue_service import process_posting_queue
+
+def run_posting_queue(once: bool = False):
+    """
+    Post queued transactions for every tenant in batches of POSTING_QUEUE_BATCH_SIZE.
+    Polls until interrupted; with once, drains every queue and exits.
+    """
+    # Tenant engines are kept across polls so each poll does not reconnect
+    session_factories = {}
+    poll_seconds = settings.POSTING_QUEUE_MAX_DELAY_MS / 2000
+    
+    while True:
+        db = SessionLocal()
+        try:
+            companies = db.query(Company).filter(
+                Company.database_name.isnot(None)
+            ).all()
+        finally:
+            db.close()
+        
+        for company in companies:
+            if company.id not in session_factories:
+                connection_string = get_tenant_db_connection_string(company.id, company.database_name)
+                session_factories[company.id] = sessionmaker(
+                    autocommit=False, autoflush=False, bind=create_engine(connection_string, echo=False)
+                )
+            tenant_db = session_factories[company.id]()
+            try:
+                while True:
+                    result = process_posting_queue(tenant_db, company.id, force=once)
+                    if result["processed"]:
+                        print(
+                            f"'{company.database_name}': posted {result['posted']}, "
+                            f"{result['duplicates']} duplicates, {result['failed']} failed"
+                        )
+                    # A full batch means more may be waiting
+                    if result["processed"] < settings.POSTING_QUEUE_BATCH_SIZE:
+                        break
+            except Exception as e:
+                tenant_db.rollback()
+                print(f"Error posting queue for '{company.database_name}': {e}")
+            finally:
+                tenant_db.close()
+        
+        if once:
+            break
+        time.sleep(poll_seconds)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Post queued transactions for all tenants")
+    parser.add_argument("--once", action="store_true", help="Drain every queue once and exit")
+    args = parser.parse_args()
+    run_posting_queue(once=args.once)
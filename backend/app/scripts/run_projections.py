@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.database import SessionLocal, get_tenant_db_connection_string
+from app.models.company import Company
+from app.services.projection_service import run_projections
+
+def run_all_projections(once: bool = False):
+    """
+    Apply new ledger events to every projected read model of every tenant.
+    Polls every PROJECTION_POLL_MS until interrupted; with once, catches up and exits.
+    """
+    # Tenant engines are kept across polls so each poll does not reconnect
+    session_factories = {}
+    poll_seconds = settings.PROJECTION_POLL_MS / 1000
+    
+    while True:
+        db = SessionLocal()
+        try:
+            companies = db.query(Company).filter(
+                Company.database_name.isnot(None)
+            ).all()
+        finally:
+            db.close()
+        
+        for company in companies:
+            if company.id not in session_factories:
+                connection_string = get_tenant_db_connection_string(company.id, company.database_name)
+                session_factories[company.id] = sessionmaker(
+                    autocommit=False, autoflush=False, bind=create_engine(connection_string, echo=False)
+                )
+            tenant_db = session_factories[company.id]()
+            try:
+                applied = run_projections(tenant_db)
+                for name, events in applied.items():
+                    if events:
+                        print(f"'{company.database_name}': applied {events} events to {name}")
+            except Exception as e:
+                tenant_db.rollback()
+                print(f"Error running projections for '{company.database_name}': {e}")
+            finally:
+                tenant_db.close()
+        
+        if once:
+            break
+        time.sleep(poll_seconds)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Project ledger events into read models for all tenants")
+    parser.add_argument("--once", action="store_true", help="Catch every projection up once and exit")
+    args = parser.parse_args()
+    run_all_projections(once=args.once)
@@ -0,0 +1,57 @@
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.database import SessionLocal, get_tenant_db
+from app.models.company import Company
+from app.models.person_company import PersonCompany
+from app.services.recurring_service import post_due_recurring_transactions
+
+def run_all_recurring_transactions():
+    """
+    Post recurring transactions due through today for every tenant database (e.g. daily
+    from cron). After downtime, each tenant's missed occurrences are posted as one batch.
+    """
+    db = SessionLocal()
+    try:
+        companies = db.query(Company).filter(
+            Company.database_name.isnot(None)
+        ).all()
+        
+        for company in companies:
+            # Scheduled runs are recorded against the company owner
+            owner = db.query(PersonCompany).filter(
+                PersonCompany.company_id == company.id,
+                PersonCompany.role == "owner"
+            ).first()
+            if not owner:
+                print(f"Skipped '{company.database_name}': no owner")
+                continue
+            
+            tenant_db_gen = get_tenant_db(company.id, company.database_name)
+            tenant_db = next(tenant_db_gen)
+            try:
+                summary = post_due_recurring_transactions(
+                    tenant_db, date.today(), created_by=owner.person_id, company_id=company.id
+                )
+                print(
+                    f"Posted {summary['transactions']} of {summary['occurrences']} recurring occurrences "
+                    f"from {summary['templates']} templates for '{company.database_name}'"
+                )
+            except ValueError as e:
+                tenant_db.rollback()
+                print(f"Skipped '{company.database_name}': {e}")
+            except Exception as e:
+                tenant_db.rollback()
+                print(f"Error posting recurring transactions for '{company.database_name}': {e}")
+            finally:
+                tenant_db.close()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_all_recurring_transactions()
@@ -0,0 +1,44 @@
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.database import SessionLocal, get_tenant_db
+from app.models.company import Company
+from app.services.anomaly_service import scan_transaction_anomalies
+
+def scan_all_anomalies():
+    """
+    Flag anomalous transactions posted since the last scan for every tenant database
+    (e.g. nightly from cron), scanning batch after batch until each tenant is caught up.
+    """
+    db = SessionLocal()
+    try:
+        companies = db.query(Company).filter(
+            Company.database_name.isnot(None)
+        ).all()
+        
+        for company in companies:
+            tenant_db_gen = get_tenant_db(company.id, company.database_name)
+            tenant_db = next(tenant_db_gen)
+            try:
+                transactions = flags = 0
+                while True:
+                    summary = scan_transaction_anomalies(tenant_db)
+                    transactions += summary["transactions"]
+                    flags += summary["flags"]
+                    if not summary["events"] or not summary["pending"]:
+                        break
+                print(f"Flagged {flags} anomalies in {transactions} new transactions for '{company.database_name}'")
+            except Exception as e:
+                tenant_db.rollback()
+                print(f"Error scanning '{company.database_name}' for anomalies: {e}")
+            finally:
+                tenant_db.close()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    scan_all_anomalies()
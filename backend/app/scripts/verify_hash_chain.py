@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.config import settings
+from app.core.database import SessionLocal, get_tenant_db
+from app.models.company import Company
+from app.services.hash_chain_service import verify_hash_chain
+
+def verify_all_hash_chains(company_id: int = None, full: bool = False, workers: int = 1, segment_size: int = None):
+    """Verify the journal entry hash chain of every tenant (or one), resuming from the last verification"""
+    db = SessionLocal()
+    try:
+        query = db.query(Company).filter(Company.database_name.isnot(None))
+        if company_id is not None:
+            query = query.filter(Company.id == company_id)
+        companies = query.all()
+    finally:
+        db.close()
+    
+    for company in companies:
+        tenant_db_gen = get_tenant_db(company.id, company.database_name)
+        tenant_db = next(tenant_db_gen)
+        try:
+            start = time.perf_counter()
+            verification = verify_hash_chain(
+                tenant_db, company.id, company.database_name,
+                full=full, workers=workers, segment_size=segment_size
+            )
+            seconds = time.perf_counter() - start
+            summary = (
+                f"'{company.database_name}': verified {verification.entry_count} entries "
+                f"(positions {verification.verified_from}-{verification.verified_through}, "
+                f"{verification.segment_count} segments) in {seconds:.2f}s"
+            )
+            if verification.broken_position is not None:
+                summary += f"; CHAIN BROKEN at position {verification.broken_position}"
+            print(summary)
+        except Exception as e:
+            tenant_db.rollback()
+            print(f"Error verifying hash chain for '{company.database_name}': {e}")
+        finally:
+            tenant_db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify the journal entry hash chain of all tenants")
+    parser.add_argument("--company-id", type=int, default=None)
+    parser.add_argument("--full", action="store_true", help="Re-verify the whole chain instead of new entries only")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes verifying segments in parallel")
+    parser.add_argument("--segment-size", type=int, default=settings.HASH_CHAIN_SEGMENT_SIZE)
+    args = parser.parse_args()
+    verify_all_hash_chains(args.company_id, args.full, args.workers, args.segment_size)
@@ -1,29 +1,55 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import func, text, insert
 from decimal import Decimal
 from typing import List, Dict, Optional
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta
 from app.models.tenant.journal_entry import JournalEntry
 from app.models.tenant.journal_entry_line import JournalEntryLine
 from app.models.tenant.chart_of_accounts import ChartOfAccount, AccountType
+from app.models.tenant.period_close import PeriodClose
+from app.services.money import (
+    LEDGER_EXPONENT, to_minor, from_minor, minor_units, currency_exponent,
+    validate_entry_lines
+)
+
+ENTRY_NUMBER_SEQUENCE = "journal_entry_number_seq"
 
 
 def validate_journal_entry_balance(db: Session, journal_entry_id: int) -> bool:
     """Validate that a journal entry has balanced debits and credits"""
-    lines = db.query(JournalEntryLine).filter(
+    total_debits, total_credits = db.query(
+        func.coalesce(func.sum(minor_units(JournalEntryLine.debit_amount)), 0),
+        func.coalesce(func.sum(minor_units(JournalEntryLine.credit_amount)), 0)
+    ).filter(
         JournalEntryLine.journal_entry_id == journal_entry_id
-    ).all()
-    
-    total_debits = sum(
-        Decimal(str(line.debit_amount or 0)) for line in lines
-    )
-    total_credits = sum(
-        Decimal(str(line.credit_amount or 0)) for line in lines
-    )
+    ).one()
     
     return total_debits == total_credits
 
 
+def find_unbalanced_entries(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> List[int]:
+    """
+    Ids of journal entries whose lines do not balance, checked across the whole ledger
+    (or a date range) in one grouped aggregate over integer minor units. Only the
+    offending ids leave the database.
+    """
+    query = db.query(JournalEntryLine.journal_entry_id)
+    if date_from:
+        query = query.filter(JournalEntryLine.entry_date >= datetime.combine(date_from, time.min))
+    if date_to:
+        query = query.filter(JournalEntryLine.entry_date < datetime.combine(date_to + timedelta(days=1), time.min))
+    rows = query.group_by(JournalEntryLine.journal_entry_id).having(
+        func.sum(minor_units(JournalEntryLine.debit_amount))
+        != func.sum(minor_units(JournalEntryLine.credit_amount))
+    ).order_by(JournalEntryLine.journal_entry_id).all()
+    return [row.journal_entry_id for row in rows]
+
+
 def create_journal_entry(
     db: Session,
     entry_number: str,
@@ -38,6 +64,9 @@ def create_journal_entry(
     Create a journal entry with lines.
     Lines should be a list of dicts with: chart_account_id, debit_amount (or credit_amount), description, reference (optional)
     """
+    ensure_period_open(db, entry_date)
+    amounts = validate_entry_lines([{"lines": lines}])[0]
+    
     # Create journal entry
     journal_entry = JournalEntry(
         entry_number=entry_number,
@@ -52,38 +81,18 @@ def create_journal_entry(
     db.flush()
     
     # Create journal entry lines
-    total_debits = Decimal("0.00")
-    total_credits = Decimal("0.00")
-    
-    for line_data in lines:
-        debit_amount = Decimal(str(line_data.get("debit_amount", 0) or 0))
-        credit_amount = Decimal(str(line_data.get("credit_amount", 0) or 0))
-        
-        if debit_amount > 0 and credit_amount > 0:
-            raise ValueError("Line cannot have both debit and credit amounts")
-        if debit_amount == 0 and credit_amount == 0:
-            raise ValueError("Line must have either debit or credit amount")
-        
-        total_debits += debit_amount
-        total_credits += credit_amount
-        
+    for line_data, (debit_minor, credit_minor) in zip(lines, amounts):
         line = JournalEntryLine(
             journal_entry_id=journal_entry.id,
             chart_account_id=line_data["chart_account_id"],
-            debit_amount=debit_amount if debit_amount > 0 else None,
-            credit_amount=credit_amount if credit_amount > 0 else None,
+            debit_amount=from_minor(debit_minor) if debit_minor else None,
+            credit_amount=from_minor(credit_minor) if credit_minor else None,
             description=line_data.get("description"),
-            reference=line_data.get("reference")
+            reference=line_data.get("reference"),
+            entry_date=entry_date
         )
         db.add(line)
     
-    # Validate balance
-    if total_debits != total_credits:
-        db.rollback()
-        raise ValueError(
-            f"Journal entry is not balanced: Debits={total_debits}, Credits={total_credits}"
-        )
-    
     db.commit()
     db.refresh(journal_entry)
     return journal_entry
@@ -102,14 +111,21 @@ def get_account_balance(db: Session, chart_account_id: int) -> Decimal:
     if not chart_account:
         raise ValueError(f"Chart account {chart_account_id} not found")
     
-    # Get all journal entry lines for this account (only from posted entries)
-    lines = db.query(JournalEntryLine).join(JournalEntry).filter(
+    from app.services.archive_service import get_archived_totals
+    
+    # Sum all journal entry lines for this account (only from posted entries) in minor units
+    line_debits, line_credits = db.query(
+        func.coalesce(func.sum(minor_units(JournalEntryLine.debit_amount)), 0),
+        func.coalesce(func.sum(minor_units(JournalEntryLine.credit_amount)), 0)
+    ).join(JournalEntry).filter(
         JournalEntryLine.chart_account_id == chart_account_id,
         JournalEntry.is_posted == True
-    ).all()
+    ).one()
     
-    total_debits = sum(Decimal(str(line.debit_amount or 0)) for line in lines)
-    total_credits = sum(Decimal(str(line.credit_amount or 0)) for line in lines)
+    # Lines of archived periods only exist as archive totals
+    archived_debits, archived_credits = get_archived_totals(db, [chart_account_id])[chart_account_id]
+    total_debits = to_minor(archived_debits) + line_debits
+    total_credits = to_minor(archived_credits) + line_credits
     
     # Calculate balance based on account type
     if chart_account.account_type in [AccountType.ASSET, AccountType.EXPENSE]:
@@ -117,7 +133,7 @@ def get_account_balance(db: Session, chart_account_id: int) -> Decimal:
     else:  # LIABILITY, EQUITY, REVENUE
         balance = total_credits - total_debits
     
-    return balance
+    return from_minor(balance)
 
 
 def get_account_balance_as_of(
@@ -133,15 +149,25 @@ def get_account_balance_as_of(
     if not chart_account:
         raise ValueError(f"Chart account {chart_account_id} not found")
     
-    # Get all posted journal entry lines up to the date
-    lines = db.query(JournalEntryLine).join(JournalEntry).filter(
+    from app.services.archive_service import get_archived_totals
+    
+    # Sum all posted journal entry lines up to the end of the date in minor units.
+    # Filtering on the lines' own entry_date lets partitioned ledgers prune partitions.
+    line_debits, line_credits = db.query(
+        func.coalesce(func.sum(minor_units(JournalEntryLine.debit_amount)), 0),
+        func.coalesce(func.sum(minor_units(JournalEntryLine.credit_amount)), 0)
+    ).join(JournalEntry).filter(
         JournalEntryLine.chart_account_id == chart_account_id,
-        JournalEntry.entry_date <= as_of_date,
+        JournalEntryLine.entry_date < datetime.combine(as_of_date + timedelta(days=1), time.min),
         JournalEntry.is_posted == True
-    ).all()
+    ).one()
     
-    total_debits = sum(Decimal(str(line.debit_amount or 0)) for line in lines)
-    total_credits = sum(Decimal(str(line.credit_amount or 0)) for line in lines)
+    # Lines of archived periods only exist as archive totals
+    archived_debits, archived_credits = get_archived_totals(
+        db, [chart_account_id], as_of_date + timedelta(days=1)
+    )[chart_account_id]
+    total_debits = to_minor(archived_debits) + line_debits
+    total_credits = to_minor(archived_credits) + line_credits
     
     # Calculate balance based on account type
     if chart_account.account_type in [AccountType.ASSET, AccountType.EXPENSE]:
@@ -149,66 +175,29 @@ def get_account_balance_as_of(
     else:  # LIABILITY, EQUITY, REVENUE
         balance = total_credits - total_debits
     
-    return balance
+    return from_minor(balance)
 
 
-def create_transaction_with_journal(
-    db: Session,
-    account_id: int,
+def _transaction_journal_lines(
     transaction_type: str,
     amount: Decimal,
     description: str,
-    transaction_date: date,
-    created_by: int,
-    company_id: int,
-    category_id: Optional[int] = None
-) -> tuple:
-    """
-    Create a transaction and auto-create corresponding journal entry.
-    Returns (transaction, journal_entry)
-    
-    Transaction types:
-    - deposit: Debit Account (asset), Credit Revenue/Equity
-    - withdrawal: Debit Expense, Credit Account (asset)
-    - transfer: Debit Account A, Credit Account B (requires to_account_id)
-    """
-    from app.models.tenant.account import Account
-    from app.models.tenant.transaction import Transaction, TransactionType
-    from app.models.tenant.chart_of_accounts import AccountType as ChartAccountType
-    
-    # Get the account
-    account = db.query(Account).filter(Account.id == account_id).first()
-    if not account:
-        raise ValueError(f"Account {account_id} not found")
-    
-    # Get chart account
-    chart_account = db.query(ChartOfAccount).filter(
-        ChartOfAccount.id == account.chart_account_id
-    ).first()
-    if not chart_account:
-        raise ValueError(f"Chart account {account.chart_account_id} not found")
-    
-    # Generate entry number
-    entry_count = db.query(JournalEntry).filter(
-        JournalEntry.company_id == company_id
-    ).count()
-    entry_number = f"JE-{company_id}-{entry_count + 1:06d}"
+    chart_account_id: int,
+    revenue_account: Optional[ChartOfAccount],
+    expense_account: Optional[ChartOfAccount]
+) -> List[Dict]:
+    """Journal lines for a deposit or withdrawal on the account's chart account"""
+    from app.models.tenant.transaction import TransactionType
     
-    # Create journal entry based on transaction type
     if transaction_type == TransactionType.DEPOSIT:
         # Debit: Account (asset), Credit: Revenue or Equity
         # For simplicity, credit to a default Revenue account (would need to be configured)
-        revenue_account = db.query(ChartOfAccount).filter(
-            ChartOfAccount.account_type == ChartAccountType.REVENUE,
-            ChartOfAccount.company_id == company_id
-        ).first()
-        
         if not revenue_account:
             raise ValueError("No revenue account found in chart of accounts")
         
-        lines = [
+        return [
             {
-                "chart_account_id": chart_account.id,
+                "chart_account_id": chart_account_id,
                 "debit_amount": amount,
                 "description": description
             },
@@ -220,58 +209,560 @@ def create_transaction_with_journal(
         ]
     elif transaction_type == TransactionType.WITHDRAWAL:
         # Debit: Expense, Credit: Account (asset)
-        expense_account = db.query(ChartOfAccount).filter(
-            ChartOfAccount.account_type == ChartAccountType.EXPENSE,
-            ChartOfAccount.company_id == company_id
-        ).first()
-        
         if not expense_account:
             raise ValueError("No expense account found in chart of accounts")
         
-        lines = [
+        return [
             {
                 "chart_account_id": expense_account.id,
                 "debit_amount": amount,
                 "description": description
             },
             {
-                "chart_account_id": chart_account.id,
+                "chart_account_id": chart_account_id,
                 "credit_amount": amount,
                 "description": description
             }
         ]
     else:
         raise ValueError(f"Unsupported transaction type: {transaction_type}")
+
+
+def _default_counter_accounts(db: Session, company_id: int) -> tuple:
+    """(revenue_account, expense_account) credited/debited by deposits and withdrawals"""
+    revenue_account = db.query(ChartOfAccount).filter(
+        ChartOfAccount.account_type == AccountType.REVENUE,
+        ChartOfAccount.company_id == company_id
+    ).first()
+    expense_account = db.query(ChartOfAccount).filter(
+        ChartOfAccount.account_type == AccountType.EXPENSE,
+        ChartOfAccount.company_id == company_id
+    ).first()
+    return revenue_account, expense_account
+
+
+def create_transaction_with_journal(
+    db: Session,
+    account_id: int,
+    transaction_type: str,
+    amount: Decimal,
+    description: str,
+    transaction_date: date,
+    created_by: int,
+    company_id: int,
+    category_id: Optional[int] = None
+) -> tuple:
+    """
+    Create a transaction and auto-create corresponding journal entry.
+    Returns (transaction, journal_entry)
     
-    # Create journal entry
-    journal_entry = create_journal_entry(
-        db=db,
-        entry_number=entry_number,
-        entry_date=transaction_date,
-        description=description,
-        lines=lines,
-        created_by=created_by,
-        company_id=company_id,
-        reference=None
-    )
+    Transaction types:
+    - deposit: Debit Account (asset), Credit Revenue/Equity
+    - withdrawal: Debit Expense, Credit Account (asset)
+    - transfer: Debit Account A, Credit Account B (requires to_account_id)
     
-    # Post the journal entry
-    journal_entry.is_posted = True
+    The transaction row is inserted first; if one with the same content already exists
+    the database rejects it and DuplicateTransactionError is raised before anything is posted.
+    Everything is committed together.
+    """
+    from app.models.tenant.account import Account
+    from app.models.tenant.transaction import Transaction
+    from app.services.dedup_service import insert_transactions, DuplicateTransactionError
     
-    # Create transaction record
-    transaction = Transaction(
-        account_id=account_id,
-        transaction_type=TransactionType(transaction_type),
-        amount=amount,
-        description=description,
-        category_id=category_id,
-        transaction_date=transaction_date,
-        journal_entry_id=journal_entry.id,
-        created_by=created_by
+    # Get the account
+    account = db.query(Account).filter(Account.id == account_id).first()
+    if not account:
+        raise ValueError(f"Account {account_id} not found")
+    
+    # Get chart account
+    chart_account = db.query(ChartOfAccount).filter(
+        ChartOfAccount.id == account.chart_account_id
+    ).first()
+    if not chart_account:
+        raise ValueError(f"Chart account {account.chart_account_id} not found")
+    
+    revenue_account, expense_account = _default_counter_accounts(db, company_id)
+    lines = _transaction_journal_lines(
+        transaction_type, amount, description, chart_account.id, revenue_account, expense_account
     )
-    db.add(transaction)
+    
+    now = datetime.utcnow()
+    transaction_id = insert_transactions(db, [{
+        "account_id": account_id,
+        "transaction_type": transaction_type,
+        "amount": amount,
+        "description": description,
+        "category_id": category_id,
+        "transaction_date": transaction_date,
+        "created_by": created_by,
+        "created_at": now,
+        "updated_at": now
+    }])[0]
+    if transaction_id is None:
+        db.rollback()
+        raise DuplicateTransactionError(
+            f"Transaction already recorded for account {account_id} on {transaction_date.isoformat()}"
+        )
+    
+    # Create and post the journal entry
+    journal_entry_id = create_posted_journal_entries(db, [{
+        "entry_date": transaction_date,
+        "description": description,
+        "lines": lines,
+        "category_id": category_id
+    }], created_by, company_id)[0]
+    
+    db.execute(text("UPDATE transactions SET journal_entry_id = :journal_entry_id WHERE id = :id"), {
+        "journal_entry_id": journal_entry_id,
+        "id": transaction_id
+    })
     db.commit()
-    db.refresh(transaction)
     
+    transaction = db.get(Transaction, transaction_id)
+    journal_entry = db.get(JournalEntry, journal_entry_id)
     return transaction, journal_entry
 
+
+def record_transactions(
+    db: Session,
+    transactions: List[Dict],
+    created_by: int,
+    company_id: int
+) -> List[Optional[int]]:
+    """
+    Bulk-insert transactions and post their journal entries with multi-row inserts.
+    Each row has account_id, transaction_type, amount, description, transaction_date and
+    optional category_id and counter_chart_account_id (the revenue or expense side;
+    default: the first revenue/expense chart account). Rows whose content already exists
+    are dropped by the unique content-hash index and nothing is posted for them.
+    Returns the new transaction id per row, or None for duplicates. Does not commit.
+    """
+    from app.models.tenant.account import Account
+    from app.services.dedup_service import insert_transactions
+    
+    if not transactions:
+        return []
+    
+    account_ids = {transaction["account_id"] for transaction in transactions}
+    accounts = {account.id: account for account in db.query(
+        Account.id, Account.chart_account_id, Account.currency
+    ).filter(Account.id.in_(account_ids)).all()}
+    missing = account_ids - accounts.keys()
+    if missing:
+        raise ValueError(f"Account {min(missing)} not found")
+    
+    counter_ids = {
+        transaction["counter_chart_account_id"] for transaction in transactions
+        if transaction.get("counter_chart_account_id")
+    }
+    counter_accounts = {chart_account.id: chart_account for chart_account in db.query(ChartOfAccount).filter(
+        ChartOfAccount.id.in_(counter_ids)
+    ).all()} if counter_ids else {}
+    missing = counter_ids - counter_accounts.keys()
+    if missing:
+        raise ValueError(f"Chart account {min(missing)} not found")
+    
+    revenue_account, expense_account = _default_counter_accounts(db, company_id)
+    now = datetime.utcnow()
+    rows = []
+    entries = []
+    for transaction in transactions:
+        account = accounts[transaction["account_id"]]
+        counter_account = counter_accounts.get(transaction.get("counter_chart_account_id"))
+        # Amounts finer than the account currency's minor unit (or the ledger's) are rejected
+        exponent = min(currency_exponent(account.currency), LEDGER_EXPONENT)
+        amount = from_minor(to_minor(transaction["amount"], exponent), exponent)
+        entries.append({
+            "entry_date": transaction["transaction_date"],
+            "description": transaction["description"],
+            "lines": _transaction_journal_lines(
+                transaction["transaction_type"], amount, transaction["description"],
+                account.chart_account_id, counter_account or revenue_account, counter_account or expense_account
+            ),
+            "category_id": transaction.get("category_id")
+        })
+        rows.append({
+            "account_id": transaction["account_id"],
+            "transaction_type": transaction["transaction_type"],
+            "amount": amount,
+            "description": transaction["description"],
+            "category_id": transaction.get("category_id"),
+            "transaction_date": transaction["transaction_date"],
+            "created_by": created_by,
+            "created_at": now,
+            "updated_at": now
+        })
+    
+    transaction_ids = insert_transactions(db, rows)
+    inserted = [(transaction_id, entry) for transaction_id, entry in zip(transaction_ids, entries) if transaction_id]
+    
+    if inserted:
+        entry_ids = create_posted_journal_entries(db, [entry for _, entry in inserted], created_by, company_id)
+        db.execute(text("""
+            UPDATE transactions t
+            SET journal_entry_id = u.journal_entry_id
+            FROM unnest(CAST(:ids AS INTEGER[]), CAST(:entry_ids AS INTEGER[])) AS u(id, journal_entry_id)
+            WHERE t.id = u.id
+        """), {"ids": [transaction_id for transaction_id, _ in inserted], "entry_ids": entry_ids})
+    
+    return transaction_ids
+
+
+def import_transactions(
+    db: Session,
+    account_id: int,
+    transactions: List[Dict],
+    created_by: int,
+    company_id: int,
+    tenant_key=None
+) -> Dict:
+    """
+    Bulk-create transactions of one account with their posted journal entries.
+    Rows whose content already exists (repeated imports, client retries) are skipped.
+    Each row has transaction_type, amount, description, transaction_date and optional category_id.
+    With tenant_key, rows without a category are auto-categorized by the tenant's
+    categorization rules, and the rules' hit statistics are updated.
+    """
+    from app.services.categorization_service import categorize_transactions, record_rule_hits
+    
+    rows = [{**transaction, "account_id": account_id} for transaction in transactions]
+    rule_ids = categorize_transactions(db, tenant_key, rows) if tenant_key is not None else [None] * len(rows)
+    transaction_ids = record_transactions(db, rows, created_by, company_id)
+    # Only rows actually recorded count as rule hits
+    applied = [rule_id for rule_id, transaction_id in zip(rule_ids, transaction_ids) if transaction_id]
+    record_rule_hits(db, applied)
+    db.commit()
+    
+    inserted = [transaction_id for transaction_id in transaction_ids if transaction_id]
+    return {
+        "imported": len(inserted),
+        "duplicates": len(transactions) - len(inserted),
+        "categorized": sum(1 for rule_id in applied if rule_id is not None),
+        "transaction_ids": inserted
+    }
+
+
+
+def post_journal_entry(
+    db: Session,
+    journal_entry: JournalEntry,
+    category_id: Optional[int] = None
+) -> JournalEntry:
+    """
+    Mark a journal entry as posted and keep derived balance data consistent.
+    Does not commit; the caller commits together with its own changes.
+    """
+    post_journal_entries(db, [journal_entry.id], [category_id])
+    # Already written by post_journal_entries; keep the ORM state in sync without another UPDATE
+    set_committed_value(journal_entry, "is_posted", True)
+    
+    return journal_entry
+
+
+def post_journal_entries(
+    db: Session,
+    journal_entry_ids: List[int],
+    category_ids: Optional[List[Optional[int]]] = None
+) -> List[int]:
+    """
+    Set-based posting of many journal entries: flips is_posted, drops balance
+    snapshots made stale by back-dated lines and appends the entries to the ledger
+    event log, from which the rollup cube and other read models are projected.
+    Raises ValueError if any entry is dated inside a closed period.
+    Returns the ids that were not posted before.
+    Does not commit; the caller commits together with its own changes.
+    """
+    from app.services.ledger_event_service import append_posted_events
+    
+    if not journal_entry_ids:
+        return []
+    if category_ids is None:
+        category_ids = [None] * len(journal_entry_ids)
+    
+    db.flush()
+    # Share lock: postings run concurrently with each other but not with a period close
+    db.execute(text("LOCK TABLE period_closes IN SHARE MODE"))
+    first_date = db.execute(text("""
+        SELECT MIN(entry_date) FROM journal_entries
+        WHERE id = ANY(:ids) AND NOT is_posted
+    """), {"ids": list(journal_entry_ids)}).scalar()
+    if first_date is not None:
+        ensure_period_open(db, first_date)
+    
+    posted_ids = set(db.execute(text("""
+        UPDATE journal_entries SET is_posted = true, updated_at = now()
+        WHERE id = ANY(:ids) AND NOT is_posted
+        RETURNING id
+    """), {"ids": list(journal_entry_ids)}).scalars().all())
+    
+    # Entries that were already posted must not be counted twice
+    pairs = [
+        (entry_id, category_id)
+        for entry_id, category_id in zip(journal_entry_ids, category_ids)
+        if entry_id in posted_ids
+    ]
+    if not pairs:
+        return []
+    
+    newly_posted = [entry_id for entry_id, _ in pairs]
+    invalidate_balance_snapshots(db, newly_posted)
+    append_posted_events(db, newly_posted, [category_id for _, category_id in pairs])
+    return newly_posted
+
+
+def entry_number_sql(company_id_sql: str, number_sql: str) -> str:
+    """SQL formatting a drawn number (TEXT) like generate_entry_numbers does"""
+    return f"'JE-' || {company_id_sql} || '-' || lpad({number_sql}, GREATEST(6, length({number_sql})), '0')"
+
+
+def generate_entry_numbers(db: Session, company_id: int, count: int) -> List[str]:
+    """
+    Allocate `count` journal entry numbers for a company in one round trip. Numbers come
+    from a sequence, so concurrent postings never draw the same one.
+    """
+    numbers = db.execute(text(f"""
+        SELECT nextval('{ENTRY_NUMBER_SEQUENCE}') FROM generate_series(1, :count)
+    """), {"count": count}).scalars().all()
+    return [f"JE-{company_id}-{number:06d}" for number in numbers]
+
+
+def create_posted_journal_entries(
+    db: Session,
+    entries: List[Dict],
+    created_by: int,
+    company_id: int
+) -> List[int]:
+    """
+    Bulk-create and post journal entries with multi-row inserts.
+    Each entry is a dict with entry_date, description, reference (optional) and lines
+    in the same format as create_journal_entry. Returns the new entry ids in input order.
+    Does not commit.
+    """
+    if not entries:
+        return []
+    
+    amounts = validate_entry_lines(entries)
+    entry_numbers = generate_entry_numbers(db, company_id, len(entries))
+    now = datetime.utcnow()
+    
+    entry_rows = []
+    for entry, entry_number in zip(entries, entry_numbers):
+        entry_rows.append({
+            "entry_number": entry_number,
+            "entry_date": entry["entry_date"],
+            "description": entry["description"],
+            "reference": entry.get("reference"),
+            "created_by": created_by,
+            "company_id": company_id,
+            "is_posted": False,
+            "created_at": now,
+            "updated_at": now
+        })
+    
+    entry_ids = db.execute(
+        insert(JournalEntry).returning(JournalEntry.id, sort_by_parameter_order=True),
+        entry_rows
+    ).scalars().all()
+    
+    line_rows = []
+    for entry, entry_id, entry_amounts in zip(entries, entry_ids, amounts):
+        for line_data, (debit_minor, credit_minor) in zip(entry["lines"], entry_amounts):
+            line_rows.append({
+                "journal_entry_id": entry_id,
+                "chart_account_id": line_data["chart_account_id"],
+                "debit_amount": from_minor(debit_minor) if debit_minor else None,
+                "credit_amount": from_minor(credit_minor) if credit_minor else None,
+                "description": line_data.get("description"),
+                "reference": line_data.get("reference"),
+                "entry_date": entry["entry_date"],
+                "created_at": now,
+                "updated_at": now
+            })
+    db.execute(insert(JournalEntryLine), line_rows)
+    
+    post_journal_entries(db, list(entry_ids), [entry.get("category_id") for entry in entries])
+    return list(entry_ids)
+
+
+def get_closed_through(db: Session) -> Optional[date]:
+    """End date of the latest closed period, or None if no period has been closed"""
+    return db.query(func.max(PeriodClose.period_end)).scalar()
+
+
+def ensure_period_open(db: Session, entry_date):
+    """Reject postings dated on or before the end of the latest closed period"""
+    closed_through = get_closed_through(db)
+    if isinstance(entry_date, datetime):
+        entry_date = entry_date.date()
+    if closed_through is not None and entry_date <= closed_through:
+        raise ValueError(
+            f"Period is closed through {closed_through.isoformat()}; "
+            f"cannot post entries dated {entry_date.isoformat()}"
+        )
+
+
+def get_chart_account_by_code(db: Session, company_id: int, account_code: str) -> ChartOfAccount:
+    """Look up a chart account by its code, e.g. "5700" for Interest Expense"""
+    chart_account = db.query(ChartOfAccount).filter(
+        ChartOfAccount.company_id == company_id,
+        ChartOfAccount.account_code == account_code
+    ).first()
+    if not chart_account:
+        raise ValueError(f"Chart account {account_code} not found")
+    return chart_account
+
+
+def get_balance_sign(account_type: AccountType) -> int:
+    """+1 for debit-normal accounts (Asset/Expense), -1 for credit-normal accounts"""
+    if account_type in [AccountType.ASSET, AccountType.EXPENSE]:
+        return 1
+    return -1
+
+
+def invalidate_balance_snapshots(db: Session, journal_entry_ids: List[int]):
+    """Drop snapshots that back-dated lines of the given entries have made stale"""
+    db.execute(text("""
+        DELETE FROM account_balance_snapshots s
+        USING (
+            SELECT chart_account_id, CAST(MIN(entry_date) AS DATE) AS first_date
+            FROM journal_entry_lines
+            WHERE journal_entry_id = ANY(:ids)
+            GROUP BY chart_account_id
+        ) d
+        WHERE s.chart_account_id = d.chart_account_id
+          AND s.as_of_date >= d.first_date
+    """), {"ids": journal_entry_ids})
+
+
+def get_opening_balances(db: Session, chart_accounts: List[ChartOfAccount], before: date) -> Dict[int, Decimal]:
+    """
+    Balances of several chart accounts from all posted lines dated before `before`.
+    Starts from each account's latest snapshot and aggregates only the lines after it,
+    in a single grouped query for the whole account set. Dates inside the archived range
+    are answered from the archive batch totals.
+    """
+    from app.services.archive_service import get_archive_horizon, get_archived_totals
+    
+    if not chart_accounts:
+        return {}
+    
+    # Before the archive horizon every posted line is in the archive
+    horizon = get_archive_horizon(db)
+    if horizon is not None and before <= horizon:
+        totals = get_archived_totals(db, [chart_account.id for chart_account in chart_accounts], before)
+        return {
+            chart_account.id: get_balance_sign(chart_account.account_type)
+            * (totals[chart_account.id][0] - totals[chart_account.id][1])
+            for chart_account in chart_accounts
+        }
+    
+    rows = db.execute(text("""
+        WITH snap AS (
+            SELECT DISTINCT ON (chart_account_id)
+                chart_account_id, as_of_date, total_debits, total_credits
+            FROM account_balance_snapshots
+            WHERE as_of_date < :before AND chart_account_id = ANY(:ids)
+            ORDER BY chart_account_id, as_of_date DESC
+        ),
+        delta AS (
+            SELECT l.chart_account_id,
+                   SUM(COALESCE(l.debit_amount, 0)) AS debits,
+                   SUM(COALESCE(l.credit_amount, 0)) AS credits
+            FROM journal_entry_lines l
+            JOIN journal_entries je ON je.id = l.journal_entry_id
+            LEFT JOIN snap s ON s.chart_account_id = l.chart_account_id
+            WHERE l.chart_account_id = ANY(:ids)
+              AND je.is_posted
+              AND l.entry_date < :before_ts
+              AND (s.as_of_date IS NULL OR l.entry_date >= s.as_of_date + INTERVAL '1 day')
+            GROUP BY l.chart_account_id
+        )
+        SELECT coa.id,
+               COALESCE(s.total_debits, 0) + COALESCE(d.debits, 0) AS total_debits,
+               COALESCE(s.total_credits, 0) + COALESCE(d.credits, 0) AS total_credits
+        FROM chart_of_accounts coa
+        LEFT JOIN snap s ON s.chart_account_id = coa.id
+        LEFT JOIN delta d ON d.chart_account_id = coa.id
+        WHERE coa.id = ANY(:ids)
+    """), {
+        "ids": [chart_account.id for chart_account in chart_accounts],
+        "before": before,
+        "before_ts": datetime.combine(before, time.min)
+    }).all()
+    
+    totals = {row.id: (Decimal(row.total_debits), Decimal(row.total_credits)) for row in rows}
+    balances = {}
+    for chart_account in chart_accounts:
+        total_debits, total_credits = totals.get(chart_account.id, (Decimal("0.00"), Decimal("0.00")))
+        balances[chart_account.id] = get_balance_sign(chart_account.account_type) * (total_debits - total_credits)
+    
+    return balances
+
+
+def get_opening_balance(db: Session, chart_account: ChartOfAccount, before: date) -> Decimal:
+    """Balance of a chart account from all posted lines dated before `before`"""
+    return get_opening_balances(db, [chart_account], before)[chart_account.id]
+
+
+def create_balance_snapshots(db: Session, as_of_date: date) -> int:
+    """
+    Snapshot cumulative posted totals for every chart account through as_of_date.
+    Rolls forward from each account's previous snapshot in a single statement.
+    Returns the number of snapshots written.
+    """
+    from app.services.archive_service import get_archive_horizon
+    
+    # Lines before the archive horizon are gone from journal_entry_lines; the snapshot
+    # taken at the horizon is final
+    horizon = get_archive_horizon(db)
+    if horizon is not None and as_of_date <= horizon:
+        raise ValueError(f"Ledger is archived through {horizon.isoformat()}; snapshots there are final")
+    
+    result = db.execute(text("""
+        WITH prev AS (
+            SELECT DISTINCT ON (chart_account_id)
+                chart_account_id, as_of_date, total_debits, total_credits
+            FROM account_balance_snapshots
+            WHERE as_of_date < :as_of_date
+            ORDER BY chart_account_id, as_of_date DESC
+        ),
+        delta AS (
+            SELECT l.chart_account_id,
+                   SUM(COALESCE(l.debit_amount, 0)) AS debits,
+                   SUM(COALESCE(l.credit_amount, 0)) AS credits
+            FROM journal_entry_lines l
+            JOIN journal_entries je ON je.id = l.journal_entry_id
+            LEFT JOIN prev p ON p.chart_account_id = l.chart_account_id
+            WHERE je.is_posted
+              AND l.entry_date < :period_end
+              AND (p.as_of_date IS NULL OR l.entry_date >= p.as_of_date + INTERVAL '1 day')
+            GROUP BY l.chart_account_id
+        )
+        INSERT INTO account_balance_snapshots
+            (chart_account_id, as_of_date, total_debits, total_credits, created_at)
+        SELECT coa.id, :as_of_date,
+               COALESCE(p.total_debits, 0) + COALESCE(d.debits, 0),
+               COALESCE(p.total_credits, 0) + COALESCE(d.credits, 0),
+               now()
+        FROM chart_of_accounts coa
+        LEFT JOIN prev p ON p.chart_account_id = coa.id
+        LEFT JOIN delta d ON d.chart_account_id = coa.id
+        ON CONFLICT (chart_account_id, as_of_date) DO UPDATE
+        SET total_debits = EXCLUDED.total_debits,
+            total_credits = EXCLUDED.total_credits,
+            created_at = EXCLUDED.created_at
+    """), {
+        "as_of_date": as_of_date,
+        "period_end": datetime.combine(as_of_date + timedelta(days=1), time.min)
+    })
+    db.commit()
+    return result.rowcount
+
+
+def get_posting_watermark(db: Session) -> tuple:
+    """
+    Monotonic marker that changes whenever a journal entry is posted: the settled
+    position of the event log, which postings committing out of id order cannot skip
+    """
+    from app.services.ledger_event_service import get_log_position
+    return get_log_position(db)
@@ -0,0 +1,306 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import numpy as np
+from app.models.tenant.transaction_anomaly import TransactionAnomaly, AnomalyScan, AnomalySignal, AnomalyStatus
+from app.services.ledger_event_service import read_events_after, count_events_after
+from app.services.money import LEDGER_EXPONENT, from_minor
+
+# A new transaction's amount baseline is its (account, category, type) group's
+# transactions dated in the ANOMALY_LOOKBACK_DAYS before it (not on or after its day);
+# transactions with fewer than ANOMALY_MIN_HISTORY of them are not judged
+ANOMALY_LOOKBACK_DAYS = 365
+ANOMALY_MIN_HISTORY = 10
+
+# Amount outliers: |z| at or above the threshold, or beyond IQR_MULTIPLIER interquartile
+# ranges outside the quartiles
+ZSCORE_THRESHOLD = 3.5
+IQR_MULTIPLIER = 3.0
+
+# Frequency change: transactions in the group over the last FREQUENCY_WINDOW_DAYS against
+# the rate of the rest of the lookback, as a Poisson z-score
+FREQUENCY_WINDOW_DAYS = 7
+FREQUENCY_THRESHOLD = 4.0
+FREQUENCY_MIN_COUNT = 5
+
+# Bursts: BURST_MIN_COUNT or more transactions with the same account, amount and
+# description (digits ignored) within BURST_WINDOW_DAYS
+BURST_WINDOW_DAYS = 3
+BURST_MIN_COUNT = 3
+
+# Ledger events read per scan
+ANOMALY_SCAN_BATCH = 50000
+
+# Columns of the history matrix
+ID, ACCOUNT, CATEGORY, TYPE, CENTS, DAY, DESCRIPTION = range(7)
+
+EPOCH = date(1970, 1, 1)
+
+NEW_TRANSACTIONS_QUERY = text("""
+    SELECT t.id, t.account_id, t.transaction_date
+    FROM ledger_events e
+    JOIN transactions t ON t.journal_entry_id = e.journal_entry_id
+    WHERE e.id = ANY(:event_ids) AND e.event_type = 'entry_posted'
+""")
+
+# Every column is an integer so the result converts straight into an int64 matrix
+HISTORY_QUERY = text(f"""
+    SELECT t.id,
+           t.account_id,
+           COALESCE(t.category_id, 0) AS category_id,
+           CASE t.transaction_type
+               WHEN 'DEPOSIT' THEN 0
+               WHEN 'WITHDRAWAL' THEN 1
+               ELSE 2
+           END AS type_code,
+           CAST(ROUND(t.amount * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS cents,
+           t.transaction_date - DATE '1970-01-01' AS day,
+           hashtext(lower(regexp_replace(t.description, '[0-9]+', '', 'g'))) AS description_key
+    FROM transactions t
+    JOIN journal_entries je ON je.id = t.journal_entry_id
+    WHERE je.is_posted
+      AND t.account_id = ANY(:account_ids)
+      AND t.transaction_date >= :history_start
+      AND t.transaction_date <= :history_end
+""")
+
+
+def _to_amount(cents: float) -> float:
+    return round(float(cents) / 10 ** LEDGER_EXPONENT, LEDGER_EXPONENT)
+
+
+def _key_ranks(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort order of key rows, and the dense rank of each key in that order"""
+    order = np.lexsort(keys.T[::-1])
+    ordered = keys[order]
+    ranks = np.concatenate(([0], np.cumsum(np.any(ordered[1:] != ordered[:-1], axis=1))))
+    return order, ranks
+
+
+def detect_anomalies(history: np.ndarray, is_new: np.ndarray) -> List[Tuple[int, AnomalySignal, float, Dict]]:
+    """
+    Flags for the new rows of a history matrix (columns ID..DESCRIPTION), judged against
+    the rows dated before them, as (row, signal, score, details). Statistics are computed
+    for every new row at once: baseline means and deviations from prefix sums over rows
+    sorted by (group, day), and window counts with searchsorted over sorted keys.
+    """
+    if not len(history) or not is_new.any():
+        return []
+
+    order, ranks = _key_ranks(history[:, [ACCOUNT, CATEGORY, TYPE]])
+    group = np.empty(len(history), dtype=np.int64)
+    group[order] = ranks
+    groups = int(ranks[-1]) + 1
+    amounts = np.abs(history[:, CENTS]).astype(np.float64)
+    days = history[:, DAY]
+    flags = []
+
+    # Amount outliers against each new row's own baseline. Rows sorted by (group, day),
+    # with each group's days offset into a range of its own, make every baseline one
+    # contiguous run; counts, means and deviations come from prefix sums over it
+    new_rows = np.flatnonzero(is_new)
+    new_group = group[new_rows]
+    span = int(days.max() - days.min()) + ANOMALY_LOOKBACK_DAYS + 1
+    position = group * span + (days - days.min() + ANOMALY_LOOKBACK_DAYS)
+    by_position = np.argsort(position, kind="stable")
+    ordered_position = position[by_position]
+    start = np.searchsorted(ordered_position, position[new_rows] - ANOMALY_LOOKBACK_DAYS, side="left")
+    end = np.searchsorted(ordered_position, position[new_rows], side="left")
+    counts = end - start
+
+    # Sums are taken around each group's overall mean so the variance does not cancel out
+    group_sizes = np.bincount(group, minlength=groups)
+    reference = np.bincount(group, weights=amounts, minlength=groups) / group_sizes
+    shifted = (amounts - reference[group])[by_position]
+    sums = np.concatenate(([0.0], np.cumsum(shifted)))
+    squares = np.concatenate(([0.0], np.cumsum(shifted ** 2)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shifted_means = (sums[end] - sums[start]) / counts
+        means = shifted_means + reference[new_group]
+        stds = np.sqrt(np.maximum((squares[end] - squares[start]) / counts - shifted_means ** 2, 0.0))
+
+    judged = counts >= ANOMALY_MIN_HISTORY
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(stds > 0, (amounts[new_rows] - means) / stds, 0.0)
+    outlying = judged & (np.abs(z) >= ZSCORE_THRESHOLD)
+    for i in np.flatnonzero(outlying):
+        flags.append((int(new_rows[i]), AnomalySignal.AMOUNT_ZSCORE, round(float(z[i]), 4), {
+            "mean": _to_amount(means[i]), "std": _to_amount(stds[i]), "history": int(counts[i])
+        }))
+
+    # Quartiles need the baseline's amounts in order; new rows of a group on the same day
+    # share a baseline, so each distinct one is sorted once
+    q1 = np.full(len(new_rows), np.nan)
+    q3 = np.full(len(new_rows), np.nan)
+    if judged.any():
+        windows, window_index = np.unique(
+            np.stack([start[judged], end[judged]], axis=1), axis=0, return_inverse=True
+        )
+        ordered_amounts = amounts[by_position]
+        quartiles = np.array([np.percentile(ordered_amounts[lo:hi], [25, 75]) for lo, hi in windows])
+        q1[judged] = quartiles[window_index.reshape(-1), 0]
+        q3[judged] = quartiles[window_index.reshape(-1), 1]
+
+    iqr = q3 - q1
+    lower = q1 - IQR_MULTIPLIER * iqr
+    upper = q3 + IQR_MULTIPLIER * iqr
+    with np.errstate(invalid="ignore"):
+        outside = judged & (iqr > 0) & ((amounts[new_rows] < lower) | (amounts[new_rows] > upper))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distance = np.maximum(lower - amounts[new_rows], amounts[new_rows] - upper) / iqr
+    for i in np.flatnonzero(outside):
+        flags.append((int(new_rows[i]), AnomalySignal.AMOUNT_IQR, round(float(distance[i]), 4), {
+            "q1": _to_amount(q1[i]), "q3": _to_amount(q3[i]), "history": int(counts[i])
+        }))
+
+    # Frequency change: each group is measured at its latest new transaction
+    window_end = np.full(groups, -1, dtype=np.int64)
+    np.maximum.at(window_end, new_group, days[new_rows])
+    age = window_end[group] - days
+    recent = np.bincount(group[(age >= 0) & (age < FREQUENCY_WINDOW_DAYS)], minlength=groups)
+    earlier = np.bincount(group[(age >= FREQUENCY_WINDOW_DAYS) & (age < ANOMALY_LOOKBACK_DAYS)], minlength=groups)
+    expected = earlier * FREQUENCY_WINDOW_DAYS / (ANOMALY_LOOKBACK_DAYS - FREQUENCY_WINDOW_DAYS)
+    frequency_z = (recent - expected) / np.sqrt(np.maximum(expected, 1.0))
+    changed = (earlier >= ANOMALY_MIN_HISTORY) & (recent >= FREQUENCY_MIN_COUNT) & (frequency_z >= FREQUENCY_THRESHOLD)
+    if changed.any():
+        # The flag goes on the group's last new transaction
+        last_id = np.full(groups, -1, dtype=np.int64)
+        at_end = new_rows[days[new_rows] == window_end[new_group]]
+        np.maximum.at(last_id, group[at_end], history[at_end, ID])
+        for row in at_end[changed[group[at_end]] & (history[at_end, ID] == last_id[group[at_end]])]:
+            g = group[row]
+            flags.append((int(row), AnomalySignal.FREQUENCY_CHANGE, round(float(frequency_z[g]), 4), {
+                "window_days": FREQUENCY_WINDOW_DAYS, "count": int(recent[g]), "expected": round(float(expected[g]), 2)
+            }))
+
+    # Bursts: rows sorted by (account, amount, description, day), with each key's days
+    # offset into a range of its own so a window never reaches into the next key
+    order, _ = _key_ranks(history[:, [ACCOUNT, CENTS, DESCRIPTION, DAY, ID]])
+    keys = history[order][:, [ACCOUNT, CENTS, DESCRIPTION]]
+    key_rank = np.concatenate(([0], np.cumsum(np.any(keys[1:] != keys[:-1], axis=1))))
+    span = int(days.max() - days.min()) + BURST_WINDOW_DAYS + 1
+    position = key_rank * span + (days[order] - days.min())
+    window_counts = (
+        np.searchsorted(position, position, side="right")
+        - np.searchsorted(position, position - (BURST_WINDOW_DAYS - 1), side="left")
+    )
+    burst = is_new[order] & (window_counts >= BURST_MIN_COUNT)
+    for row, count in zip(order[burst], window_counts[burst]):
+        flags.append((int(row), AnomalySignal.BURST, float(count), {
+            "window_days": BURST_WINDOW_DAYS, "count": int(count)
+        }))
+
+    return flags
+
+
+def scan_transaction_anomalies(db: Session, created_by: Optional[int] = None, batch_size: Optional[int] = None) -> Dict:
+    """
+    Flag the transactions posted since the last scan, reading the next batch of ledger
+    events after its log position. Their accounts' history is pulled once as an int64
+    matrix and judged by detect_anomalies. Runs are serialized by a table lock. Commits;
+    call until `pending` is 0 to catch up.
+    """
+    started_at = datetime.utcnow()
+    batch_size = batch_size or ANOMALY_SCAN_BATCH
+    try:
+        db.execute(text("LOCK TABLE anomaly_scans IN SHARE ROW EXCLUSIVE MODE"))
+        last = db.query(AnomalyScan).order_by(AnomalyScan.id.desc()).first()
+        xact_id, event_id = (last.through_xact_id, last.through_event_id) if last else (0, 0)
+        events = read_events_after(db, xact_id, event_id, batch_size)
+
+        scan = AnomalyScan(
+            from_event_id=event_id,
+            through_xact_id=events[-1].xact_id if events else xact_id,
+            through_event_id=events[-1].id if events else event_id,
+            event_count=len(events),
+            started_at=started_at,
+            created_by=created_by
+        )
+        db.add(scan)
+        db.flush()
+
+        new_transactions = db.execute(NEW_TRANSACTIONS_QUERY, {
+            "event_ids": [event.id for event in events]
+        }).all() if events else []
+        scan.transaction_count = len(new_transactions)
+        if new_transactions:
+            rows = db.execute(HISTORY_QUERY, {
+                "account_ids": sorted({row.account_id for row in new_transactions}),
+                "history_start": min(row.transaction_date for row in new_transactions) - timedelta(days=ANOMALY_LOOKBACK_DAYS),
+                "history_end": max(row.transaction_date for row in new_transactions)
+            }).all()
+            history = np.array(rows, dtype=np.int64).reshape(-1, 7)
+            is_new = np.isin(history[:, ID], np.array([row.id for row in new_transactions], dtype=np.int64))
+
+            values = [
+                {
+                    "transaction_id": int(history[row, ID]),
+                    "account_id": int(history[row, ACCOUNT]),
+                    "category_id": int(history[row, CATEGORY]) or None,
+                    "transaction_date": EPOCH + timedelta(days=int(history[row, DAY])),
+                    "amount": from_minor(abs(int(history[row, CENTS]))),
+                    "signal": signal,
+                    "score": score,
+                    "details": details,
+                    "status": AnomalyStatus.OPEN,
+                    "scan_id": scan.id,
+                    "created_at": started_at
+                }
+                for row, signal, score, details in detect_anomalies(history, is_new)
+            ]
+            if values:
+                inserted = db.execute(
+                    pg_insert(TransactionAnomaly).values(values).on_conflict_do_nothing(
+                        constraint="uq_transaction_anomaly_signal"
+                    ).returning(TransactionAnomaly.id)
+                ).all()
+                scan.flag_count = len(inserted)
+
+        scan.finished_at = datetime.utcnow()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "scan_id": scan.id,
+        "events": scan.event_count,
+        "transactions": scan.transaction_count,
+        "flags": scan.flag_count or 0,
+        "pending": count_events_after(db, scan.through_xact_id, scan.through_event_id)
+    }
+
+
+def list_anomalies(
+    db: Session,
+    status: Optional[AnomalyStatus] = AnomalyStatus.OPEN,
+    signal: Optional[AnomalySignal] = None,
+    account_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = 100
+) -> List[TransactionAnomaly]:
+    query = db.query(TransactionAnomaly)
+    if status:
+        query = query.filter(TransactionAnomaly.status == status)
+    if signal:
+        query = query.filter(TransactionAnomaly.signal == signal)
+    if account_id:
+        query = query.filter(TransactionAnomaly.account_id == account_id)
+    if after_id:
+        query = query.filter(TransactionAnomaly.id > after_id)
+    return query.order_by(TransactionAnomaly.id).limit(limit).all()
+
+
+def review_anomaly(db: Session, anomaly_id: int, status: AnomalyStatus, reviewed_by: int) -> TransactionAnomaly:
+    """Dismiss or confirm a flag, or reopen it"""
+    anomaly = db.query(TransactionAnomaly).filter(TransactionAnomaly.id == anomaly_id).first()
+    if not anomaly:
+        raise ValueError(f"Anomaly {anomaly_id} not found")
+    anomaly.status = status
+    anomaly.reviewed_by = None if status == AnomalyStatus.OPEN else reviewed_by
+    anomaly.reviewed_at = None if status == AnomalyStatus.OPEN else datetime.utcnow()
+    db.commit()
+    db.refresh(anomaly)
+    return anomaly
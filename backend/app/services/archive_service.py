@@ -0,0 +1,251 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text, func, insert
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+import json
+import zlib
+from app.models.tenant.ledger_archive import LedgerArchiveBatch, LedgerArchiveRun
+from app.services.money import LEDGER_EXPONENT, from_minor
+from app.services.partition_service import is_partitioned, list_partitions, table_size
+
+# Columns kept for archived lines, stored column-wise so repeated values compress well
+ARCHIVE_COLUMNS = ("id", "journal_entry_id", "entry_date", "debit_cents", "credit_cents", "description", "reference")
+
+MONTH_LINES_QUERY = text(f"""
+    SELECT l.id, l.journal_entry_id, l.chart_account_id, l.entry_date,
+           CAST(ROUND(l.debit_amount * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS debit_cents,
+           CAST(ROUND(l.credit_amount * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS credit_cents,
+           l.description, l.reference,
+           pg_column_size(l.*) AS row_bytes
+    FROM journal_entry_lines l
+    JOIN journal_entries je ON je.id = l.journal_entry_id
+    WHERE je.is_posted
+      AND l.entry_date >= :month_start
+      AND l.entry_date < :month_end
+    ORDER BY l.chart_account_id, l.entry_date, l.id
+""")
+
+DELETE_MONTH_QUERY = text("""
+    DELETE FROM journal_entry_lines l
+    USING journal_entries je
+    WHERE je.id = l.journal_entry_id
+      AND je.is_posted
+      AND l.entry_date >= :month_start
+      AND l.entry_date < :month_end
+""")
+
+
+def _next_month(value: date) -> date:
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+def _month_end_on_or_before(value: date) -> date:
+    month_end = _next_month(value.replace(day=1)) - timedelta(days=1)
+    return value if value == month_end else value.replace(day=1) - timedelta(days=1)
+
+
+def encode_batch(rows: List) -> bytes:
+    """zlib-compressed columnar JSON of archived line rows"""
+    columns = {column: [] for column in ARCHIVE_COLUMNS}
+    for row in rows:
+        for column in ARCHIVE_COLUMNS:
+            value = getattr(row, column)
+            columns[column].append(value.isoformat() if column == "entry_date" else value)
+    return zlib.compress(json.dumps(columns, separators=(",", ":")).encode(), 9)
+
+
+def decode_batch(payload: bytes) -> List[Dict]:
+    """Archived lines of a batch in (entry_date, id) order"""
+    columns = json.loads(zlib.decompress(payload))
+    lines = []
+    for values in zip(*(columns[column] for column in ARCHIVE_COLUMNS)):
+        line = dict(zip(ARCHIVE_COLUMNS, values))
+        debit_cents = line.pop("debit_cents")
+        credit_cents = line.pop("credit_cents")
+        line["entry_date"] = datetime.fromisoformat(line["entry_date"])
+        line["debit_amount"] = from_minor(debit_cents) if debit_cents is not None else None
+        line["credit_amount"] = from_minor(credit_cents) if credit_cents is not None else None
+        lines.append(line)
+    return lines
+
+
+def get_archive_horizon(db: Session) -> Optional[date]:
+    """Posted lines dated on or before this date have been moved to the archive"""
+    return db.query(func.max(LedgerArchiveRun.archived_through)).scalar()
+
+
+def iter_archived_lines(
+    db: Session,
+    chart_account_id: int,
+    date_from: Optional[date],
+    date_to: date
+) -> Iterator[Dict]:
+    """
+    Archived lines of a chart account dated within [date_from, date_to] (from the first
+    archived line when date_from is omitted), oldest first. Only the monthly batches
+    overlapping the range are decompressed, one at a time as the lines are consumed.
+    """
+    batches = db.query(LedgerArchiveBatch.payload).filter(
+        LedgerArchiveBatch.chart_account_id == chart_account_id,
+        LedgerArchiveBatch.month_start <= date_to
+    )
+    if date_from is not None:
+        batches = batches.filter(LedgerArchiveBatch.month_start >= date_from.replace(day=1))
+
+    period_start = datetime.combine(date_from, time.min) if date_from is not None else None
+    period_end = datetime.combine(date_to + timedelta(days=1), time.min)
+    for batch in batches.order_by(LedgerArchiveBatch.month_start).yield_per(1):
+        for line in decode_batch(batch.payload):
+            if (period_start is None or line["entry_date"] >= period_start) and line["entry_date"] < period_end:
+                yield line
+
+
+def get_archived_totals(
+    db: Session,
+    chart_account_ids: List[int],
+    before: Optional[date] = None
+) -> Dict[int, Tuple[Decimal, Decimal]]:
+    """
+    Archived (debits, credits) per chart account for lines dated before `before`
+    (all archived lines when omitted). Whole months come from the stored batch totals;
+    only the batch of a partial month is decompressed.
+    """
+    totals = {chart_account_id: (Decimal("0.00"), Decimal("0.00")) for chart_account_id in chart_account_ids}
+    if not chart_account_ids:
+        return totals
+
+    whole_months = db.query(
+        LedgerArchiveBatch.chart_account_id,
+        func.sum(LedgerArchiveBatch.total_debits),
+        func.sum(LedgerArchiveBatch.total_credits)
+    ).filter(LedgerArchiveBatch.chart_account_id.in_(chart_account_ids))
+    if before is not None:
+        whole_months = whole_months.filter(LedgerArchiveBatch.month_start < before.replace(day=1))
+    for chart_account_id, debits, credits in whole_months.group_by(LedgerArchiveBatch.chart_account_id).all():
+        totals[chart_account_id] = (Decimal(debits), Decimal(credits))
+
+    if before is not None and before.day != 1:
+        partial = db.query(LedgerArchiveBatch.chart_account_id, LedgerArchiveBatch.payload).filter(
+            LedgerArchiveBatch.chart_account_id.in_(chart_account_ids),
+            LedgerArchiveBatch.month_start == before.replace(day=1)
+        ).all()
+        cutoff = datetime.combine(before, time.min)
+        for chart_account_id, payload in partial:
+            debits, credits = totals[chart_account_id]
+            for line in decode_batch(payload):
+                if line["entry_date"] < cutoff:
+                    debits += line["debit_amount"] or 0
+                    credits += line["credit_amount"] or 0
+            totals[chart_account_id] = (debits, credits)
+
+    return totals
+
+
+def archive_closed_periods(db: Session, created_by: int, through: Optional[date] = None) -> Dict:
+    """
+    Move posted lines of closed months out of journal_entry_lines into compressed
+    per-account monthly batches. A balance snapshot at the archive horizon keeps every
+    later balance computable from hot data; reads before the horizon go to the archive.
+    Returns what was moved and how much the hot table shrank.
+    """
+    from app.services.accounting_service import create_balance_snapshots, get_closed_through
+
+    closed_through = get_closed_through(db)
+    if closed_through is None:
+        raise ValueError("No closed period to archive")
+    archive_through = _month_end_on_or_before(min(through, closed_through) if through else closed_through)
+    horizon = get_archive_horizon(db)
+    if horizon is not None and archive_through <= horizon:
+        raise ValueError(f"Ledger is already archived through {horizon.isoformat()}")
+
+    # Balances after the horizon start from this snapshot, so they never need archived lines
+    create_balance_snapshots(db, archive_through)
+
+    db.execute(text("LOCK TABLE ledger_archive_runs IN SHARE ROW EXCLUSIVE MODE"))
+    conn = db.connection()
+    hot_bytes_before = table_size(conn, "journal_entry_lines")
+    archive_end = datetime.combine(archive_through + timedelta(days=1), time.min)
+
+    run = LedgerArchiveRun(
+        archived_from=horizon + timedelta(days=1) if horizon else None,
+        archived_through=archive_through,
+        line_count=0,
+        batch_count=0,
+        archived_bytes=0,
+        archive_bytes=0,
+        created_by=created_by
+    )
+    db.add(run)
+    db.flush()
+
+    first_date = db.execute(text("""
+        SELECT CAST(MIN(l.entry_date) AS DATE)
+        FROM journal_entry_lines l
+        JOIN journal_entries je ON je.id = l.journal_entry_id
+        WHERE je.is_posted AND l.entry_date < :archive_end
+    """), {"archive_end": archive_end}).scalar()
+
+    month = first_date.replace(day=1) if first_date else _next_month(archive_through)
+    while month <= archive_through:
+        bounds = {
+            "month_start": datetime.combine(month, time.min),
+            "month_end": datetime.combine(_next_month(month), time.min)
+        }
+        rows = db.execute(MONTH_LINES_QUERY, bounds).all()
+        if rows:
+            batch_rows = []
+            for chart_account_id, account_rows in groupby(rows, key=lambda row: row.chart_account_id):
+                account_rows = list(account_rows)
+                payload = encode_batch(account_rows)
+                batch_rows.append({
+                    "chart_account_id": chart_account_id,
+                    "month_start": month,
+                    "line_count": len(account_rows),
+                    "total_debits": from_minor(sum(row.debit_cents or 0 for row in account_rows)),
+                    "total_credits": from_minor(sum(row.credit_cents or 0 for row in account_rows)),
+                    "payload": payload,
+                    "run_id": run.id,
+                    "created_at": datetime.utcnow()
+                })
+                run.archive_bytes += len(payload)
+            db.execute(insert(LedgerArchiveBatch), batch_rows)
+            db.execute(DELETE_MONTH_QUERY, bounds)
+
+            run.line_count += len(rows)
+            run.batch_count += len(batch_rows)
+            run.archived_bytes += sum(row.row_bytes for row in rows)
+        month = _next_month(month)
+
+    db.commit()
+
+    # Fully archived partitions are emptied outright, which returns their space at once;
+    # otherwise VACUUM makes the freed pages reusable
+    with db.get_bind().connect() as maintenance:
+        maintenance = maintenance.execution_options(isolation_level="AUTOCOMMIT")
+        if is_partitioned(maintenance, "journal_entry_lines"):
+            for name, _, upper in list_partitions(maintenance, "journal_entry_lines"):
+                if upper <= archive_through + timedelta(days=1):
+                    if not maintenance.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar():
+                        maintenance.execute(text(f"TRUNCATE {name}"))
+        maintenance.execute(text("VACUUM ANALYZE journal_entry_lines"))
+        hot_bytes_after = table_size(maintenance, "journal_entry_lines")
+
+    run.hot_bytes_before = hot_bytes_before
+    run.hot_bytes_after = hot_bytes_after
+    db.commit()
+    db.refresh(run)
+
+    return {
+        "archived_through": run.archived_through,
+        "line_count": run.line_count,
+        "batch_count": run.batch_count,
+        "archived_bytes": run.archived_bytes,
+        "archive_bytes": run.archive_bytes,
+        "hot_bytes_before": run.hot_bytes_before,
+        "hot_bytes_after": run.hot_bytes_after,
+        "reclaimed_bytes": max(run.hot_bytes_before - run.hot_bytes_after, 0)
+    }
@@ -0,0 +1,154 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import List, Dict
+from datetime import date, datetime, time, timedelta
+import numpy as np
+from app.models.tenant.chart_of_accounts import ChartOfAccount
+from app.services.accounting_service import get_opening_balances, get_balance_sign
+from app.services.archive_service import get_archive_horizon, iter_archived_lines
+from app.services.money import to_minor, from_minor
+
+SERIES_INTERVALS = ("day", "week", "month")
+
+# Grids with more cells than this are accumulated with NumPy
+NUMPY_GRID_THRESHOLD = 2000
+
+MAX_SERIES_POINTS = 10000
+
+BUCKET_QUERY = text("""
+    SELECT l.chart_account_id,
+           CAST(date_trunc(:interval, l.entry_date) AS DATE) AS bucket,
+           SUM(COALESCE(l.debit_amount, 0) - COALESCE(l.credit_amount, 0)) AS net
+    FROM journal_entry_lines l
+    JOIN journal_entries je ON je.id = l.journal_entry_id
+    WHERE l.chart_account_id = ANY(:ids)
+      AND je.is_posted
+      AND l.entry_date >= :period_start
+      AND l.entry_date < :period_end
+    GROUP BY l.chart_account_id, bucket
+""")
+
+
+def _next_bucket(start: date, interval: str) -> date:
+    if interval == "day":
+        return start + timedelta(days=1)
+    if interval == "week":
+        return start + timedelta(days=7)
+    if start.month == 12:
+        return date(start.year + 1, 1, 1)
+    return date(start.year, start.month + 1, 1)
+
+
+def _bucket_start(value: date, interval: str) -> date:
+    """Python equivalent of date_trunc for the series intervals"""
+    if interval == "week":
+        return value - timedelta(days=value.weekday())
+    if interval == "month":
+        return value.replace(day=1)
+    return value
+
+
+def build_date_grid(date_from: date, date_to: date, interval: str) -> List[date]:
+    """Bucket start dates covering [date_from, date_to], aligned like date_trunc"""
+    if interval not in SERIES_INTERVALS:
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    start = _bucket_start(date_from, interval)
+    grid = []
+    while start <= date_to:
+        grid.append(start)
+        if len(grid) > MAX_SERIES_POINTS:
+            raise ValueError(f"Date grid exceeds {MAX_SERIES_POINTS} points")
+        start = _next_bucket(start, interval)
+
+    return grid
+
+
+def _cumulative(rows: List[List[int]]) -> List[List[int]]:
+    """Row-wise running sums of integer cent deltas"""
+    cells = len(rows) * (len(rows[0]) if rows else 0)
+    if cells > NUMPY_GRID_THRESHOLD:
+        return np.cumsum(np.array(rows, dtype=np.int64), axis=1).tolist()
+
+    result = []
+    for row in rows:
+        total = 0
+        running = []
+        for value in row:
+            total += value
+            running.append(total)
+        result.append(running)
+    return result
+
+
+def get_balance_series(
+    db: Session,
+    chart_account_ids: List[int],
+    date_from: date,
+    date_to: date,
+    interval: str = "month"
+) -> Dict:
+    """
+    Closing balance of each account at the end of every bucket in the grid.
+    One snapshot-backed opening balance query and one grouped-by-bucket aggregate,
+    followed by a cumulative sum over the account x bucket matrix.
+    """
+    grid = build_date_grid(date_from, date_to, interval)
+
+    chart_accounts = db.query(ChartOfAccount).filter(
+        ChartOfAccount.id.in_(chart_account_ids)
+    ).order_by(ChartOfAccount.account_code).all()
+    if len(chart_accounts) != len(set(chart_account_ids)):
+        found = {chart_account.id for chart_account in chart_accounts}
+        missing = sorted(set(chart_account_ids) - found)
+        raise ValueError(f"Chart accounts not found: {missing}")
+
+    period_start = grid[0]
+    # The last bucket stops at date_to, where its point is dated
+    period_end = min(_next_bucket(grid[-1], interval), date_to + timedelta(days=1))
+    opening = get_opening_balances(db, chart_accounts, period_start)
+
+    rows = db.execute(BUCKET_QUERY, {
+        "interval": interval,
+        "ids": [chart_account.id for chart_account in chart_accounts],
+        "period_start": datetime.combine(period_start, time.min),
+        "period_end": datetime.combine(period_end, time.min),
+    }).all()
+
+    # Work in integer minor units so the cumulative step is exact
+    row_index = {chart_account.id: i for i, chart_account in enumerate(chart_accounts)}
+    column_index = {bucket: j for j, bucket in enumerate(grid)}
+    deltas = [[0] * len(grid) for _ in chart_accounts]
+    for row in rows:
+        deltas[row_index[row.chart_account_id]][column_index[row.bucket]] = to_minor(row.net)
+
+    # Archived months are not in journal_entry_lines; bucket their lines from the archive
+    horizon = get_archive_horizon(db)
+    if horizon is not None and period_start <= horizon:
+        archive_to = min(period_end - timedelta(days=1), horizon)
+        for chart_account in chart_accounts:
+            for line in iter_archived_lines(db, chart_account.id, period_start, archive_to):
+                bucket = _bucket_start(line["entry_date"].date(), interval)
+                net = (line["debit_amount"] or 0) - (line["credit_amount"] or 0)
+                deltas[row_index[chart_account.id]][column_index[bucket]] += to_minor(net)
+
+    running = _cumulative(deltas)
+
+    series = []
+    for i, chart_account in enumerate(chart_accounts):
+        sign = get_balance_sign(chart_account.account_type)
+        balances = [
+            opening[chart_account.id] + sign * from_minor(cents)
+            for cents in running[i]
+        ]
+        series.append({
+            "chart_account_id": chart_account.id,
+            "account_code": chart_account.account_code,
+            "account_name": chart_account.account_name,
+            "balances": balances
+        })
+
+    # Each point is the last day of its bucket, clipped to the requested range
+    dates = [min(_next_bucket(bucket, interval) - timedelta(days=1), date_to) for bucket in grid]
+
+    return {"interval": interval, "dates": dates, "series": series}
@@ -0,0 +1,227 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict, Hashable, List, Optional
+from datetime import date, datetime, time, timedelta
+import numpy as np
+from app.core.cache import TenantCache
+from app.models.tenant.budget import Budget
+from app.models.tenant.chart_of_accounts import ChartOfAccount, AccountType
+from app.services.accounting_service import get_balance_sign
+from app.services.ledger_event_service import get_log_position
+from app.services.money import LEDGER_EXPONENT, to_minor, from_minor
+
+report_cache = TenantCache()
+
+# Posted activity per chart account and month in minor units, in one grouped pass over
+# the lines. Archived months come from their batch totals.
+ACTUALS_QUERY = text(f"""
+    SELECT b.chart_account_id, b.month_start AS month,
+           CAST(ROUND(b.total_debits * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS debit,
+           CAST(ROUND(b.total_credits * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS credit
+    FROM ledger_archive_batches b
+    WHERE b.month_start >= :period_start AND b.month_start < :period_end
+    UNION ALL
+    SELECT l.chart_account_id,
+           CAST(date_trunc('month', l.entry_date) AS DATE) AS month,
+           SUM(CAST(ROUND(COALESCE(l.debit_amount, 0) * {10 ** LEDGER_EXPONENT}) AS BIGINT)),
+           SUM(CAST(ROUND(COALESCE(l.credit_amount, 0) * {10 ** LEDGER_EXPONENT}) AS BIGINT))
+    FROM journal_entry_lines l
+    JOIN journal_entries je ON je.id = l.journal_entry_id
+    WHERE je.is_posted
+      AND l.entry_date >= :period_start AND l.entry_date < :period_end
+    GROUP BY l.chart_account_id, CAST(date_trunc('month', l.entry_date) AS DATE)
+""")
+
+
+def _month_index(day: date) -> int:
+    return day.year * 12 + day.month - 1
+
+
+def _month_start(index: int) -> date:
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upsert_budgets(db: Session, budgets: List[Dict], created_by: Optional[int] = None) -> int:
+    """
+    Insert or replace budgets (chart_account_id, period_start, amount, notes); any date
+    in a month budgets that month. Returns the count.
+    """
+    if not budgets:
+        return 0
+
+    chart_account_ids = {budget["chart_account_id"] for budget in budgets}
+    found = {row.id for row in db.query(ChartOfAccount.id).filter(ChartOfAccount.id.in_(chart_account_ids)).all()}
+    missing = chart_account_ids - found
+    if missing:
+        raise ValueError(f"Chart account {min(missing)} not found")
+
+    rows = {}
+    now = datetime.utcnow()
+    for budget in budgets:
+        period_start = budget["period_start"].replace(day=1)
+        # The last amount for an account and month in the batch wins
+        rows[(budget["chart_account_id"], period_start)] = {
+            "chart_account_id": budget["chart_account_id"],
+            "period_start": period_start,
+            "amount": from_minor(to_minor(budget["amount"])),
+            "notes": budget.get("notes"),
+            "created_by": created_by,
+            "created_at": now,
+            "updated_at": now
+        }
+
+    statement = pg_insert(Budget).values(list(rows.values()))
+    db.execute(statement.on_conflict_do_update(
+        constraint="uq_budget_account_period",
+        set_={
+            "amount": statement.excluded.amount,
+            "notes": statement.excluded.notes,
+            "updated_at": statement.excluded.updated_at
+        }
+    ))
+    db.commit()
+    return len(rows)
+
+
+def list_budgets(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    chart_account_ids: Optional[List[int]] = None
+) -> List[Budget]:
+    query = db.query(Budget)
+    if date_from:
+        query = query.filter(Budget.period_start >= date_from.replace(day=1))
+    if date_to:
+        query = query.filter(Budget.period_start <= date_to)
+    if chart_account_ids:
+        query = query.filter(Budget.chart_account_id.in_(chart_account_ids))
+    return query.order_by(Budget.period_start, Budget.chart_account_id).all()
+
+
+def compute_variances(budget: np.ndarray, actual: np.ndarray, expense_rows: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Variance (actual - budget), variance percentage of budget (NaN where nothing is
+    budgeted) and favorability over whole (accounts x periods) minor-unit matrices.
+    Spending under budget is favorable on expense accounts, over budget on the rest.
+    """
+    variance = actual - budget
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance_pct = np.where(budget != 0, np.round(variance * 100.0 / np.abs(budget), 2), np.nan)
+    favorable = np.where(expense_rows[:, None], variance <= 0, variance >= 0)
+    return {"variance": variance, "variance_pct": variance_pct, "favorable": favorable}
+
+
+def get_budget_vs_actual(
+    db: Session,
+    tenant_key: Hashable,
+    date_from: date,
+    date_to: date,
+    chart_account_ids: Optional[List[int]] = None
+) -> Dict:
+    """
+    Budget against posted actuals per chart account and month for the months spanning
+    date_from..date_to. Rows are the budgeted accounts plus revenue and expense accounts
+    with activity; the last column of every matrix is the range total. Actuals are in the
+    account's normal balance direction, like budgets. Cached per tenant until a budget
+    changes or an entry is posted into the range.
+    """
+    if date_to < date_from:
+        raise ValueError("date_to is before date_from")
+
+    first_month = _month_index(date_from)
+    last_month = _month_index(date_to)
+    period_start = _month_start(first_month)
+    period_end = _month_start(last_month + 1)
+    params = {
+        "period_start": datetime.combine(period_start, time.min),
+        "period_end": datetime.combine(period_end, time.min)
+    }
+
+    # Every posting into the range appends a ledger event; the settled log position
+    # still moves for one that commits after a later-numbered event
+    watermark = (
+        get_log_position(db, params["period_start"], params["period_end"]),
+        *db.query(func.count(Budget.id), func.max(Budget.updated_at)).one()
+    )
+    cache_key = (first_month, last_month, tuple(sorted(chart_account_ids)) if chart_account_ids else None)
+    cached = report_cache.get(tenant_key, cache_key, watermark)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    budget_query = db.query(Budget.chart_account_id, Budget.period_start, Budget.amount).filter(
+        Budget.period_start >= period_start,
+        Budget.period_start < period_end
+    )
+    if chart_account_ids:
+        budget_query = budget_query.filter(Budget.chart_account_id.in_(chart_account_ids))
+    budget_rows = budget_query.all()
+    actual_rows = db.execute(ACTUALS_QUERY, params).all()
+
+    chart_accounts = {chart_account.id: chart_account for chart_account in db.query(ChartOfAccount).all()}
+    row_ids = {row.chart_account_id for row in budget_rows} | {
+        row.chart_account_id for row in actual_rows
+        if chart_accounts[row.chart_account_id].account_type in (AccountType.REVENUE, AccountType.EXPENSE)
+    }
+    if chart_account_ids:
+        row_ids &= set(chart_account_ids)
+    rows = sorted((chart_accounts[i] for i in row_ids), key=lambda chart_account: chart_account.account_code)
+    row_index = {chart_account.id: i for i, chart_account in enumerate(rows)}
+    periods = last_month - first_month + 1
+
+    # (accounts x periods + total) matrices in minor units
+    budget = np.zeros((len(rows), periods + 1), dtype=np.int64)
+    actual = np.zeros((len(rows), periods + 1), dtype=np.int64)
+    if budget_rows:
+        np.add.at(budget, (
+            np.array([row_index[row.chart_account_id] for row in budget_rows], dtype=np.int64),
+            np.array([_month_index(row.period_start) - first_month for row in budget_rows], dtype=np.int64)
+        ), np.array([to_minor(row.amount) for row in budget_rows], dtype=np.int64))
+    actual_rows = [row for row in actual_rows if row.chart_account_id in row_index]
+    if actual_rows:
+        signs = np.array([get_balance_sign(chart_account.account_type) for chart_account in rows], dtype=np.int64)
+        account_index = np.array([row_index[row.chart_account_id] for row in actual_rows], dtype=np.int64)
+        np.add.at(actual, (
+            account_index,
+            np.array([_month_index(row.month) - first_month for row in actual_rows], dtype=np.int64)
+        ), signs[account_index] * np.array([row.debit - row.credit for row in actual_rows], dtype=np.int64))
+    budget[:, -1] = budget[:, :-1].sum(axis=1)
+    actual[:, -1] = actual[:, :-1].sum(axis=1)
+
+    expense_rows = np.array([chart_account.account_type == AccountType.EXPENSE for chart_account in rows], dtype=bool)
+    variances = compute_variances(budget, actual, expense_rows)
+
+    def cells(i: int) -> List[Dict]:
+        return [
+            {
+                "budget": from_minor(budget[i, j]),
+                "actual": from_minor(actual[i, j]),
+                "variance": from_minor(variances["variance"][i, j]),
+                "variance_pct": None if np.isnan(variances["variance_pct"][i, j]) else float(variances["variance_pct"][i, j]),
+                "favorable": bool(variances["favorable"][i, j])
+            }
+            for j in range(periods + 1)
+        ]
+
+    result = {
+        "date_from": period_start,
+        "date_to": period_end - timedelta(days=1),
+        "periods": [_month_start(first_month + j) for j in range(periods)],
+        "accounts": [],
+        "generated_at": datetime.utcnow(),
+        "cached": False
+    }
+    for i, chart_account in enumerate(rows):
+        row_cells = cells(i)
+        result["accounts"].append({
+            "chart_account_id": chart_account.id,
+            "account_code": chart_account.account_code,
+            "account_name": chart_account.account_name,
+            "account_type": chart_account.account_type.value,
+            "periods": row_cells[:-1],
+            "total": row_cells[-1]
+        })
+
+    report_cache.set(tenant_key, cache_key, watermark, result)
+    return result
@@ -0,0 +1,218 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from decimal import Decimal
+from typing import Dict, List, Optional
+from datetime import date, datetime
+import numpy as np
+from app.core.cache import TenantCache
+from app.models.tenant.account import Account
+from app.services.accounting_service import get_posting_watermark
+from app.services.money import LEDGER_EXPONENT, to_minor, from_minor
+
+# A (account, description, amount) group is recurring when it appears in at least
+# RECURRING_MIN_MONTHS of the last RECURRING_LOOKBACK_MONTHS and in the latest two months
+RECURRING_LOOKBACK_MONTHS = 6
+RECURRING_MIN_MONTHS = 3
+
+# Seasonal indexes need at least two full years of history
+SEASONALITY_MIN_MONTHS = 24
+
+forecast_cache = TenantCache()
+
+# Every column is an integer so the result converts straight into an int64 matrix
+HISTORY_QUERY = text(f"""
+    SELECT t.account_id,
+           CAST(EXTRACT(YEAR FROM t.transaction_date) AS INTEGER) * 12
+               + CAST(EXTRACT(MONTH FROM t.transaction_date) AS INTEGER) - 1 AS month_number,
+           CASE t.transaction_type
+               WHEN 'DEPOSIT' THEN 1
+               WHEN 'WITHDRAWAL' THEN -1
+               ELSE 0
+           END * CAST(ROUND(t.amount * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS cents,
+           hashtext(lower(regexp_replace(t.description, '[0-9]+', '', 'g'))) AS description_key
+    FROM transactions t
+    JOIN journal_entries je ON je.id = t.journal_entry_id
+    WHERE je.is_posted
+      AND t.transaction_date >= :history_start
+      AND t.transaction_date < :history_end
+""")
+
+CURRENT_BALANCE_QUERY = text("""
+    SELECT t.account_id,
+           SUM(CASE t.transaction_type
+                   WHEN 'DEPOSIT' THEN t.amount
+                   WHEN 'WITHDRAWAL' THEN -t.amount
+                   ELSE 0
+               END) AS balance
+    FROM transactions t
+    JOIN journal_entries je ON je.id = t.journal_entry_id
+    WHERE je.is_posted
+    GROUP BY t.account_id
+""")
+
+
+def _month_number(value: date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+def _month_start(month_number: int) -> date:
+    return date(month_number // 12, month_number % 12 + 1, 1)
+
+
+def load_transaction_history(db: Session, history_start: date, history_end: date) -> np.ndarray:
+    """Posted transaction history as an (n, 4) int64 array: account_id, month_number, cents, description_key"""
+    rows = db.execute(HISTORY_QUERY, {
+        "history_start": history_start,
+        "history_end": history_end
+    }).all()
+    return np.array(rows, dtype=np.int64).reshape(-1, 4)
+
+
+def _recurring_mask(history: np.ndarray, last_month: int) -> np.ndarray:
+    """Boolean mask of history rows that belong to a recurring (account, description, amount) group"""
+    if len(history) == 0:
+        return np.zeros(0, dtype=bool)
+
+    keys = history[:, [0, 3, 2]]
+    _, group = np.unique(keys, axis=0, return_inverse=True)
+    group = group.reshape(-1)
+    group_count = group.max() + 1
+
+    recent = history[:, 1] > last_month - RECURRING_LOOKBACK_MONTHS
+    if not recent.any():
+        return np.zeros(len(history), dtype=bool)
+    # Distinct (group, month) pairs within the lookback window
+    pairs = np.unique(np.stack([group[recent], history[recent, 1]], axis=1), axis=0)
+    months_seen = np.bincount(pairs[:, 0], minlength=group_count)
+    latest = np.zeros(group_count, dtype=np.int64)
+    np.maximum.at(latest, pairs[:, 0], pairs[:, 1])
+
+    is_recurring = (months_seen >= RECURRING_MIN_MONTHS) & (latest >= last_month - 1)
+    return is_recurring[group]
+
+
+def project_cashflows(
+    history: np.ndarray,
+    account_ids: List[int],
+    first_month: int,
+    last_month: int,
+    periods: int
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized projection for all accounts at once.
+    Non-recurring flows are modelled as linear trend plus monthly seasonality;
+    recurring items are carried forward at their latest monthly amount.
+    Returns per-account arrays in cents.
+    """
+    account_count = len(account_ids)
+    months = last_month - first_month + 1
+    sorted_ids = np.array(account_ids, dtype=np.int64)  # account_ids are sorted ascending
+
+    history = history[np.isin(history[:, 0], sorted_ids)]
+    account_rows = np.searchsorted(sorted_ids, history[:, 0])
+    month_cols = history[:, 1] - first_month
+
+    recurring = _recurring_mask(history, last_month)
+
+    # Recurring amount per account: one occurrence of each recurring group in the latest month it appeared
+    recurring_monthly = np.zeros(account_count, dtype=np.float64)
+    latest_month = recurring & (history[:, 1] >= last_month - 1)
+    if latest_month.any():
+        latest_rows = history[latest_month]
+        _, first_index = np.unique(latest_rows[:, [0, 3, 2]], axis=0, return_index=True)
+        np.add.at(recurring_monthly, account_rows[latest_month][first_index], latest_rows[first_index, 2])
+
+    # Account x month matrix of non-recurring net flow
+    flows = np.zeros((account_count, months), dtype=np.float64)
+    np.add.at(flows, (account_rows[~recurring], month_cols[~recurring]), history[~recurring, 2])
+
+    # Least-squares trend per account in closed form
+    t = np.arange(months, dtype=np.float64)
+    t_centered = t - t.mean()
+    denominator = (t_centered ** 2).sum()
+    mean_flow = flows.mean(axis=1)
+    slope = (flows - mean_flow[:, None]) @ t_centered / denominator if denominator else np.zeros(account_count)
+    intercept = mean_flow - slope * t.mean()
+
+    # Seasonal index per calendar month from detrended residuals
+    seasonal = np.zeros((account_count, 12), dtype=np.float64)
+    if months >= SEASONALITY_MIN_MONTHS:
+        residual = flows - (intercept[:, None] + slope[:, None] * t)
+        calendar_month = (first_month + np.arange(months)) % 12
+        one_hot = np.zeros((months, 12), dtype=np.float64)
+        one_hot[np.arange(months), calendar_month] = 1.0
+        seasonal = (residual @ one_hot) / np.maximum(one_hot.sum(axis=0), 1.0)
+
+    future_t = np.arange(months, months + periods, dtype=np.float64)
+    future_calendar = (last_month + 1 + np.arange(periods)) % 12
+    projected = (
+        intercept[:, None]
+        + slope[:, None] * future_t
+        + seasonal[:, future_calendar]
+        + recurring_monthly[:, None]
+    )
+
+    return {
+        "projected_flows": np.rint(projected).astype(np.int64),
+        "slope": slope,
+        "recurring_monthly": recurring_monthly
+    }
+
+
+def get_cashflow_forecast(
+    db: Session,
+    tenant_key,
+    periods: int = 12,
+    history_months: int = 36,
+    account_ids: Optional[List[int]] = None
+) -> Dict:
+    """
+    Projected monthly flows and balances per account, cached until the next posting or
+    the start of a new month
+    """
+    # Forecast from complete months only
+    current_month = _month_number(date.today())
+    watermark = get_posting_watermark(db)
+    cache_key = (current_month, periods, history_months, tuple(sorted(account_ids)) if account_ids else None)
+    cached = forecast_cache.get(tenant_key, cache_key, watermark)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    query = db.query(Account).filter(Account.is_active == True)
+    if account_ids:
+        query = query.filter(Account.id.in_(account_ids))
+    accounts = query.order_by(Account.id).all()
+
+    last_month = current_month - 1
+    first_month = current_month - history_months
+
+    history = load_transaction_history(db, _month_start(first_month), _month_start(current_month))
+    balances = {row.account_id: Decimal(row.balance) for row in db.execute(CURRENT_BALANCE_QUERY).all()}
+
+    ids = [account.id for account in accounts]
+    projection = project_cashflows(history, ids, first_month, last_month, periods) if ids else None
+
+    result_accounts = []
+    for i, account in enumerate(accounts):
+        flows_cents = projection["projected_flows"][i]
+        current_balance = balances.get(account.id, Decimal("0.00"))
+        balance_cents = to_minor(current_balance) + np.cumsum(flows_cents)
+        result_accounts.append({
+            "account_id": account.id,
+            "account_name": account.name,
+            "currency": account.currency,
+            "current_balance": current_balance,
+            "trend_per_month": from_minor(round(projection["slope"][i])),
+            "recurring_monthly": from_minor(projection["recurring_monthly"][i]),
+            "projected_flows": [from_minor(cents) for cents in flows_cents],
+            "projected_balances": [from_minor(cents) for cents in balance_cents],
+        })
+
+    result = {
+        "generated_at": datetime.utcnow(),
+        "periods": [_month_start(current_month + h) for h in range(periods)],
+        "accounts": result_accounts,
+        "cached": False
+    }
+    forecast_cache.set(tenant_key, cache_key, watermark, result)
+    return result
@@ -0,0 +1,254 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, text
+from typing import Dict, Hashable, List, Optional, Tuple
+from datetime import datetime
+import re
+import numpy as np
+from app.core.cache import TenantCache
+from app.models.tenant.categorization_rule import CategorizationRule
+from app.models.tenant.category import Category
+from app.models.tenant.account import Account
+from app.models.tenant.transaction import TransactionType
+from app.services.dedup_service import normalize_description
+from app.services.money import to_minor
+
+# One compiled rule set per tenant, recompiled when rules change
+rule_cache = TenantCache(max_entries_per_tenant=1)
+
+TRANSACTION_TYPE_CODES = {transaction_type: code for code, transaction_type in enumerate(TransactionType)}
+
+NO_MIN = np.iinfo(np.int64).min
+NO_MAX = np.iinfo(np.int64).max
+
+
+# Descriptions and keywords are compared as sequences of word and punctuation tokens
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def keyword_tokens(keyword: str) -> Tuple[str, ...]:
+    """Tokens of a keyword or phrase, which matches whole tokens of a description only"""
+    return tuple(TOKEN_PATTERN.findall(normalize_description(keyword)))
+
+
+class CompiledRules:
+    """
+    A tenant's active rules in priority order, compiled for matching whole batches.
+    Keywords of all rules form one token n-gram table, so a description is matched
+    against every keyword with one lookup per token and n-gram length. Patterns are
+    joined into one regex that rules out most descriptions with a single search; only
+    descriptions it hits are tried against the individual patterns, and all of them are
+    tried if the patterns cannot be joined. Each distinct
+    description is matched once. Amount, type and account criteria are then checked for
+    all rows at once on a (rows x matched rules) matrix, and each row takes its first
+    match.
+    """
+
+    def __init__(self, rules: List):
+        self.rule_ids = np.array([rule.id for rule in rules], dtype=np.int64)
+        self.category_ids = np.array([rule.category_id for rule in rules], dtype=np.int64)
+        self.min_minor = np.array([
+            NO_MIN if rule.min_amount is None else to_minor(rule.min_amount) for rule in rules
+        ], dtype=np.int64)
+        self.max_minor = np.array([
+            NO_MAX if rule.max_amount is None else to_minor(rule.max_amount) for rule in rules
+        ], dtype=np.int64)
+        self.type_codes = np.array([
+            -1 if rule.transaction_type is None else TRANSACTION_TYPE_CODES[TransactionType(rule.transaction_type)]
+            for rule in rules
+        ], dtype=np.int64)
+        self.account_ids = np.array([rule.account_id or -1 for rule in rules], dtype=np.int64)
+
+        # Rules without description criteria match every description
+        self.matches_any = np.array([not rule.keywords and not rule.pattern for rule in rules], dtype=bool)
+        self.keywords: Dict[Tuple[str, ...], List[int]] = {}
+        self.patterns = []
+        for column, rule in enumerate(rules):
+            for keyword in rule.keywords or []:
+                tokens = keyword_tokens(keyword)
+                if tokens:
+                    self.keywords.setdefault(tokens, []).append(column)
+            if rule.pattern:
+                self.patterns.append((column, re.compile(rule.pattern, re.IGNORECASE)))
+        self.first_tokens = {tokens[0] for tokens in self.keywords}
+        self.max_keyword_tokens = max((len(tokens) for tokens in self.keywords), default=0)
+        self.any_pattern = None
+        if self.patterns:
+            try:
+                self.any_pattern = re.compile(
+                    "|".join(f"(?:{pattern.pattern})" for _, pattern in self.patterns), re.IGNORECASE
+                )
+            except re.error:
+                # A rule saved before patterns were checked in their joined form
+                pass
+
+    def __len__(self) -> int:
+        return len(self.rule_ids)
+
+    def match_descriptions(self, descriptions: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(distinct descriptions x rules) description matches, and each row's distinct description"""
+        distinct = {}
+        row_index = np.array(
+            [distinct.setdefault(description, len(distinct)) for description in descriptions],
+            dtype=np.int64
+        )
+        hit_rows = []
+        hit_columns = []
+        for row, description in enumerate(distinct):
+            description = normalize_description(description)
+            if self.keywords:
+                tokens = TOKEN_PATTERN.findall(description)
+                for start, token in enumerate(tokens):
+                    if token not in self.first_tokens:
+                        continue
+                    for end in range(start + 1, min(start + self.max_keyword_tokens, len(tokens)) + 1):
+                        columns = self.keywords.get(tuple(tokens[start:end]))
+                        if columns:
+                            hit_rows.extend([row] * len(columns))
+                            hit_columns.extend(columns)
+            if self.patterns and (self.any_pattern is None or self.any_pattern.search(description)):
+                for column, pattern in self.patterns:
+                    if pattern.search(description):
+                        hit_rows.append(row)
+                        hit_columns.append(column)
+
+        matches = np.zeros((len(distinct), len(self)), dtype=bool)
+        matches[:, self.matches_any] = True
+        matches[hit_rows, hit_columns] = True
+        return matches, row_index
+
+    def categorize(
+        self,
+        descriptions: List[str],
+        amounts_minor: np.ndarray,
+        type_codes: np.ndarray,
+        account_ids: np.ndarray
+    ) -> np.ndarray:
+        """Column of the first matching rule per row, -1 where none matches"""
+        if not len(self) or not len(descriptions):
+            return np.full(len(descriptions), -1, dtype=np.int64)
+        matches, row_index = self.match_descriptions(descriptions)
+        # Only rules some description matched can apply
+        live = np.flatnonzero(matches.any(axis=0))
+        if not len(live):
+            return np.full(len(descriptions), -1, dtype=np.int64)
+        candidates = (
+            matches[:, live][row_index]
+            & (amounts_minor[:, None] >= self.min_minor[None, live])
+            & (amounts_minor[:, None] <= self.max_minor[None, live])
+            & ((self.type_codes[None, live] == -1) | (type_codes[:, None] == self.type_codes[None, live]))
+            & ((self.account_ids[None, live] == -1) | (account_ids[:, None] == self.account_ids[None, live]))
+        )
+        first = candidates.argmax(axis=1)
+        return np.where(candidates[np.arange(len(first)), first], live[first], -1)
+
+
+def get_compiled_rules(db: Session, tenant_key: Hashable) -> CompiledRules:
+    """The tenant's active rules, compiled once and reused until a rule changes"""
+    watermark = tuple(db.query(func.count(CategorizationRule.id), func.max(CategorizationRule.updated_at)).one())
+    compiled = rule_cache.get(tenant_key, "rules", watermark)
+    if compiled is None:
+        rules = db.query(CategorizationRule).filter(
+            CategorizationRule.is_active == True
+        ).order_by(CategorizationRule.priority, CategorizationRule.id).all()
+        compiled = CompiledRules(rules)
+        rule_cache.set(tenant_key, "rules", watermark, compiled)
+    return compiled
+
+
+def categorize_transactions(db: Session, tenant_key: Hashable, transactions: List[Dict]) -> List[Optional[int]]:
+    """
+    Set category_id on the transaction rows that have none, from the first matching rule.
+    Rows need description, amount, transaction_type and account_id.
+    Returns the id of the rule applied per row (None where no rule applied).
+    """
+    compiled = get_compiled_rules(db, tenant_key)
+    pending = [transaction for transaction in transactions if not transaction.get("category_id")]
+    if not len(compiled) or not pending:
+        return [None] * len(transactions)
+
+    columns = compiled.categorize(
+        [transaction["description"] for transaction in pending],
+        np.array([abs(to_minor(transaction["amount"])) for transaction in pending], dtype=np.int64),
+        np.array([TRANSACTION_TYPE_CODES[TransactionType(transaction["transaction_type"])] for transaction in pending], dtype=np.int64),
+        np.array([transaction.get("account_id") or -1 for transaction in pending], dtype=np.int64)
+    )
+    applied = {}
+    for transaction, column in zip(pending, columns.tolist()):
+        if column >= 0:
+            transaction["category_id"] = int(compiled.category_ids[column])
+            applied[id(transaction)] = int(compiled.rule_ids[column])
+    return [applied.get(id(transaction)) for transaction in transactions]
+
+
+def record_rule_hits(db: Session, rule_ids: List[Optional[int]]):
+    """Add categorized transactions to the rules' hit statistics. Does not commit."""
+    hits = {}
+    for rule_id in rule_ids:
+        if rule_id is not None:
+            hits[rule_id] = hits.get(rule_id, 0) + 1
+    if not hits:
+        return
+    db.execute(text("""
+        UPDATE categorization_rules r
+        SET hit_count = r.hit_count + u.hits, last_hit_at = :now
+        FROM unnest(CAST(:ids AS INTEGER[]), CAST(:hits AS BIGINT[])) AS u(id, hits)
+        WHERE r.id = u.id
+    """), {"ids": list(hits), "hits": list(hits.values()), "now": datetime.utcnow()})
+
+
+def create_categorization_rule(db: Session, data: Dict, created_by: Optional[int] = None) -> CategorizationRule:
+    """Create a rule after checking its category, account, amount range and pattern"""
+    if not db.query(Category.id).filter(Category.id == data["category_id"]).first():
+        raise ValueError(f"Category {data['category_id']} not found")
+    if data.get("account_id") and not db.query(Account.id).filter(Account.id == data["account_id"]).first():
+        raise ValueError(f"Account {data['account_id']} not found")
+    if data.get("min_amount") is not None and data.get("max_amount") is not None \
+            and data["min_amount"] > data["max_amount"]:
+        raise ValueError("min_amount is greater than max_amount")
+
+    if data.get("transaction_type"):
+        data["transaction_type"] = TransactionType(data["transaction_type"])
+    data["keywords"] = [keyword.strip() for keyword in data.get("keywords") or [] if keyword.strip()] or None
+    if data.get("pattern"):
+        # Patterns are also joined into one regex, where names and group numbers would clash
+        if re.search(r"\(\?P[<=]|\\[1-9]", data["pattern"]):
+            raise ValueError("Named groups and backreferences are not supported in patterns")
+        try:
+            # Compiled the way it is joined with the other rules' patterns, which rejects
+            # inline global flags such as (?i)
+            re.compile(f"(?:{data['pattern']})", re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {e}")
+    if not data["keywords"] and not data.get("pattern") and data.get("min_amount") is None \
+            and data.get("max_amount") is None:
+        raise ValueError("A rule needs keywords, a pattern or an amount range")
+
+    rule = CategorizationRule(created_by=created_by, **data)
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+
+def list_categorization_rules(db: Session) -> List[CategorizationRule]:
+    return db.query(CategorizationRule).order_by(CategorizationRule.priority, CategorizationRule.id).all()
+
+
+def deactivate_categorization_rule(db: Session, rule_id: int) -> CategorizationRule:
+    rule = db.query(CategorizationRule).filter(CategorizationRule.id == rule_id).first()
+    if not rule:
+        raise ValueError(f"Categorization rule {rule_id} not found")
+    rule.is_active = False
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+
+def preview_categorization(db: Session, tenant_key: Hashable, transactions: List[Dict]) -> List[Dict]:
+    """Rule and category the current rules would assign to each row, without recording hits"""
+    rows = [{**transaction, "category_id": None} for transaction in transactions]
+    rule_ids = categorize_transactions(db, tenant_key, rows)
+    return [
+        {"rule_id": rule_id, "category_id": row["category_id"]}
+        for rule_id, row in zip(rule_ids, rows)
+    ]
@@ -0,0 +1,106 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from decimal import Decimal
+from typing import Dict, List, Optional
+from datetime import date
+import hashlib
+import re
+from app.models.tenant.transaction import Transaction, TransactionType
+from app.services.money import to_minor, from_minor
+
+# SQL twin of transaction_content_hash, used for backfills and duplicate scans.
+# Both must produce the same digest for the same row.
+TRANSACTION_HASH_SQL = """
+    encode(sha256(convert_to(concat_ws('|',
+        account_id,
+        transaction_date,
+        transaction_type,
+        CAST(amount AS NUMERIC(15, 2)),
+        btrim(regexp_replace(lower(description), '\\s+', ' ', 'g'))
+    ), 'UTF8')), 'hex')
+"""
+
+DUPLICATE_GROUPS_QUERY = text(f"""
+    SELECT account_id, transaction_date, {TRANSACTION_HASH_SQL} AS content_hash,
+           array_agg(id ORDER BY id) AS transaction_ids
+    FROM transactions
+    GROUP BY account_id, transaction_date, {TRANSACTION_HASH_SQL}
+    HAVING COUNT(*) > 1
+    ORDER BY account_id, transaction_date
+    LIMIT :limit
+""")
+
+
+class DuplicateTransactionError(ValueError):
+    """Raised when a transaction with the same content already exists for the account"""
+
+
+def normalize_description(description: str) -> str:
+    """Lower-case with runs of whitespace collapsed, as in TRANSACTION_HASH_SQL"""
+    return re.sub(r"\s+", " ", description.lower()).strip()
+
+
+def transaction_content_hash(
+    account_id: int,
+    transaction_date: date,
+    transaction_type: str,
+    amount: Decimal,
+    description: str
+) -> str:
+    """Fingerprint of (account, date, type, amount, normalized description)"""
+    normalized = "|".join([
+        str(account_id),
+        transaction_date.isoformat(),
+        TransactionType(transaction_type).name,  # Enum columns store member names
+        str(from_minor(to_minor(amount))),  # Same text as CAST(amount AS NUMERIC(15, 2))
+        normalize_description(description),
+    ])
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def insert_transactions(db: Session, rows: List[Dict]) -> List[Optional[int]]:
+    """
+    Insert transaction rows, letting the unique content-hash index drop duplicates
+    (ON CONFLICT DO NOTHING) instead of checking first. Fills in content_hash.
+    Returns the new id for each input row, or None where the row was a duplicate.
+    Does not commit.
+    """
+    if not rows:
+        return []
+
+    for row in rows:
+        row["content_hash"] = transaction_content_hash(
+            row["account_id"], row["transaction_date"], row["transaction_type"],
+            row["amount"], row["description"]
+        )
+        row["transaction_type"] = TransactionType(row["transaction_type"])
+
+    inserted = db.execute(
+        pg_insert(Transaction).values(rows).on_conflict_do_nothing(
+            index_elements=["account_id", "transaction_date", "content_hash"]
+        ).returning(Transaction.id, Transaction.account_id, Transaction.transaction_date, Transaction.content_hash)
+    ).all()
+
+    ids = {(row.account_id, row.transaction_date, row.content_hash): row.id for row in inserted}
+    # A batch can repeat a row; only its first occurrence was inserted
+    return [
+        ids.pop((row["account_id"], row["transaction_date"], row["content_hash"]), None)
+        for row in rows
+    ]
+
+
+def find_duplicate_transactions(db: Session, limit: int = 1000) -> List[Dict]:
+    """
+    Groups of existing transactions with identical content, found with a single
+    hash-grouping query. Rows stored before fingerprinting are included.
+    """
+    return [
+        {
+            "account_id": row.account_id,
+            "transaction_date": row.transaction_date,
+            "content_hash": row.content_hash,
+            "transaction_ids": list(row.transaction_ids),
+        }
+        for row in db.execute(DUPLICATE_GROUPS_QUERY, {"limit": limit}).all()
+    ]
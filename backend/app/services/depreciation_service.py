@@ -0,0 +1,199 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from decimal import Decimal
+from typing import Dict
+from datetime import date, datetime, timedelta
+import numpy as np
+from app.models.tenant.fixed_asset import FixedAsset, DepreciationRun, DepreciationMethod
+from app.services.accounting_service import create_posted_journal_entries, get_chart_account_by_code
+from app.services.money import LEDGER_EXPONENT, to_minor, from_minor
+
+# Default chart accounts from the standard chart of accounts
+FIXED_ASSETS_ACCOUNT_CODE = "1500"
+DEPRECIATION_ACCOUNT_CODE = "5600"
+
+UNGROUPED = ""
+
+
+def create_fixed_asset(db: Session, company_id: int, data: Dict) -> FixedAsset:
+    """Register a fixed asset, defaulting to the Fixed Assets and Depreciation chart accounts"""
+    if not data.get("asset_chart_account_id"):
+        data["asset_chart_account_id"] = get_chart_account_by_code(db, company_id, FIXED_ASSETS_ACCOUNT_CODE).id
+    if not data.get("expense_chart_account_id"):
+        data["expense_chart_account_id"] = get_chart_account_by_code(db, company_id, DEPRECIATION_ACCOUNT_CODE).id
+
+    asset = FixedAsset(company_id=company_id, **data)
+    db.add(asset)
+    db.commit()
+    db.refresh(asset)
+    return asset
+
+
+def compute_depreciation_charges(
+    cost_cents: np.ndarray,
+    salvage_cents: np.ndarray,
+    accumulated_cents: np.ndarray,
+    life_months: np.ndarray,
+    months_in_service: np.ndarray,
+    declining: np.ndarray,
+    declining_factor: np.ndarray
+) -> np.ndarray:
+    """
+    One month's depreciation charge for every asset, in integer cents.
+    months_in_service counts months before the current one. Declining balance switches
+    to straight-line over the remaining life once that gives the larger charge, and no
+    asset is depreciated below its salvage value.
+    """
+    depreciable = cost_cents - salvage_cents
+    remaining = np.maximum(depreciable - accumulated_cents, 0)
+    life = np.maximum(life_months, 1).astype(np.float64)
+
+    straight_line = depreciable / life
+    book_value = (cost_cents - accumulated_cents).astype(np.float64)
+    declining_charge = book_value * declining_factor / life
+    remaining_months = np.maximum(life - months_in_service, 1)
+    declining_charge = np.maximum(declining_charge, remaining / remaining_months)
+
+    charge = np.where(declining, declining_charge, straight_line)
+    charge = np.rint(charge).astype(np.int64)
+    # Final month of life takes whatever is left so the asset lands exactly on salvage
+    charge = np.where(months_in_service >= life_months - 1, remaining, charge)
+    return np.clip(charge, 0, remaining)
+
+
+def run_depreciation(
+    db: Session,
+    period_end: date,
+    created_by: int,
+    company_id: int,
+    group_by_asset_group: bool = False
+) -> Dict:
+    """
+    Month-end depreciation for every active asset in one vectorized pass.
+    Posts a single consolidated journal entry, or one per asset group, with bulk
+    line inserts, then updates accumulated depreciation set-based. period_end has to be
+    the last day of a month, so each month has at most one run.
+    """
+    period_start = period_end.replace(day=1)
+    next_month = (period_start + timedelta(days=31)).replace(day=1)
+    if period_end != next_month - timedelta(days=1):
+        raise ValueError(f"period_end must be the last day of a month, e.g. {next_month - timedelta(days=1)}")
+    # Also catches runs recorded mid-month before period_end had to be a month end
+    if db.query(DepreciationRun).filter(
+        DepreciationRun.period_end >= period_start,
+        DepreciationRun.period_end <= period_end
+    ).first():
+        raise ValueError(f"Depreciation already run for {period_start:%Y-%m}")
+
+    rows = db.query(
+        FixedAsset.id,
+        FixedAsset.cost,
+        FixedAsset.salvage_value,
+        FixedAsset.accumulated_depreciation,
+        FixedAsset.useful_life_months,
+        FixedAsset.acquisition_date,
+        FixedAsset.method,
+        FixedAsset.declining_factor,
+        FixedAsset.asset_group,
+        FixedAsset.asset_chart_account_id,
+        FixedAsset.expense_chart_account_id
+    ).filter(
+        FixedAsset.company_id == company_id,
+        FixedAsset.is_active == True,
+        FixedAsset.acquisition_date <= period_end
+    ).order_by(FixedAsset.id).all()
+
+    empty = {"period_end": period_end, "asset_count": 0, "total_amount": Decimal("0.00"), "journal_entries": 0}
+    if not rows:
+        return empty
+
+    columns = list(zip(*rows))
+    asset_ids = np.array(columns[0], dtype=np.int64)
+    cost = np.array([to_minor(value) for value in columns[1]], dtype=np.int64)
+    salvage = np.array([to_minor(value) for value in columns[2]], dtype=np.int64)
+    accumulated = np.array([to_minor(value) for value in columns[3]], dtype=np.int64)
+    life = np.array(columns[4], dtype=np.int64)
+    acquired = np.array(columns[5], dtype="datetime64[M]")
+    declining = np.array([method == DepreciationMethod.DECLINING_BALANCE for method in columns[6]])
+    factor = np.array(columns[7], dtype=np.float64)
+    asset_accounts = np.array(columns[9], dtype=np.int64)
+    expense_accounts = np.array(columns[10], dtype=np.int64)
+    groups = np.array([(group or UNGROUPED) if group_by_asset_group else UNGROUPED for group in columns[8]])
+
+    months_in_service = (np.datetime64(period_start, "M") - acquired).astype(np.int64)
+    charges = compute_depreciation_charges(cost, salvage, accumulated, life, months_in_service, declining, factor)
+
+    charged = charges > 0
+    if not charged.any():
+        return empty
+
+    asset_ids = asset_ids[charged]
+    charges = charges[charged]
+    asset_accounts = asset_accounts[charged]
+    expense_accounts = expense_accounts[charged]
+    unique_groups, group_index = np.unique(groups[charged], return_inverse=True)
+
+    # Aggregate lines per (entry group, expense account, asset account)
+    keys = np.stack([group_index, expense_accounts, asset_accounts], axis=1)
+    line_keys, line_index = np.unique(keys, axis=0, return_inverse=True)
+    line_cents = np.zeros(len(line_keys), dtype=np.int64)
+    np.add.at(line_cents, line_index.reshape(-1), charges)
+
+    entry_date = datetime.combine(period_end, datetime.min.time())
+    entries = []
+    for g, group_name in enumerate(unique_groups):
+        label = f" ({group_name})" if group_name else ""
+        lines = []
+        for (line_group, expense_account, asset_account), cents in zip(line_keys, line_cents):
+            if line_group != g:
+                continue
+            amount = from_minor(cents)
+            lines.append({"chart_account_id": int(expense_account), "debit_amount": amount, "description": "Depreciation"})
+            lines.append({"chart_account_id": int(asset_account), "credit_amount": amount, "description": "Depreciation"})
+        entries.append({
+            "entry_date": entry_date,
+            "description": f"Depreciation for period ending {period_end.isoformat()}{label}",
+            "reference": "depreciation",
+            "lines": lines
+        })
+
+    entry_ids = np.array(create_posted_journal_entries(db, entries, created_by, company_id), dtype=np.int64)
+
+    total = from_minor(charges.sum())
+    run = DepreciationRun(
+        period_end=period_end,
+        asset_count=int(len(asset_ids)),
+        total_amount=total,
+        journal_entry_count=len(entry_ids),
+        created_by=created_by
+    )
+    db.add(run)
+    db.flush()
+
+    params = {
+        "run_id": run.id,
+        "asset_ids": asset_ids.tolist(),
+        "amount_cents": charges.tolist(),
+        "entry_ids": entry_ids[group_index].tolist()
+    }
+    db.execute(text(f"""
+        INSERT INTO asset_depreciations (run_id, asset_id, amount, journal_entry_id)
+        SELECT :run_id, c.asset_id, CAST(c.cents AS NUMERIC) / {10 ** LEDGER_EXPONENT}, c.journal_entry_id
+        FROM unnest(CAST(:asset_ids AS INTEGER[]), CAST(:amount_cents AS BIGINT[]), CAST(:entry_ids AS INTEGER[]))
+            AS c(asset_id, cents, journal_entry_id)
+    """), params)
+    db.execute(text(f"""
+        UPDATE fixed_assets f
+        SET accumulated_depreciation = f.accumulated_depreciation + CAST(c.cents AS NUMERIC) / {10 ** LEDGER_EXPONENT},
+            updated_at = now()
+        FROM unnest(CAST(:asset_ids AS INTEGER[]), CAST(:amount_cents AS BIGINT[])) AS c(asset_id, cents)
+        WHERE f.id = c.asset_id
+    """), params)
+    db.commit()
+
+    return {
+        "period_end": period_end,
+        "asset_count": int(len(asset_ids)),
+        "total_amount": total,
+        "journal_entries": len(entry_ids)
+    }
@@ -0,0 +1,310 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Hashable, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+from urllib.parse import urlparse
+from urllib.request import urlopen
+import csv
+import io
+import json
+import numpy as np
+from app.core.cache import TenantCache
+from app.core.config import settings
+from app.models.tenant.chart_of_accounts import ChartOfAccount
+from app.models.tenant.fx_rate import FxRate
+from app.services.money import LEDGER_EXPONENT, from_minor
+
+# One rate table per tenant, reloaded when rates are added or changed
+rate_cache = TenantCache(max_entries_per_tenant=1)
+
+# Posted activity per chart account and day in minor units. Archived months come from their
+# batch totals, dated at the month end.
+TRIAL_BALANCE_ACTIVITY_QUERY = text(f"""
+    SELECT b.chart_account_id,
+           CAST(b.month_start + INTERVAL '1 month' - INTERVAL '1 day' AS DATE) AS day,
+           CAST(ROUND(b.total_debits * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS debit_cents,
+           CAST(ROUND(b.total_credits * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS credit_cents
+    FROM ledger_archive_batches b
+    WHERE b.month_start < :month_limit
+    UNION ALL
+    SELECT l.chart_account_id,
+           CAST(l.entry_date AS DATE) AS day,
+           SUM(CAST(ROUND(COALESCE(l.debit_amount, 0) * {10 ** LEDGER_EXPONENT}) AS BIGINT)),
+           SUM(CAST(ROUND(COALESCE(l.credit_amount, 0) * {10 ** LEDGER_EXPONENT}) AS BIGINT))
+    FROM journal_entry_lines l
+    JOIN journal_entries je ON je.id = l.journal_entry_id
+    WHERE je.is_posted AND l.entry_date < :as_of_end
+    GROUP BY l.chart_account_id, CAST(l.entry_date AS DATE)
+""")
+
+# Chart accounts backing a physical account are kept in that account's currency
+ACCOUNT_CURRENCY_QUERY = text("""
+    SELECT chart_account_id, MIN(currency) AS currency
+    FROM accounts
+    GROUP BY chart_account_id
+""")
+
+
+class MissingRateError(ValueError):
+    """Raised when no rate is known for a currency pair on or before a date"""
+
+
+class RateTable:
+    """
+    In-memory rate history per currency pair as sorted day-number and rate arrays.
+    A lookup takes the latest rate on or before each date by binary search.
+    Pairs quoted the other way round are inverted; pairs without any quote are
+    crossed through one intermediate currency.
+    """
+
+    def __init__(self, rows: List[Tuple[str, str, date, Decimal]]):
+        # rows must be ordered by base, quote and date
+        self._pairs: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        for pair, pair_rows in groupby(rows, key=lambda row: (row[0], row[1])):
+            days, rates = zip(*((row[2].toordinal(), float(row[3])) for row in pair_rows))
+            self._pairs[pair] = (np.array(days, dtype=np.int64), np.array(rates, dtype=np.float64))
+        self.currencies = {currency for pair in self._pairs for currency in pair}
+
+    def _quoted(self, base: str, quote: str) -> bool:
+        return (base, quote) in self._pairs or (quote, base) in self._pairs
+
+    def _lookup(self, base: str, quote: str, days: np.ndarray) -> np.ndarray:
+        if (base, quote) not in self._pairs:
+            return 1.0 / self._lookup(quote, base, days)
+        pair_days, pair_rates = self._pairs[(base, quote)]
+        index = np.searchsorted(pair_days, days, side="right") - 1
+        if (index < 0).any():
+            first = date.fromordinal(int(days[index < 0].min()))
+            raise MissingRateError(f"No {base}/{quote} rate on or before {first.isoformat()}")
+        return pair_rates[index]
+
+    def rates_as_of(self, base: str, quote: str, days: np.ndarray) -> np.ndarray:
+        """Rate converting base into quote for each day number (date.toordinal())"""
+        if base == quote:
+            return np.ones(len(days), dtype=np.float64)
+        if self._quoted(base, quote):
+            return self._lookup(base, quote, days)
+        for via in sorted(self.currencies - {base, quote}):
+            if self._quoted(base, via) and self._quoted(via, quote):
+                return self._lookup(base, via, days) * self._lookup(via, quote, days)
+        raise MissingRateError(f"No {base}/{quote} rate")
+
+    def rate_as_of(self, base: str, quote: str, on: date) -> Decimal:
+        rate = self.rates_as_of(base, quote, np.array([on.toordinal()], dtype=np.int64))[0]
+        return Decimal(repr(float(rate)))
+
+    def convert_minor(self, amounts: np.ndarray, currencies: np.ndarray, days: np.ndarray, target: str) -> np.ndarray:
+        """
+        Convert int64 minor-unit amounts into target, each at the rate of its own day.
+        One vectorized lookup per distinct source currency; results are rounded half to even.
+        """
+        converted = np.empty(len(amounts), dtype=np.int64)
+        codes, inverse = np.unique(currencies, return_inverse=True)
+        for position, currency in enumerate(codes):
+            mask = inverse == position
+            if currency == target:
+                converted[mask] = amounts[mask]
+            else:
+                converted[mask] = np.rint(amounts[mask] * self.rates_as_of(currency, target, days[mask])).astype(np.int64)
+        return converted
+
+
+def get_rate_table(db: Session, tenant_key: Hashable) -> RateTable:
+    """The tenant's rate table, loaded once and reused until rates change"""
+    watermark = tuple(db.query(func.count(FxRate.id), func.max(FxRate.updated_at)).one())
+    table = rate_cache.get(tenant_key, "rates", watermark)
+    if table is None:
+        rows = db.query(
+            FxRate.base_currency, FxRate.quote_currency, FxRate.rate_date, FxRate.rate
+        ).order_by(FxRate.base_currency, FxRate.quote_currency, FxRate.rate_date).all()
+        table = RateTable(rows)
+        rate_cache.set(tenant_key, "rates", watermark, table)
+    return table
+
+
+def upsert_rates(db: Session, rates: List[Dict], source: Optional[str] = None) -> int:
+    """Insert or replace rates (rate_date, base_currency, quote_currency, rate); returns the count"""
+    if not rates:
+        return 0
+
+    rows = {}
+    now = datetime.utcnow()
+    for rate in rates:
+        base = rate["base_currency"].strip().upper()
+        quote = rate["quote_currency"].strip().upper()
+        value = Decimal(str(rate["rate"]))
+        if len(base) != 3 or len(quote) != 3 or base == quote:
+            raise ValueError(f"Invalid currency pair {base}/{quote}")
+        if value <= 0:
+            raise ValueError(f"Rate for {base}/{quote} on {rate['rate_date']} must be positive")
+        # The last quote of a pair and day in the batch wins
+        rows[(base, quote, rate["rate_date"])] = {
+            "rate_date": rate["rate_date"],
+            "base_currency": base,
+            "quote_currency": quote,
+            "rate": value,
+            "source": source,
+            "updated_at": now
+        }
+
+    statement = pg_insert(FxRate).values(list(rows.values()))
+    db.execute(statement.on_conflict_do_update(
+        constraint="uq_fx_rate_pair_date",
+        set_={
+            "rate": statement.excluded.rate,
+            "source": statement.excluded.source,
+            "updated_at": statement.excluded.updated_at
+        }
+    ))
+    db.commit()
+    return len(rows)
+
+
+def parse_rates_csv(content: str) -> List[Dict]:
+    """Rates from CSV text with a header row: date,base,quote,rate"""
+    rates = []
+    for line_number, row in enumerate(csv.DictReader(io.StringIO(content)), start=2):
+        try:
+            rates.append({
+                "rate_date": date.fromisoformat(row["date"].strip()),
+                "base_currency": row["base"],
+                "quote_currency": row["quote"],
+                "rate": Decimal(row["rate"].strip())
+            })
+        except (KeyError, AttributeError, ValueError, InvalidOperation) as e:
+            raise ValueError(f"Invalid rate on line {line_number}: {e}")
+    return rates
+
+
+def fetch_rates_from_api(base: str, start: date, end: date) -> List[Dict]:
+    """
+    Daily rates for base against every quoted currency from FX_RATES_API_URL.
+    Accepts a single-day response ({"date", "rates": {quote: rate}}) or a time series
+    ({"rates": {date: {quote: rate}}}).
+    """
+    if not settings.FX_RATES_API_URL:
+        raise ValueError("FX_RATES_API_URL is not configured")
+
+    url = settings.FX_RATES_API_URL.format(base=base.upper(), start=start.isoformat(), end=end.isoformat())
+    with urlopen(url, timeout=30) as response:
+        payload = json.load(response)
+
+    base = payload.get("base", base).upper()
+    series = payload.get("rates", {})
+    if series and not isinstance(next(iter(series.values())), dict):
+        series = {payload.get("date", end.isoformat()): series}
+
+    return [
+        {"rate_date": date.fromisoformat(day), "base_currency": base, "quote_currency": quote, "rate": Decimal(str(rate))}
+        for day, quotes in series.items()
+        for quote, rate in quotes.items()
+    ]
+
+
+def load_rates_from_api(db: Session, base: str, start: date, end: date) -> int:
+    return upsert_rates(db, fetch_rates_from_api(base, start, end), source=urlparse(settings.FX_RATES_API_URL).netloc)
+
+
+def list_rates(
+    db: Session,
+    base_currency: Optional[str] = None,
+    quote_currency: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = 1000
+) -> List[FxRate]:
+    query = db.query(FxRate)
+    if base_currency:
+        query = query.filter(FxRate.base_currency == base_currency.upper())
+    if quote_currency:
+        query = query.filter(FxRate.quote_currency == quote_currency.upper())
+    if date_from:
+        query = query.filter(FxRate.rate_date >= date_from)
+    if date_to:
+        query = query.filter(FxRate.rate_date <= date_to)
+    return query.order_by(FxRate.rate_date.desc(), FxRate.base_currency, FxRate.quote_currency).limit(limit).all()
+
+
+def get_trial_balance(
+    db: Session,
+    tenant_key: Hashable,
+    as_of: date,
+    base_currency: str,
+    reporting_currency: Optional[str] = None
+) -> Dict:
+    """
+    Trial balance through as_of, translated into the reporting currency.
+    Chart accounts backing a physical account are in that account's currency, all others
+    in base_currency. Posted activity is aggregated per account and day in one query and
+    translated at each day's rate in one vectorized pass. Translation at historical rates
+    means foreign-currency activity need not net to zero; the gap is reported as
+    translation_difference.
+    """
+    from app.services.archive_service import get_archive_horizon
+
+    base_currency = base_currency.upper()
+    reporting_currency = (reporting_currency or base_currency).upper()
+
+    # Archived activity is only kept per month
+    next_day = as_of + timedelta(days=1)
+    horizon = get_archive_horizon(db)
+    if horizon is not None and as_of < horizon and next_day.day != 1:
+        raise ValueError(f"Ledger is archived through {horizon.isoformat()}; use a month end before then")
+
+    rows = db.execute(TRIAL_BALANCE_ACTIVITY_QUERY, {
+        "month_limit": next_day.replace(day=1),
+        "as_of_end": datetime.combine(next_day, time.min)
+    }).all()
+
+    chart_accounts = db.query(ChartOfAccount).order_by(ChartOfAccount.account_code).all()
+    account_currencies = {row.chart_account_id: row.currency.upper() for row in db.execute(ACCOUNT_CURRENCY_QUERY).all()}
+
+    accounts = []
+    total_debits = total_credits = 0
+    if rows:
+        activity = np.array(
+            [(row.chart_account_id, row.day.toordinal(), row.debit_cents, row.credit_cents) for row in rows],
+            dtype=np.int64
+        )
+        chart_account_ids, account_index = np.unique(activity[:, 0], return_inverse=True)
+        currencies = np.array([account_currencies.get(int(i), base_currency) for i in chart_account_ids])[account_index]
+
+        rate_table = get_rate_table(db, tenant_key)
+        reporting_debits = rate_table.convert_minor(activity[:, 2], currencies, activity[:, 1], reporting_currency)
+        reporting_credits = rate_table.convert_minor(activity[:, 3], currencies, activity[:, 1], reporting_currency)
+
+        totals = np.zeros((len(chart_account_ids), 4), dtype=np.int64)
+        np.add.at(totals, account_index, np.stack(
+            [activity[:, 2], activity[:, 3], reporting_debits, reporting_credits], axis=1
+        ))
+        totals_by_account = dict(zip(chart_account_ids.tolist(), totals.tolist()))
+
+        for chart_account in chart_accounts:
+            if chart_account.id not in totals_by_account:
+                continue
+            debits, credits, translated_debits, translated_credits = totals_by_account[chart_account.id]
+            total_debits += translated_debits
+            total_credits += translated_credits
+            accounts.append({
+                "chart_account_id": chart_account.id,
+                "account_code": chart_account.account_code,
+                "account_name": chart_account.account_name,
+                "account_type": chart_account.account_type.value,
+                "currency": account_currencies.get(chart_account.id, base_currency),
+                "debit_total": from_minor(debits),
+                "credit_total": from_minor(credits),
+                "reporting_debit_total": from_minor(translated_debits),
+                "reporting_credit_total": from_minor(translated_credits)
+            })
+
+    return {
+        "as_of": as_of,
+        "reporting_currency": reporting_currency,
+        "accounts": accounts,
+        "total_debits": from_minor(total_debits),
+        "total_credits": from_minor(total_credits),
+        "translation_difference": from_minor(total_debits - total_credits)
+    }
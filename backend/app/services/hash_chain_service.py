@@ -0,0 +1,246 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text, update
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from datetime import datetime
+import hashlib
+import json
+from app.core.config import settings
+from app.models.tenant.journal_entry import JournalEntry
+from app.models.tenant.ledger_archive import LedgerArchiveBatch
+from app.models.tenant.chain_verification import ChainVerification
+from app.services.archive_service import decode_batch, get_archive_horizon
+from app.services.money import LEDGER_EXPONENT, to_minor
+
+# Previous hash of the first entry in the chain
+GENESIS_HASH = "0" * 64
+
+HOT_LINES_QUERY = text(f"""
+    SELECT journal_entry_id, id, chart_account_id,
+           CAST(round(COALESCE(debit_amount, 0) * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS debit,
+           CAST(round(COALESCE(credit_amount, 0) * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS credit,
+           description, reference
+    FROM journal_entry_lines
+    WHERE journal_entry_id = ANY(:ids)
+""")
+
+ENTRY_COLUMNS = (
+    JournalEntry.id, JournalEntry.entry_number, JournalEntry.entry_date, JournalEntry.description,
+    JournalEntry.reference, JournalEntry.chain_position, JournalEntry.chain_hash
+)
+
+
+def entry_chain_hash(previous_hash: str, entry, lines: List[tuple]) -> str:
+    """
+    sha256 over the previous entry's hash, the entry header and its lines as
+    (id, chart account, debit, credit, description, reference) with amounts in minor
+    units. Uses only values the ledger archive keeps, so archived entries still verify.
+    """
+    payload = [
+        previous_hash,
+        entry.id,
+        entry.entry_number,
+        entry.entry_date.isoformat(),
+        entry.description,
+        entry.reference,
+        sorted(lines),
+    ]
+    return hashlib.sha256(
+        json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def _load_entry_lines(db: Session, entries: List) -> Dict[int, List[tuple]]:
+    """Lines of the given entries, from journal_entry_lines or, once archived, from archive batches"""
+    lines = {entry.id: [] for entry in entries}
+    if not lines:
+        return lines
+    for row in db.execute(HOT_LINES_QUERY, {"ids": list(lines)}):
+        lines[row.journal_entry_id].append(
+            (row.id, row.chart_account_id, row.debit, row.credit, row.description, row.reference)
+        )
+
+    horizon = get_archive_horizon(db)
+    archived = {
+        entry.id for entry in entries
+        if not lines[entry.id] and horizon and entry.entry_date.date() <= horizon
+    }
+    if archived:
+        months = {entry.entry_date.date().replace(day=1) for entry in entries if entry.id in archived}
+        batches = db.query(LedgerArchiveBatch).filter(LedgerArchiveBatch.month_start.in_(months)).all()
+        for batch in batches:
+            for line in decode_batch(batch.payload):
+                if line["journal_entry_id"] in archived:
+                    lines[line["journal_entry_id"]].append((
+                        line["id"], batch.chart_account_id,
+                        to_minor(line["debit_amount"]), to_minor(line["credit_amount"]),
+                        line["description"], line["reference"]
+                    ))
+    return lines
+
+
+def seal_posted_entries(db: Session, event_ids: List[int]):
+    """
+    hash_chain projection: append the entries of entry_posted events to the chain in
+    log order, each hashed over its lines and the previous entry's hash. Sealing runs
+    behind the posting transaction, so postings never wait on the chain head.
+    Does not commit.
+    """
+    entry_ids = db.execute(text("""
+        SELECT journal_entry_id FROM ledger_events
+        WHERE id = ANY(:ids) AND event_type = 'entry_posted'
+        ORDER BY xact_id, id
+    """), {"ids": list(event_ids)}).scalars().all()
+    if not entry_ids:
+        return
+
+    entries = {
+        entry.id: entry
+        for entry in db.query(*ENTRY_COLUMNS).filter(
+            JournalEntry.id.in_(entry_ids),
+            JournalEntry.chain_position.is_(None)
+        ).all()
+    }
+    head = db.query(JournalEntry.chain_position, JournalEntry.chain_hash).filter(
+        JournalEntry.chain_position.isnot(None)
+    ).order_by(JournalEntry.chain_position.desc()).first()
+    position, previous_hash = head if head else (0, GENESIS_HASH)
+    lines = _load_entry_lines(db, list(entries.values()))
+
+    updates = []
+    for entry_id in entry_ids:
+        entry = entries.pop(entry_id, None)
+        if entry is None:
+            continue
+        position += 1
+        previous_hash = entry_chain_hash(previous_hash, entry, lines[entry.id])
+        updates.append({"id": entry.id, "chain_position": position, "chain_hash": previous_hash})
+    if updates:
+        db.execute(update(JournalEntry), updates)
+
+
+def reset_hash_chain(db: Session):
+    raise ValueError("The hash chain cannot be rebuilt: re-sealing would hide tampering")
+
+
+def _stored_hash(db: Session, position: int) -> Optional[str]:
+    if position == 0:
+        return GENESIS_HASH
+    return db.query(JournalEntry.chain_hash).filter(JournalEntry.chain_position == position).scalar()
+
+
+def verify_chain_segment(db: Session, start: int, end: int, previous_hash: Optional[str] = None) -> Dict:
+    """
+    Recompute the hashes of chain positions start..end, starting from previous_hash
+    (default: the stored hash at start - 1). Stops at the first entry that is missing
+    or whose hash does not match.
+    """
+    if previous_hash is None:
+        previous_hash = _stored_hash(db, start - 1)
+    entries = db.query(*ENTRY_COLUMNS).filter(
+        JournalEntry.chain_position >= start,
+        JournalEntry.chain_position <= end
+    ).order_by(JournalEntry.chain_position).all()
+    lines = _load_entry_lines(db, entries)
+
+    expected = start
+    for entry in entries:
+        if entry.chain_position != expected or previous_hash is None:
+            break
+        if entry_chain_hash(previous_hash, entry, lines[entry.id]) != entry.chain_hash:
+            break
+        previous_hash = entry.chain_hash
+        expected += 1
+
+    return {
+        "start": start,
+        "verified_through": expected - 1,
+        "verified_hash": previous_hash,
+        "entry_count": expected - start,
+        "broken_position": expected if expected <= end else None
+    }
+
+
+def _verify_segment_in_process(args) -> Dict:
+    """Process pool entry point: verify one segment on a connection of its own"""
+    from app.core.database import get_tenant_db
+
+    company_id, database_name, start, end, previous_hash = args
+    tenant_db_gen = get_tenant_db(company_id, database_name)
+    tenant_db = next(tenant_db_gen)
+    try:
+        return verify_chain_segment(tenant_db, start, end, previous_hash)
+    finally:
+        tenant_db.close()
+
+
+def verify_hash_chain(
+    db: Session,
+    company_id: int,
+    database_name: str,
+    full: bool = False,
+    workers: int = 1,
+    segment_size: Optional[int] = None,
+    created_by: Optional[int] = None
+) -> ChainVerification:
+    """
+    Verify the entries sealed since the last verification (or, with full, the whole
+    chain) and record the run. The range is split into segments of segment_size
+    positions; with workers > 1 they are verified in parallel in a process pool, each
+    from the stored hash before it. Since every segment also checks its own last
+    stored hash, the chain is intact when every segment is.
+    """
+    segment_size = segment_size or settings.HASH_CHAIN_SEGMENT_SIZE
+    started_at = datetime.utcnow()
+
+    last = None if full else db.query(ChainVerification).order_by(ChainVerification.id.desc()).first()
+    start = last.verified_through + 1 if last else 1
+    # The recorded hash anchors the first segment, so rewriting verified history is caught too
+    seed = (last.verified_hash or GENESIS_HASH) if last else GENESIS_HASH
+    head = db.query(JournalEntry.chain_position).filter(
+        JournalEntry.chain_position.isnot(None)
+    ).order_by(JournalEntry.chain_position.desc()).limit(1).scalar() or 0
+
+    segments = [(position, min(position + segment_size - 1, head)) for position in range(start, head + 1, segment_size)]
+    if workers > 1 and len(segments) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_verify_segment_in_process, [
+                (company_id, database_name, segment_start, segment_end, seed if segment_start == start else None)
+                for segment_start, segment_end in segments
+            ]))
+    else:
+        results = []
+        previous_hash = seed
+        for segment_start, segment_end in segments:
+            result = verify_chain_segment(db, segment_start, segment_end, previous_hash)
+            results.append(result)
+            if result["broken_position"] is not None:
+                break
+            previous_hash = result["verified_hash"]
+
+    verification = ChainVerification(
+        verified_from=start,
+        verified_through=start - 1,
+        verified_hash=seed,
+        entry_count=0,
+        segment_count=len(segments),
+        started_at=started_at,
+        finished_at=datetime.utcnow(),
+        created_by=created_by
+    )
+    for result in results:
+        verification.entry_count += result["entry_count"]
+        verification.verified_through = result["verified_through"]
+        verification.verified_hash = result["verified_hash"]
+        if result["broken_position"] is not None:
+            verification.broken_position = result["broken_position"]
+            break
+
+    db.add(verification)
+    db.commit()
+    db.refresh(verification)
+    return verification
+
+
+def list_chain_verifications(db: Session, limit: int = 20) -> List[ChainVerification]:
+    return db.query(ChainVerification).order_by(ChainVerification.id.desc()).limit(limit).all()
@@ -0,0 +1,99 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import Any, Callable, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import hashlib
+import json
+from app.core.config import settings
+from app.models.tenant.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+# Claims a key, or takes over one whose TTL has passed. While another request holds the
+# key uncommitted, this blocks on the unique index until that request finishes.
+CLAIM_KEY_QUERY = text("""
+    INSERT INTO idempotency_keys (key, scope, request_hash, created_by, created_at, expires_at)
+    VALUES (:key, :scope, :request_hash, :created_by, :now, :expires_at)
+    ON CONFLICT (key) DO UPDATE
+    SET scope = EXCLUDED.scope,
+        request_hash = EXCLUDED.request_hash,
+        response_body = NULL,
+        created_by = EXCLUDED.created_by,
+        created_at = EXCLUDED.created_at,
+        expires_at = EXCLUDED.expires_at
+    WHERE idempotency_keys.expires_at < EXCLUDED.created_at
+""")
+
+
+class IdempotencyKeyMismatchError(ValueError):
+    """Raised when an Idempotency-Key is reused for a different request"""
+
+
+def request_fingerprint(payload: Dict) -> str:
+    """sha256 of the request body with keys sorted"""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def run_idempotent(
+    db: Session,
+    key: Optional[str],
+    scope: str,
+    payload: Dict,
+    created_by: int,
+    operation: Callable[[], Any]
+) -> Tuple[Any, bool]:
+    """
+    Run a posting operation at most once per Idempotency-Key.
+    The first request claims and row-locks the key, runs the operation and stores its
+    JSON response; retries get the stored response back without running it again.
+    A concurrent duplicate blocks on the lock until the first request has finished.
+    If the operation fails nothing is stored, so the request can be retried.
+    Without a key the operation just runs. Returns (response, replayed).
+    """
+    if key is None:
+        return operation(), False
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise ValueError(f"Idempotency-Key must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} characters")
+
+    request_hash = request_fingerprint(payload)
+    now = datetime.utcnow()
+
+    # The key is held on a connection of its own: the posting services commit their work,
+    # and the lock has to outlast that commit until the response is stored
+    key_db = Session(bind=db.get_bind())
+    try:
+        key_db.execute(CLAIM_KEY_QUERY, {
+            "key": key,
+            "scope": scope,
+            "request_hash": request_hash,
+            "created_by": created_by,
+            "now": now,
+            "expires_at": now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        })
+        record = key_db.query(IdempotencyKey).filter(
+            IdempotencyKey.key == key
+        ).with_for_update().one()
+
+        if record.scope != scope or record.request_hash != request_hash:
+            raise IdempotencyKeyMismatchError(
+                f"Idempotency-Key {key!r} was already used for a different request"
+            )
+        if record.response_body is not None:
+            return record.response_body, True
+
+        response = operation()
+        record.response_body = response
+        key_db.commit()
+        return response, False
+    finally:
+        # Rolls back an unfinished claim, releasing the key for a retry
+        key_db.close()
+
+
+def purge_expired_idempotency_keys(db: Session) -> int:
+    """Delete keys past their TTL; returns how many were removed"""
+    deleted = db.query(IdempotencyKey).filter(
+        IdempotencyKey.expires_at < datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
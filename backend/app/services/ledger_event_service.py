@@ -0,0 +1,105 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import List, Optional, Tuple
+from datetime import datetime
+from app.services.money import LEDGER_EXPONENT
+
+# Id of the current transaction (assigned on first use), comparable with snapshot xmin
+CURRENT_XACT_SQL = "CAST(CAST(pg_current_xact_id() AS TEXT) AS BIGINT)"
+
+# Lines of journal entry `je` as event JSON, amounts in minor units
+ENTRY_LINES_JSON_SQL = f"""
+    SELECT json_agg(json_build_object(
+               'chart_account_id', l.chart_account_id,
+               'debit', CAST(round(COALESCE(l.debit_amount, 0) * {10 ** LEDGER_EXPONENT}) AS BIGINT),
+               'credit', CAST(round(COALESCE(l.credit_amount, 0) * {10 ** LEDGER_EXPONENT}) AS BIGINT),
+               'line_count', 1
+           ) ORDER BY l.id)
+    FROM journal_entry_lines l
+    WHERE l.journal_entry_id = je.id
+"""
+
+# Expands the lines of ledger events `e`, for projections
+EVENT_LINES_SQL = """
+    json_to_recordset(e.lines) AS l(chart_account_id INTEGER, debit BIGINT, credit BIGINT, line_count INTEGER)
+"""
+
+APPEND_POSTED_QUERY = text(f"""
+    INSERT INTO ledger_events (xact_id, event_type, journal_entry_id, category_id, entry_date, lines, recorded_at)
+    SELECT {CURRENT_XACT_SQL}, 'entry_posted', je.id, e.category_id, je.entry_date, ({ENTRY_LINES_JSON_SQL}), now()
+    FROM unnest(CAST(:ids AS INTEGER[]), CAST(:category_ids AS INTEGER[]))
+         WITH ORDINALITY AS e(journal_entry_id, category_id, position)
+    JOIN journal_entries je ON je.id = e.journal_entry_id
+    ORDER BY e.position
+""")
+
+# Events after a checkpoint, in (xact_id, id) order. Only events of transactions older
+# than every transaction still running are returned: an in-flight posting may hold a
+# lower sequence number than events already committed, but never a lower xact_id than
+# the snapshot's xmin, so nothing can later appear behind the checkpoint.
+EVENTS_AFTER_QUERY = text("""
+    SELECT id, xact_id
+    FROM ledger_events
+    WHERE (xact_id, id) > (:xact_id, :event_id)
+      AND xact_id < CAST(CAST(pg_snapshot_xmin(pg_current_snapshot()) AS TEXT) AS BIGINT)
+    ORDER BY xact_id, id
+    LIMIT :limit
+""")
+
+# Latest log position (optionally of events dated within a range) below the snapshot's
+# xmin. Events past it may still be joined by lower ids from transactions in flight,
+# but nothing can commit at or below it anymore, so it only moves forward.
+LOG_POSITION_QUERY = text("""
+    SELECT xact_id, id
+    FROM ledger_events
+    WHERE xact_id < CAST(CAST(pg_snapshot_xmin(pg_current_snapshot()) AS TEXT) AS BIGINT)
+      AND (CAST(:date_from AS TIMESTAMP) IS NULL OR entry_date >= :date_from)
+      AND (CAST(:date_until AS TIMESTAMP) IS NULL OR entry_date < :date_until)
+    ORDER BY xact_id DESC, id DESC
+    LIMIT 1
+""")
+
+PENDING_EVENTS_QUERY = text("""
+    SELECT COUNT(*) FROM ledger_events
+    WHERE (xact_id, id) > (:xact_id, :event_id)
+""")
+
+
+def append_posted_events(
+    db: Session,
+    journal_entry_ids: List[int],
+    category_ids: Optional[List[Optional[int]]] = None
+):
+    """
+    Append an entry_posted event per journal entry, with its lines, in one statement.
+    Runs inside the posting transaction; does not commit.
+    """
+    if category_ids is None:
+        category_ids = [None] * len(journal_entry_ids)
+    
+    db.execute(APPEND_POSTED_QUERY, {
+        "ids": list(journal_entry_ids),
+        "category_ids": [category_id or 0 for category_id in category_ids]
+    })
+
+
+def read_events_after(db: Session, xact_id: int, event_id: int, limit: int) -> List:
+    """(id, xact_id) of up to `limit` committed events after the given log position"""
+    return db.execute(EVENTS_AFTER_QUERY, {"xact_id": xact_id, "event_id": event_id, "limit": limit}).all()
+
+
+def get_log_position(
+    db: Session,
+    date_from: Optional[datetime] = None,
+    date_until: Optional[datetime] = None
+) -> Tuple[int, int]:
+    """
+    (xact_id, id) of the latest settled event, for cache watermarks. A posting moves it
+    once every transaction older than the posting has finished.
+    """
+    row = db.execute(LOG_POSITION_QUERY, {"date_from": date_from, "date_until": date_until}).first()
+    return (row.xact_id, row.id) if row else (0, 0)
+
+
+def count_events_after(db: Session, xact_id: int, event_id: int) -> int:
+    return db.execute(PENDING_EVENTS_QUERY, {"xact_id": xact_id, "event_id": event_id}).scalar()
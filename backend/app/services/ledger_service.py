@@ -0,0 +1,122 @@
+from sqlalchemy.orm import Session
+from datetime import date, datetime, time
+from typing import Optional, Dict
+from app.models.tenant.journal_entry import JournalEntry
+from app.models.tenant.journal_entry_line import JournalEntryLine
+from app.models.tenant.transaction import Transaction
+from app.services.pagination import apply_keyset, paginate, estimate_count
+
+
+def _start_of_day(value: date) -> datetime:
+    return datetime.combine(value, time.min)
+
+
+def _end_of_day(value: date) -> datetime:
+    return datetime.combine(value, time.max)
+
+
+def list_journal_entries(
+    db: Session,
+    company_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    is_posted: Optional[bool] = None,
+    chart_account_id: Optional[int] = None,
+    ascending: bool = False
+) -> Dict:
+    """List journal entries with keyset pagination on (entry_date, id)"""
+    query = db.query(JournalEntry).filter(JournalEntry.company_id == company_id)
+
+    if date_from:
+        query = query.filter(JournalEntry.entry_date >= _start_of_day(date_from))
+    if date_to:
+        query = query.filter(JournalEntry.entry_date <= _end_of_day(date_to))
+    if is_posted is not None:
+        query = query.filter(JournalEntry.is_posted == is_posted)
+    if chart_account_id:
+        query = query.filter(
+            db.query(JournalEntryLine.id).filter(
+                JournalEntryLine.journal_entry_id == JournalEntry.id,
+                JournalEntryLine.chart_account_id == chart_account_id
+            ).exists()
+        )
+
+    approximate_total = estimate_count(db, query)
+    page = apply_keyset(
+        query, JournalEntry.entry_date, JournalEntry.id, cursor, limit, ascending
+    ).all()
+    items, next_cursor = paginate(page, limit, "entry_date")
+
+    return {"items": items, "next_cursor": next_cursor, "approximate_total": approximate_total}
+
+
+def list_journal_entry_lines(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    chart_account_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    is_posted: Optional[bool] = None,
+    ascending: bool = False
+) -> Dict:
+    """List ledger lines with keyset pagination on (entry_date, id)"""
+    query = db.query(JournalEntryLine)
+
+    if chart_account_id:
+        query = query.filter(JournalEntryLine.chart_account_id == chart_account_id)
+    if date_from:
+        query = query.filter(JournalEntryLine.entry_date >= _start_of_day(date_from))
+    if date_to:
+        query = query.filter(JournalEntryLine.entry_date <= _end_of_day(date_to))
+    if is_posted is not None:
+        query = query.join(JournalEntry).filter(JournalEntry.is_posted == is_posted)
+
+    approximate_total = estimate_count(db, query)
+    page = apply_keyset(
+        query, JournalEntryLine.entry_date, JournalEntryLine.id, cursor, limit, ascending
+    ).all()
+    items, next_cursor = paginate(page, limit, "entry_date")
+
+    return {"items": items, "next_cursor": next_cursor, "approximate_total": approximate_total}
+
+
+def list_transactions(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    account_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    is_posted: Optional[bool] = None,
+    ascending: bool = False
+) -> Dict:
+    """List transactions with keyset pagination on (transaction_date, id)"""
+    query = db.query(Transaction)
+
+    if account_id:
+        query = query.filter(Transaction.account_id == account_id)
+    if category_id:
+        query = query.filter(Transaction.category_id == category_id)
+    if date_from:
+        query = query.filter(Transaction.transaction_date >= date_from)
+    if date_to:
+        query = query.filter(Transaction.transaction_date <= date_to)
+    if is_posted is not None:
+        query = query.outerjoin(JournalEntry, Transaction.journal_entry_id == JournalEntry.id)
+        if is_posted:
+            query = query.filter(JournalEntry.is_posted == True)
+        else:
+            query = query.filter((JournalEntry.id == None) | (JournalEntry.is_posted == False))
+
+    approximate_total = estimate_count(db, query)
+    page = apply_keyset(
+        query, Transaction.transaction_date, Transaction.id, cursor, limit, ascending,
+        value_type=date
+    ).all()
+    items, next_cursor = paginate(page, limit, "transaction_date")
+
+    return {"items": items, "next_cursor": next_cursor, "approximate_total": approximate_total}
@@ -0,0 +1,227 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+from decimal import Decimal
+from typing import Dict, List, Optional
+from datetime import date, datetime
+import numpy as np
+from app.models.tenant.loan import Loan, LoanPayment, AmortizationMethod
+from app.models.tenant.account import Account
+from app.services.accounting_service import create_posted_journal_entries, get_chart_account_by_code
+from app.services.money import LEDGER_EXPONENT, from_minor
+
+# Default chart accounts from the standard chart of accounts
+LONG_TERM_DEBT_ACCOUNT_CODE = "2200"
+INTEREST_EXPENSE_ACCOUNT_CODE = "5700"
+
+METHOD_CODES = {
+    AmortizationMethod.ANNUITY: 0,
+    AmortizationMethod.STRAIGHT_LINE: 1,
+    AmortizationMethod.INTEREST_ONLY: 2,
+}
+
+
+def create_loan(db: Session, company_id: int, data: Dict) -> Loan:
+    """Create a loan, defaulting to the Long-term Debt and Interest Expense chart accounts"""
+    account = db.query(Account).filter(Account.id == data["account_id"]).first()
+    if not account:
+        raise ValueError(f"Account {data['account_id']} not found")
+
+    if not data.get("liability_chart_account_id"):
+        data["liability_chart_account_id"] = get_chart_account_by_code(
+            db, company_id, LONG_TERM_DEBT_ACCOUNT_CODE
+        ).id
+    if not data.get("interest_chart_account_id"):
+        data["interest_chart_account_id"] = get_chart_account_by_code(
+            db, company_id, INTEREST_EXPENSE_ACCOUNT_CODE
+        ).id
+
+    loan = Loan(company_id=company_id, **data)
+    db.add(loan)
+    db.commit()
+    db.refresh(loan)
+    return loan
+
+
+def _add_months(start_dates: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """start_dates (n,) datetime64[D] + offsets (n, k) months, clipping to month end"""
+    start_months = start_dates.astype("datetime64[M]")
+    start_days = (start_dates - start_months.astype("datetime64[D]")).astype(np.int64)
+    months = start_months[:, None] + offsets
+    month_lengths = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+    days = np.minimum(start_days[:, None], month_lengths - 1)
+    return months.astype("datetime64[D]") + days
+
+
+def build_amortization_schedules(loans: List[Loan]) -> Dict[str, np.ndarray]:
+    """
+    Full payment schedules for all loans at once as (loans x max term) matrices.
+    Amounts are integer cents; principal is rounded on the cumulative schedule so
+    each loan's principal repayments add up exactly to its principal.
+    Periods beyond a loan's term are masked out.
+    """
+    count = len(loans)
+    principal = np.array([float(loan.principal) for loan in loans], dtype=np.float64)
+    rate = np.array([float(loan.annual_interest_rate) for loan in loans], dtype=np.float64) / 12
+    term = np.array([loan.term_months for loan in loans], dtype=np.int64)
+    method = np.array([METHOD_CODES[loan.amortization_method] for loan in loans], dtype=np.int64)
+    start = np.array([np.datetime64(loan.start_date, "D") for loan in loans], dtype="datetime64[D]")
+
+    max_term = int(term.max()) if count else 0
+    k = np.arange(1, max_term + 1, dtype=np.float64)[None, :]
+    active = k <= term[:, None]
+    n = term[:, None].astype(np.float64)
+    r = rate[:, None]
+    P = principal[:, None]
+
+    # Annuity: outstanding balance after k level payments
+    growth = (1 + r) ** k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        level_payment = np.where(r > 0, P * r / (1 - (1 + r) ** -n), P / n)
+        annuity_balance = np.where(r > 0, P * growth - level_payment * (growth - 1) / r, P - level_payment * k)
+
+    straight_balance = P - P * k / n
+    interest_only_balance = np.where(k < n, P, 0.0)
+
+    balance_after = np.select(
+        [method[:, None] == 0, method[:, None] == 1],
+        [annuity_balance, straight_balance],
+        interest_only_balance
+    )
+    balance_after = np.where(active, np.maximum(balance_after, 0.0), 0.0)
+    balance_before = np.concatenate([P, balance_after[:, :-1]], axis=1)
+
+    cumulative_principal = np.where(active, P - balance_after, P)
+    cumulative_cents = np.rint(cumulative_principal * 10 ** LEDGER_EXPONENT).astype(np.int64)
+    principal_cents = np.diff(cumulative_cents, axis=1, prepend=0)
+    interest_cents = np.where(active, np.rint(balance_before * r * 10 ** LEDGER_EXPONENT), 0).astype(np.int64)
+
+    offsets = np.arange(1, max_term + 1, dtype=np.int64)[None, :].repeat(count, axis=0)
+    due_dates = _add_months(start, offsets)
+
+    return {
+        "principal_cents": np.where(active, principal_cents, 0),
+        "interest_cents": interest_cents,
+        "balance_cents": np.rint(balance_after * 10 ** LEDGER_EXPONENT).astype(np.int64),
+        "due_dates": due_dates,
+        "active": active,
+    }
+
+
+def get_loan_schedule(loan: Loan) -> List[Dict]:
+    """Payment schedule of a single loan"""
+    schedule = build_amortization_schedules([loan])
+    rows = []
+    for period in range(loan.term_months):
+        principal = from_minor(schedule["principal_cents"][0, period])
+        interest = from_minor(schedule["interest_cents"][0, period])
+        rows.append({
+            "period_number": period + 1,
+            "due_date": schedule["due_dates"][0, period].item(),
+            "principal_amount": principal,
+            "interest_amount": interest,
+            "payment_amount": principal + interest,
+            "remaining_balance": from_minor(schedule["balance_cents"][0, period]),
+        })
+    return rows
+
+
+def post_due_loan_payments(
+    db: Session,
+    through_date: date,
+    created_by: int,
+    company_id: int
+) -> Dict:
+    """
+    Post every unposted scheduled payment due on or before through_date, for all loans.
+    Payments are grouped into one journal entry per due date with lines aggregated per
+    chart account, and inserted in bulk.
+    """
+    loans = db.query(Loan).filter(
+        Loan.is_active == True,
+        Loan.company_id == company_id
+    ).order_by(Loan.id).all()
+    if not loans:
+        return {"journal_entries": 0, "payments": 0, "principal_total": Decimal("0.00"), "interest_total": Decimal("0.00")}
+
+    last_posted = dict(db.query(LoanPayment.loan_id, func.max(LoanPayment.period_number)).group_by(LoanPayment.loan_id).all())
+    cash_chart_accounts = dict(db.query(Account.id, Account.chart_account_id).filter(
+        Account.id.in_({loan.account_id for loan in loans})
+    ).all())
+
+    schedule = build_amortization_schedules(loans)
+    posted_through = np.array([last_posted.get(loan.id, 0) for loan in loans], dtype=np.int64)
+    period_numbers = np.arange(1, schedule["active"].shape[1] + 1)[None, :]
+    due = (
+        schedule["active"]
+        & (period_numbers > posted_through[:, None])
+        & (schedule["due_dates"] <= np.datetime64(through_date, "D"))
+    )
+
+    loan_index, period_index = np.nonzero(due)
+    if len(loan_index) == 0:
+        return {"journal_entries": 0, "payments": 0, "principal_total": Decimal("0.00"), "interest_total": Decimal("0.00")}
+
+    principal_cents = schedule["principal_cents"][loan_index, period_index]
+    interest_cents = schedule["interest_cents"][loan_index, period_index]
+    unique_dates, date_group = np.unique(schedule["due_dates"][loan_index, period_index], return_inverse=True)
+
+    liability_accounts = np.array([loan.liability_chart_account_id for loan in loans], dtype=np.int64)[loan_index]
+    interest_accounts = np.array([loan.interest_chart_account_id for loan in loans], dtype=np.int64)[loan_index]
+    cash_accounts = np.array([cash_chart_accounts[loan.account_id] for loan in loans], dtype=np.int64)[loan_index]
+
+    # Aggregate every leg per (due date, chart account, side); side 0 = debit, 1 = credit
+    legs = len(loan_index)
+    keys = np.concatenate([
+        np.stack([date_group, liability_accounts, np.zeros(legs, dtype=np.int64)], axis=1),
+        np.stack([date_group, interest_accounts, np.zeros(legs, dtype=np.int64)], axis=1),
+        np.stack([date_group, cash_accounts, np.ones(legs, dtype=np.int64)], axis=1),
+    ])
+    amounts = np.concatenate([principal_cents, interest_cents, principal_cents + interest_cents])
+    line_keys, line_group = np.unique(keys, axis=0, return_inverse=True)
+    line_cents = np.zeros(len(line_keys), dtype=np.int64)
+    np.add.at(line_cents, line_group.reshape(-1), amounts)
+
+    entries = []
+    for group, due_date in enumerate(unique_dates):
+        due_date = due_date.item()
+        lines = []
+        for (line_date_group, chart_account_id, side), cents in zip(line_keys, line_cents):
+            if line_date_group != group or cents == 0:
+                continue
+            amount_key = "debit_amount" if side == 0 else "credit_amount"
+            lines.append({
+                "chart_account_id": int(chart_account_id),
+                amount_key: from_minor(cents),
+                "description": "Loan payments"
+            })
+        entries.append({
+            "entry_date": datetime.combine(due_date, datetime.min.time()),
+            "description": f"Loan payments due {due_date.isoformat()}",
+            "reference": "loans",
+            "lines": lines
+        })
+
+    entry_ids = np.array(create_posted_journal_entries(db, entries, created_by, company_id), dtype=np.int64)
+
+    now = datetime.utcnow()
+    db.execute(insert(LoanPayment), [
+        {
+            "loan_id": loans[loan_i].id,
+            "period_number": int(period_i) + 1,
+            "due_date": unique_dates[group].item(),
+            "principal_amount": from_minor(principal),
+            "interest_amount": from_minor(interest),
+            "journal_entry_id": int(entry_ids[group]),
+            "created_at": now
+        }
+        for loan_i, period_i, group, principal, interest
+        in zip(loan_index, period_index, date_group, principal_cents, interest_cents)
+    ])
+    db.commit()
+
+    return {
+        "journal_entries": len(entry_ids),
+        "payments": len(loan_index),
+        "principal_total": from_minor(principal_cents.sum()),
+        "interest_total": from_minor(interest_cents.sum()),
+    }
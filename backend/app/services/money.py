@@ -0,0 +1,88 @@
+from sqlalchemy import BigInteger, cast, func
+from decimal import Decimal
+from typing import Dict, List, Optional
+import numpy as np
+
+# Ledger amount columns are Numeric(15, 2), so ledger arithmetic is done in hundredths
+LEDGER_EXPONENT = 2
+
+# ISO 4217 minor-unit exponents that differ from 2
+CURRENCY_EXPONENTS = {
+    "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "ISK": 0, "JPY": 0, "KMF": 0, "KRW": 0,
+    "PYG": 0, "RWF": 0, "UGX": 0, "VND": 0, "VUV": 0, "XAF": 0, "XOF": 0, "XPF": 0,
+    "BHD": 3, "IQD": 3, "JOD": 3, "KWD": 3, "LYD": 3, "OMR": 3, "TND": 3,
+}
+
+
+def currency_exponent(currency: Optional[str]) -> int:
+    """Number of decimal places of a currency's minor unit, e.g. 2 for USD, 0 for JPY"""
+    return CURRENCY_EXPONENTS.get((currency or "").upper(), 2)
+
+
+def to_minor(amount, exponent: int = LEDGER_EXPONENT) -> int:
+    """
+    Exact integer minor units of an amount (Decimal, str, int or float; None is zero).
+    Raises ValueError for amounts finer than the minor unit instead of rounding them.
+    """
+    if amount is None:
+        return 0
+    if type(amount) is int:
+        return amount * 10 ** exponent
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    minor = amount.scaleb(exponent)
+    integral = int(minor)
+    if integral != minor:
+        raise ValueError(f"Amount {amount} has more than {exponent} decimal places")
+    return integral
+
+
+def from_minor(minor: int, exponent: int = LEDGER_EXPONENT) -> Decimal:
+    """Decimal amount of integer minor units, with exactly `exponent` decimal places"""
+    return Decimal(int(minor)).scaleb(-exponent)
+
+
+def minor_units(column, exponent: int = LEDGER_EXPONENT):
+    """SQL expression reading a Numeric column as BIGINT minor units (NULL as 0)"""
+    return cast(func.round(func.coalesce(column, 0) * 10 ** exponent), BigInteger)
+
+
+def find_unbalanced(entry_index: np.ndarray, debit_minor: np.ndarray, credit_minor: np.ndarray) -> np.ndarray:
+    """
+    Positions of unbalanced entries, given each line's entry position and its debit and
+    credit in minor units (int64 arrays of equal length). Lines need not be sorted.
+    """
+    if not len(entry_index):
+        return np.empty(0, dtype=np.int64)
+    net = np.zeros(int(entry_index.max()) + 1, dtype=np.int64)
+    np.add.at(net, entry_index, debit_minor - credit_minor)
+    return np.flatnonzero(net)
+
+
+def validate_entry_lines(entries: List[Dict]) -> List[List[tuple]]:
+    """
+    Convert the lines of journal entries to (debit_minor, credit_minor) pairs and check
+    that every line has exactly one side and every entry balances. Returns the pairs
+    per entry, in input order.
+    """
+    pairs = [
+        [(to_minor(line.get("debit_amount")), to_minor(line.get("credit_amount"))) for line in entry["lines"]]
+        for entry in entries
+    ]
+    flat = np.array([pair for entry_pairs in pairs for pair in entry_pairs], dtype=np.int64).reshape(-1, 2)
+    debit_minor, credit_minor = flat[:, 0], flat[:, 1]
+
+    one_sided = (debit_minor > 0) != (credit_minor > 0)
+    if not one_sided.all() or (flat < 0).any():
+        raise ValueError("Line must have either a debit or a credit amount")
+
+    entry_index = np.repeat(np.arange(len(pairs)), [len(entry_pairs) for entry_pairs in pairs])
+    unbalanced = find_unbalanced(entry_index, debit_minor, credit_minor)
+    if len(unbalanced):
+        position = unbalanced[0]
+        lines = entry_index == position
+        raise ValueError(
+            f"Journal entry is not balanced: Debits={from_minor(debit_minor[lines].sum())}, "
+            f"Credits={from_minor(credit_minor[lines].sum())}"
+        )
+    return pairs
@@ -0,0 +1,97 @@
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import tuple_
+from datetime import date, datetime
+from typing import Optional, Tuple, Any
+import base64
+import json
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Encode the last (sort value, id) pair of a page as an opaque token"""
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, value_type: type = datetime) -> Tuple[Any, int]:
+    """Decode a cursor token back into a (sort value, id) pair"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if value_type is float:
+            sort_value = float(raw_value)
+        elif value_type is date:
+            sort_value = date.fromisoformat(raw_value)
+        else:
+            sort_value = datetime.fromisoformat(raw_value)
+        return sort_value, int(row_id)
+    except Exception:
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
+def apply_keyset(
+    query: Query,
+    sort_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    ascending: bool = False,
+    value_type: type = datetime
+) -> Query:
+    """
+    Apply seek pagination on (sort_column, id_column).
+    Uses a row-value comparison so PostgreSQL can walk the matching composite index
+    instead of scanning and discarding OFFSET rows.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, value_type)
+        key = tuple_(sort_column, id_column)
+        if ascending:
+            query = query.filter(key > tuple_(sort_value, row_id))
+        else:
+            query = query.filter(key < tuple_(sort_value, row_id))
+
+    if ascending:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    else:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+
+    # Fetch one extra row to know whether another page exists
+    return query.limit(limit + 1)
+
+
+def paginate(rows: list, limit: int, sort_attr: str, id_attr: str = "id") -> Tuple[list, Optional[str]]:
+    """Trim the look-ahead row and build the next cursor"""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_attr), getattr(last, id_attr))
+
+
+def estimate_count(db: Session, query: Query) -> Optional[int]:
+    """
+    Approximate row count of a query from planner statistics.
+    Runs EXPLAIN instead of COUNT(*), so the cost does not grow with table size.
+    Runs in a savepoint, so a failure leaves the caller's pending work in place.
+    """
+    try:
+        statement = query.order_by(None).limit(None).statement
+        compiled = statement.compile(dialect=db.get_bind().dialect)
+        with db.begin_nested():
+            result = db.connection().exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + str(compiled),
+                compiled.params
+            ).scalar()
+        if isinstance(result, str):
+            result = json.loads(result)
+        return int(result[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        print(f"Error estimating row count: {e}")
+        return None
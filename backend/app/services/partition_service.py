@@ -0,0 +1,239 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from typing import Dict, List, Optional, Tuple
+from datetime import date
+import re
+from app.core.config import settings
+
+PARTITION_INTERVALS = ("year", "month")
+
+# Range-partitioned tenant tables and their partition keys. journal_entries stays a
+# plain table: a partitioned table's primary key must include the partition key, and
+# many tables hold foreign keys to journal_entries.id.
+PARTITIONED_TABLES = {
+    "journal_entry_lines": "entry_date",
+    "transactions": "transaction_date",
+}
+
+# Partitions are kept this far ahead of today so new postings never land in the default partition
+FUTURE_PARTITION_MONTHS = 12
+
+# Representative range scans from the ledger, balance and report queries, used to check pruning
+PRUNING_CHECKS = {
+    "balance_as_of": """
+        SELECT SUM(COALESCE(l.debit_amount, 0)), SUM(COALESCE(l.credit_amount, 0))
+        FROM journal_entry_lines l
+        WHERE l.chart_account_id = 1 AND l.entry_date < :period_end
+    """,
+    "period_activity": """
+        SELECT l.chart_account_id, SUM(COALESCE(l.debit_amount, 0) - COALESCE(l.credit_amount, 0))
+        FROM journal_entry_lines l
+        WHERE l.entry_date >= :period_start AND l.entry_date < :period_end
+        GROUP BY l.chart_account_id
+    """,
+    "transaction_history": """
+        SELECT t.account_id, SUM(t.amount)
+        FROM transactions t
+        WHERE t.transaction_date >= :period_start AND t.transaction_date < :period_end
+        GROUP BY t.account_id
+    """,
+}
+
+
+def _add_months(value: date, months: int) -> date:
+    month_number = value.year * 12 + value.month - 1 + months
+    return date(month_number // 12, month_number % 12 + 1, 1)
+
+
+def period_start(value: date, interval: str) -> date:
+    """Start of the month or fiscal year containing value"""
+    if interval == "month":
+        return value.replace(day=1)
+    start_month = settings.FISCAL_YEAR_START_MONTH
+    year = value.year if value.month >= start_month else value.year - 1
+    return date(year, start_month, 1)
+
+
+def next_period(start: date, interval: str) -> date:
+    return _add_months(start, 1 if interval == "month" else 12)
+
+
+def partition_name(table: str, start: date, interval: str) -> str:
+    """e.g. journal_entry_lines_p2024_01, or journal_entry_lines_fy2024 for the fiscal year starting in 2024"""
+    if interval == "month":
+        return f"{table}_p{start.year}_{start.month:02d}"
+    return f"{table}_fy{start.year}"
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    return conn.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_partitioned_table
+            WHERE partrelid = to_regclass(:table)
+        )
+    """), {"table": table}).scalar()
+
+
+def list_partitions(conn: Connection, table: str) -> List[Tuple[str, date, date]]:
+    """(name, lower, upper) of every range partition of a table; the default partition is left out"""
+    rows = conn.execute(text("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) AS bound
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:table)
+    """), {"table": table}).all()
+    partitions = []
+    for row in rows:
+        match = re.search(r"FROM \('([0-9-]{10})[^']*'\) TO \('([0-9-]{10})", row.bound)
+        if match:
+            partitions.append((row.relname, date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def table_size(conn: Connection, table: str) -> int:
+    """Total on-disk size of a table including indexes, TOAST and all partitions"""
+    return conn.execute(text("""
+        SELECT COALESCE(SUM(pg_total_relation_size(relid)), 0)
+        FROM pg_partition_tree(to_regclass(:table))
+    """), {"table": table}).scalar()
+
+
+def ensure_partitions(conn: Connection, table: str, interval: str, start: date, end: date) -> List[str]:
+    """
+    Create the missing partitions covering [start, end).
+    Rows that already landed in the default partition for a new range are moved into it.
+    Returns the names of the partitions created.
+    """
+    column = PARTITIONED_TABLES[table]
+    default = f"{table}_default"
+    created = []
+
+    current = period_start(start, interval)
+    while current < end:
+        upper = next_period(current, interval)
+        name = partition_name(table, current, interval)
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None:
+            bounds = {"lower": current, "upper": upper}
+            stray = conn.execute(text(f"""
+                SELECT EXISTS (SELECT 1 FROM {default} WHERE {column} >= :lower AND {column} < :upper)
+            """), bounds).scalar()
+            if stray:
+                conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+                conn.execute(text(f"""
+                    WITH moved AS (
+                        DELETE FROM {default} WHERE {column} >= :lower AND {column} < :upper
+                        RETURNING *
+                    )
+                    INSERT INTO {name} SELECT * FROM moved
+                """), bounds)
+                conn.execute(text(
+                    f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ('{current.isoformat()}') TO ('{upper.isoformat()}')"
+                ))
+            else:
+                conn.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{current.isoformat()}') TO ('{upper.isoformat()}')"
+                ))
+            created.append(name)
+        current = upper
+
+    return created
+
+
+def ensure_future_partitions(conn: Connection, interval: str) -> List[str]:
+    """Roll partitions forward on every partitioned table; safe to run repeatedly"""
+    end = _add_months(date.today(), FUTURE_PARTITION_MONTHS + 1)
+    created = []
+    for table in PARTITIONED_TABLES:
+        if is_partitioned(conn, table):
+            created += ensure_partitions(conn, table, interval, date.today(), end)
+    return created
+
+
+def partition_table(conn: Connection, table: str, interval: str) -> bool:
+    """
+    Convert an existing table into a range-partitioned one in place.
+    Rows are copied into per-period partitions from the earliest date on record through
+    FUTURE_PARTITION_MONTHS ahead, plus a default partition for anything outside that range.
+    Runs in the caller's transaction. Indexes are recreated afterwards from the model
+    metadata (see upgrade_tenant_schema). Returns False if the table was already partitioned.
+    """
+    if interval not in PARTITION_INTERVALS:
+        raise ValueError(f"Unsupported partition interval: {interval}")
+    if is_partitioned(conn, table):
+        return False
+
+    column = PARTITIONED_TABLES[table]
+    old = f"{table}_unpartitioned"
+
+    conn.execute(text(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE"))
+    first_date = conn.execute(text(f"SELECT CAST(MIN({column}) AS DATE) FROM {table}")).scalar()
+    foreign_keys = conn.execute(text("""
+        SELECT conname, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE conrelid = to_regclass(:table) AND contype = 'f'
+    """), {"table": table}).all()
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}).scalar()
+
+    conn.execute(text(f"ALTER TABLE {table} RENAME TO {old}"))
+    conn.execute(text(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey"))
+
+    # The primary key of a partitioned table has to include the partition key
+    conn.execute(text(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE ({column})"
+    ))
+    conn.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, {column})"))
+    for foreign_key in foreign_keys:
+        conn.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {foreign_key.conname} {foreign_key.definition}"))
+    if sequence:
+        # Keep the id sequence alive when the old table is dropped
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id"))
+
+    conn.execute(text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"))
+    ensure_partitions(
+        conn, table, interval,
+        first_date or date.today(),
+        _add_months(date.today(), FUTURE_PARTITION_MONTHS + 1)
+    )
+
+    conn.execute(text(f"INSERT INTO {table} SELECT * FROM {old}"))
+    conn.execute(text(f"DROP TABLE {old}"))
+    return True
+
+
+def apply_partitioning(conn: Connection, interval: Optional[str] = None) -> Dict[str, bool]:
+    """Partition every table in PARTITIONED_TABLES and create future partitions"""
+    interval = interval or settings.TENANT_PARTITION_INTERVAL
+    converted = {table: partition_table(conn, table, interval) for table in PARTITIONED_TABLES}
+    ensure_future_partitions(conn, interval)
+    return converted
+
+
+def _scanned_relations(plan: Dict) -> List[str]:
+    relations = [plan["Relation Name"]] if "Relation Name" in plan else []
+    for child in plan.get("Plans", []):
+        relations += _scanned_relations(child)
+    return relations
+
+
+def check_partition_pruning(conn: Connection, period_start_date: date, period_end_date: date) -> Dict[str, Dict]:
+    """
+    EXPLAIN the representative range queries and report which partitions each one scans.
+    With pruning working, a range within one period scans a single partition.
+    """
+    params = {"period_start": period_start_date, "period_end": period_end_date}
+    report = {}
+    for name, sql in PRUNING_CHECKS.items():
+        plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+        table = "transactions" if "FROM transactions" in sql else "journal_entry_lines"
+        partitions = conn.execute(text("""
+            SELECT COUNT(*) FROM pg_inherits WHERE inhparent = to_regclass(:table)
+        """), {"table": table}).scalar()
+        report[name] = {
+            "table": table,
+            "partitions": partitions,
+            "scanned": sorted(set(_scanned_relations(plan[0]["Plan"]))),
+        }
+    return report
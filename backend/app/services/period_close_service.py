@@ -0,0 +1,140 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from decimal import Decimal
+from typing import Dict, List
+from datetime import date, datetime, time, timedelta
+from app.models.tenant.period_close import PeriodClose
+from app.services.archive_service import get_archive_horizon
+from app.services.accounting_service import (
+    create_posted_journal_entries, create_balance_snapshots,
+    get_chart_account_by_code, get_closed_through
+)
+
+RETAINED_EARNINGS_ACCOUNT_CODE = "3100"
+CURRENT_YEAR_EARNINGS_ACCOUNT_CODE = "3200"
+
+# Net debit balance through period_end of every nominal account plus Current Year Earnings.
+# Earlier closes have already zeroed nominal balances, so summing from the start of the
+# ledger leaves exactly the activity of the period being closed. Archived lines are
+# represented by the balance snapshot taken at the archive horizon.
+CLOSING_BALANCES_QUERY = text("""
+    WITH balances AS (
+        SELECT s.chart_account_id, s.total_debits - s.total_credits AS net_debit
+        FROM account_balance_snapshots s
+        WHERE s.as_of_date = :horizon
+        UNION ALL
+        SELECT l.chart_account_id, SUM(COALESCE(l.debit_amount, 0) - COALESCE(l.credit_amount, 0))
+        FROM journal_entry_lines l
+        JOIN journal_entries je ON je.id = l.journal_entry_id
+        WHERE je.is_posted
+          AND (CAST(:hot_start AS TIMESTAMP) IS NULL OR l.entry_date >= :hot_start)
+          AND l.entry_date < :period_end
+        GROUP BY l.chart_account_id
+    )
+    SELECT coa.id AS chart_account_id, SUM(b.net_debit) AS net_debit
+    FROM balances b
+    JOIN chart_of_accounts coa ON coa.id = b.chart_account_id
+    WHERE coa.account_type IN ('REVENUE', 'EXPENSE') OR coa.id = :current_earnings_id
+    GROUP BY coa.id
+""")
+
+
+def close_period(
+    db: Session,
+    period_end: date,
+    created_by: int,
+    company_id: int,
+    year_end: bool = False
+) -> Dict:
+    """
+    Close every period up to period_end in one pass.
+    Zeroes all revenue and expense accounts into Current Year Earnings with a single
+    posted journal entry built from one aggregate query, then locks the period so
+    nothing can be posted on or before period_end. With year_end, Current Year
+    Earnings is also carried into Retained Earnings in the same entry.
+    """
+    # Blocks concurrent postings until this close commits, so the balances below stay final
+    db.execute(text("LOCK TABLE period_closes IN SHARE ROW EXCLUSIVE MODE"))
+
+    closed_through = get_closed_through(db)
+    if closed_through is not None and period_end <= closed_through:
+        raise ValueError(f"Period is already closed through {closed_through.isoformat()}")
+
+    current_earnings = get_chart_account_by_code(db, company_id, CURRENT_YEAR_EARNINGS_ACCOUNT_CODE)
+    retained_earnings = get_chart_account_by_code(db, company_id, RETAINED_EARNINGS_ACCOUNT_CODE)
+
+    horizon = get_archive_horizon(db)
+    rows = db.execute(CLOSING_BALANCES_QUERY, {
+        "horizon": horizon,
+        "hot_start": datetime.combine(horizon + timedelta(days=1), time.min) if horizon else None,
+        "period_end": datetime.combine(period_end + timedelta(days=1), time.min),
+        "current_earnings_id": current_earnings.id
+    }).all()
+
+    lines: List[Dict] = []
+    net_income = Decimal("0.00")
+    earnings_balance = Decimal("0.00")  # Credit balance of Current Year Earnings before this close
+    for row in rows:
+        net_debit = Decimal(row.net_debit)
+        if row.chart_account_id == current_earnings.id:
+            earnings_balance = -net_debit
+            continue
+        if net_debit == 0:
+            continue
+        net_income -= net_debit
+        # Reverse the account's balance
+        amount_key = "credit_amount" if net_debit > 0 else "debit_amount"
+        lines.append({"chart_account_id": row.chart_account_id, amount_key: abs(net_debit), "description": "Closing entry"})
+
+    accounts_closed = len(lines)
+
+    # Current Year Earnings takes this period's net income; at year end its whole
+    # balance moves on to Retained Earnings instead
+    earnings_movements = [(current_earnings.id, net_income)]
+    if year_end:
+        earnings_movements = [
+            (current_earnings.id, -earnings_balance),
+            (retained_earnings.id, earnings_balance + net_income),
+        ]
+    for chart_account_id, credit in earnings_movements:
+        if credit == 0:
+            continue
+        amount_key = "credit_amount" if credit > 0 else "debit_amount"
+        lines.append({"chart_account_id": chart_account_id, amount_key: abs(credit), "description": "Closing entry"})
+
+    journal_entry_id = None
+    if lines:
+        journal_entry_id = create_posted_journal_entries(db, [{
+            "entry_date": datetime.combine(period_end, time.min),
+            "description": f"Closing entry for period ending {period_end.isoformat()}",
+            "reference": "period-close",
+            "lines": lines
+        }], created_by, company_id)[0]
+
+    period_close = PeriodClose(
+        period_start=closed_through + timedelta(days=1) if closed_through else None,
+        period_end=period_end,
+        net_income=net_income,
+        journal_entry_id=journal_entry_id,
+        closed_by=created_by
+    )
+    db.add(period_close)
+    db.commit()
+    db.refresh(period_close)
+
+    # Balances through a closed period can no longer change, so this snapshot is final
+    create_balance_snapshots(db, period_end)
+
+    return {
+        "period_start": period_close.period_start,
+        "period_end": period_close.period_end,
+        "net_income": period_close.net_income,
+        "journal_entry_id": journal_entry_id,
+        "accounts_closed": accounts_closed,
+        "closed_at": period_close.closed_at
+    }
+
+
+def list_period_closes(db: Session) -> List[PeriodClose]:
+    """All closed periods, latest first"""
+    return db.query(PeriodClose).order_by(PeriodClose.period_end.desc()).all()
@@ -0,0 +1,166 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, update
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from itertools import groupby
+from app.core.config import settings
+from app.models.tenant.account import Account
+from app.models.tenant.posting_queue import PostingQueueItem, PostingStatus
+from app.models.tenant.transaction import TransactionType
+from app.services.accounting_service import record_transactions, ensure_period_open
+
+QUEUED_FIELDS = ("account_id", "transaction_type", "amount", "description", "category_id", "transaction_date")
+
+
+def enqueue_postings(db: Session, transactions: List[Dict], created_by: int) -> List[int]:
+    """
+    Durably accept transactions for asynchronous posting with one multi-row insert and
+    one commit. Unknown accounts and closed periods are rejected up front; everything
+    else is checked when the worker posts. Returns the queue ids in input order.
+    """
+    if not transactions:
+        return []
+
+    account_ids = {transaction["account_id"] for transaction in transactions}
+    found = {account_id for (account_id,) in db.query(Account.id).filter(Account.id.in_(account_ids)).all()}
+    if account_ids - found:
+        raise ValueError(f"Account {min(account_ids - found)} not found")
+    ensure_period_open(db, min(transaction["transaction_date"] for transaction in transactions))
+
+    now = datetime.utcnow()
+    queue_ids = db.execute(
+        insert(PostingQueueItem).returning(PostingQueueItem.id, sort_by_parameter_order=True),
+        [
+            {
+                **{field: transaction.get(field) for field in QUEUED_FIELDS},
+                "transaction_type": TransactionType(transaction["transaction_type"]),
+                "status": PostingStatus.QUEUED,
+                "created_by": created_by,
+                "enqueued_at": now
+            }
+            for transaction in transactions
+        ]
+    ).scalars().all()
+    db.commit()
+    return list(queue_ids)
+
+
+def get_queued_posting(db: Session, queue_id: int) -> Optional[PostingQueueItem]:
+    return db.query(PostingQueueItem).filter(PostingQueueItem.id == queue_id).first()
+
+
+def _batch_ready(db: Session, batch_size: int, max_delay: timedelta) -> bool:
+    """A batch is due once it is full or its oldest item has waited max_delay"""
+    oldest = db.query(PostingQueueItem.enqueued_at).filter(
+        PostingQueueItem.status == PostingStatus.QUEUED
+    ).order_by(PostingQueueItem.id).limit(1).scalar()
+    if oldest is None:
+        return False
+    if datetime.utcnow() - oldest >= max_delay:
+        return True
+    return db.query(PostingQueueItem.id).filter(
+        PostingQueueItem.status == PostingStatus.QUEUED
+    ).limit(batch_size).count() >= batch_size
+
+
+def _claim(db: Session, batch_size: int, queue_ids: Optional[List[int]] = None) -> List[PostingQueueItem]:
+    """Lock the oldest queued items; items claimed by another worker are skipped"""
+    query = db.query(PostingQueueItem).filter(PostingQueueItem.status == PostingStatus.QUEUED)
+    if queue_ids is not None:
+        query = query.filter(PostingQueueItem.id.in_(queue_ids))
+    return query.order_by(PostingQueueItem.id).limit(batch_size).with_for_update(skip_locked=True).all()
+
+
+def _post(db: Session, items: List[PostingQueueItem], company_id: int) -> List[Optional[int]]:
+    """Post items through the bulk transaction path; journal entries are attributed per submitter"""
+    transaction_ids = {}
+    by_creator = sorted(items, key=lambda item: item.created_by)
+    for created_by, group in groupby(by_creator, key=lambda item: item.created_by):
+        group = list(group)
+        posted = record_transactions(
+            db,
+            [{field: getattr(item, field) for field in QUEUED_FIELDS} for item in group],
+            created_by,
+            company_id
+        )
+        transaction_ids.update(zip((item.id for item in group), posted))
+    return [transaction_ids[item.id] for item in items]
+
+
+def process_posting_queue(
+    db: Session,
+    company_id: int,
+    batch_size: Optional[int] = None,
+    max_delay_ms: Optional[int] = None,
+    force: bool = False
+) -> Dict:
+    """
+    Post one batch of queued transactions in a single database transaction and commit.
+    Does nothing while fewer than batch_size items are queued and the oldest has waited
+    less than max_delay_ms, unless forced. If the batch fails as a whole, its items are
+    posted one by one in savepoints so a bad item cannot hold up the rest; items that
+    still fail are marked failed with the error.
+    """
+    batch_size = batch_size or settings.POSTING_QUEUE_BATCH_SIZE
+    max_delay = timedelta(milliseconds=settings.POSTING_QUEUE_MAX_DELAY_MS if max_delay_ms is None else max_delay_ms)
+    result = {"processed": 0, "posted": 0, "duplicates": 0, "failed": 0}
+
+    if not force and not _batch_ready(db, batch_size, max_delay):
+        return result
+    items = _claim(db, batch_size)
+    if not items:
+        db.rollback()
+        return result
+
+    queue_ids = [item.id for item in items]
+    errors = {}
+    try:
+        transaction_ids = _post(db, items, company_id)
+    except Exception:
+        db.rollback()
+        items = _claim(db, batch_size, queue_ids)
+        transaction_ids = []
+        for item in items:
+            try:
+                with db.begin_nested():
+                    transaction_ids.append(_post(db, [item], company_id)[0])
+            except Exception as e:
+                transaction_ids.append(None)
+                errors[item.id] = str(e)
+
+    now = datetime.utcnow()
+    updates = []
+    for item, transaction_id in zip(items, transaction_ids):
+        if item.id in errors:
+            status = PostingStatus.FAILED
+            result["failed"] += 1
+        elif transaction_id is None:
+            status = PostingStatus.DUPLICATE
+            result["duplicates"] += 1
+        else:
+            status = PostingStatus.POSTED
+            result["posted"] += 1
+        updates.append({
+            "id": item.id,
+            "status": status,
+            "transaction_id": transaction_id,
+            "error": errors.get(item.id),
+            "processed_at": now
+        })
+    if updates:
+        db.execute(update(PostingQueueItem), updates)
+    db.commit()
+
+    result["processed"] = len(updates)
+    return result
+
+
+def drain_posting_queue(db: Session, company_id: int, batch_size: Optional[int] = None) -> Dict:
+    """Post everything currently queued, batch by batch"""
+    totals = {"processed": 0, "posted": 0, "duplicates": 0, "failed": 0}
+    while True:
+        result = process_posting_queue(db, company_id, batch_size=batch_size, force=True)
+        if not result["processed"]:
+            return totals
+        for key in totals:
+            totals[key] += result[key]
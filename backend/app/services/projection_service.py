@@ -0,0 +1,163 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+from app.core.config import settings
+from app.models.tenant.chart_of_accounts import ChartOfAccount
+from app.models.tenant.ledger_event import ProjectionCheckpoint
+from app.models.tenant.projected_balance import ProjectedBalance
+from app.services.accounting_service import get_balance_sign
+from app.services.hash_chain_service import seal_posted_entries, reset_hash_chain
+from app.services.ledger_event_service import EVENT_LINES_SQL, read_events_after, count_events_after
+from app.services.money import from_minor
+from app.services.rollup_service import apply_events_to_rollups, reset_ledger_rollups
+
+APPLY_BALANCES_QUERY = text(f"""
+    INSERT INTO projected_balances (chart_account_id, debit_minor, credit_minor, line_count, updated_at)
+    SELECT l.chart_account_id, SUM(l.debit), SUM(l.credit), SUM(l.line_count), now()
+    FROM ledger_events e
+    CROSS JOIN LATERAL {EVENT_LINES_SQL}
+    WHERE e.id = ANY(:ids)
+    GROUP BY l.chart_account_id
+    ON CONFLICT (chart_account_id) DO UPDATE
+    SET debit_minor = projected_balances.debit_minor + EXCLUDED.debit_minor,
+        credit_minor = projected_balances.credit_minor + EXCLUDED.credit_minor,
+        line_count = projected_balances.line_count + EXCLUDED.line_count,
+        updated_at = EXCLUDED.updated_at
+""")
+
+
+def apply_events_to_balances(db: Session, event_ids: List[int]):
+    db.execute(APPLY_BALANCES_QUERY, {"ids": list(event_ids)})
+
+
+def reset_projected_balances(db: Session):
+    db.execute(text("DELETE FROM projected_balances"))
+
+
+# Read models built from ledger_events: name -> (apply events by id, clear for a replay).
+# Neither function commits. A new projection only needs an entry here; it starts
+# from the beginning of the log on the next worker run.
+PROJECTIONS: Dict[str, Tuple[Callable[[Session, List[int]], None], Callable[[Session], None]]] = {
+    "ledger_rollups": (apply_events_to_rollups, reset_ledger_rollups),
+    "projected_balances": (apply_events_to_balances, reset_projected_balances),
+    "hash_chain": (seal_posted_entries, reset_hash_chain),
+}
+
+
+def _lock_checkpoint(db: Session, name: str) -> ProjectionCheckpoint:
+    """Checkpoint row of a projection, created at the start of the log and row-locked"""
+    if name not in PROJECTIONS:
+        raise ValueError(f"Unknown projection: {name}")
+    db.execute(
+        pg_insert(ProjectionCheckpoint).values(
+            name=name, xact_id=0, event_id=0, updated_at=datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=["name"])
+    )
+    return db.query(ProjectionCheckpoint).filter(
+        ProjectionCheckpoint.name == name
+    ).with_for_update().one()
+
+
+def _advance(db: Session, checkpoint: ProjectionCheckpoint, batch_size: int) -> int:
+    """Apply the next batch of events after the checkpoint and move it; does not commit"""
+    events = read_events_after(db, checkpoint.xact_id, checkpoint.event_id, batch_size)
+    if not events:
+        return 0
+    apply, _ = PROJECTIONS[checkpoint.name]
+    apply(db, [event.id for event in events])
+    checkpoint.xact_id = events[-1].xact_id
+    checkpoint.event_id = events[-1].id
+    return len(events)
+
+
+def run_projection(db: Session, name: str, batch_size: Optional[int] = None) -> int:
+    """
+    Bring a projection up to date with the log, committing each batch together with
+    its checkpoint. Concurrent runs of the same projection wait on the checkpoint lock.
+    Returns the number of events applied.
+    """
+    batch_size = batch_size or settings.PROJECTION_BATCH_SIZE
+    applied = 0
+    while True:
+        try:
+            batch = _advance(db, _lock_checkpoint(db, name), batch_size)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        applied += batch
+        if batch < batch_size:
+            return applied
+
+
+def run_projections(db: Session, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Bring every projection up to date; returns events applied per projection"""
+    return {name: run_projection(db, name, batch_size) for name in PROJECTIONS}
+
+
+def rebuild_projection(db: Session, name: str, batch_size: Optional[int] = None) -> int:
+    """
+    Clear a projection and replay the whole log into it in one transaction, so readers
+    see the old state until the rebuild commits. Returns the number of events applied.
+    """
+    batch_size = batch_size or settings.PROJECTION_BATCH_SIZE
+    try:
+        checkpoint = _lock_checkpoint(db, name)
+        _, reset = PROJECTIONS[name]
+        reset(db)
+        checkpoint.xact_id = 0
+        checkpoint.event_id = 0
+        applied = 0
+        while True:
+            batch = _advance(db, checkpoint, batch_size)
+            applied += batch
+            if batch < batch_size:
+                break
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return applied
+
+
+def get_projection_status(db: Session) -> List[Dict]:
+    """Checkpoint and number of events not yet applied, per projection"""
+    checkpoints = {
+        checkpoint.name: checkpoint
+        for checkpoint in db.query(ProjectionCheckpoint).all()
+    }
+    status = []
+    for name in PROJECTIONS:
+        checkpoint = checkpoints.get(name)
+        xact_id = checkpoint.xact_id if checkpoint else 0
+        event_id = checkpoint.event_id if checkpoint else 0
+        status.append({
+            "name": name,
+            "event_id": event_id,
+            "pending_events": count_events_after(db, xact_id, event_id),
+            "updated_at": checkpoint.updated_at if checkpoint else None
+        })
+    return status
+
+
+def get_projected_balances(db: Session) -> List[Dict]:
+    """All-time balance per chart account from the projected_balances read model"""
+    rows = db.query(ProjectedBalance, ChartOfAccount).join(
+        ChartOfAccount, ChartOfAccount.id == ProjectedBalance.chart_account_id
+    ).order_by(ChartOfAccount.account_code).all()
+    return [
+        {
+            "chart_account_id": chart_account.id,
+            "account_code": chart_account.account_code,
+            "account_name": chart_account.account_name,
+            "total_debits": from_minor(balance.debit_minor),
+            "total_credits": from_minor(balance.credit_minor),
+            "balance": from_minor(
+                get_balance_sign(chart_account.account_type) * (balance.debit_minor - balance.credit_minor)
+            ),
+            "line_count": balance.line_count
+        }
+        for balance, chart_account in rows
+    ]
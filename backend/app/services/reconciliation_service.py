@@ -0,0 +1,302 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text, insert
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import re
+import numpy as np
+from app.models.tenant.account import Account
+from app.models.tenant.reconciliation import BankStatementLine, ReconciliationLink
+from app.services.money import LEDGER_EXPONENT
+
+EPOCH = date(1970, 1, 1)
+
+# Fuzzy score = DESCRIPTION_WEIGHT * description similarity + (1 - DESCRIPTION_WEIGHT) * date proximity
+DESCRIPTION_WEIGHT = 0.5
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+UNMATCHED_STATEMENT_LINES_QUERY = text(f"""
+    SELECT s.id, s.account_id,
+           s.statement_date - DATE '1970-01-01' AS day,
+           CAST(ROUND(s.amount * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS cents,
+           s.description
+    FROM bank_statement_lines s
+    WHERE (CAST(:account_id AS INTEGER) IS NULL OR s.account_id = :account_id)
+      AND NOT EXISTS (SELECT 1 FROM reconciliation_links r WHERE r.statement_line_id = s.id)
+    ORDER BY s.id
+""")
+
+# Transactions are signed like statement lines: deposits in, withdrawals out
+CANDIDATE_TRANSACTIONS_QUERY = text(f"""
+    SELECT t.id, t.account_id,
+           t.transaction_date - DATE '1970-01-01' AS day,
+           CASE t.transaction_type
+               WHEN 'DEPOSIT' THEN 1
+               WHEN 'WITHDRAWAL' THEN -1
+               ELSE 0
+           END * CAST(ROUND(t.amount * {10 ** LEDGER_EXPONENT}) AS BIGINT) AS cents,
+           t.description
+    FROM transactions t
+    WHERE t.account_id = ANY(:account_ids)
+      AND t.transaction_date >= :date_from
+      AND t.transaction_date <= :date_to
+      AND NOT EXISTS (SELECT 1 FROM reconciliation_links r WHERE r.transaction_id = t.id)
+    ORDER BY t.id
+""")
+
+INSERT_LINKS_QUERY = text("""
+    INSERT INTO reconciliation_links (statement_line_id, transaction_id, match_type, score, created_by, created_at)
+    SELECT m.statement_line_id, m.transaction_id, CAST(m.match_type AS matchtype), m.score, :created_by, now()
+    FROM unnest(
+        CAST(:statement_line_ids AS INTEGER[]),
+        CAST(:transaction_ids AS INTEGER[]),
+        CAST(:match_types AS VARCHAR[]),
+        CAST(:scores AS NUMERIC[])
+    ) AS m(statement_line_id, transaction_id, match_type, score)
+    ON CONFLICT DO NOTHING
+""")
+
+
+def import_statement_lines(db: Session, account_id: int, lines: List[Dict], imported_by: int) -> int:
+    """Bulk-insert statement lines for an account. Returns the number of lines imported."""
+    if not db.query(Account.id).filter(Account.id == account_id).first():
+        raise ValueError(f"Account {account_id} not found")
+    if not lines:
+        return 0
+
+    now = datetime.utcnow()
+    db.execute(insert(BankStatementLine), [
+        {
+            "account_id": account_id,
+            "statement_date": line["statement_date"],
+            "amount": line["amount"],
+            "description": line["description"],
+            "reference": line.get("reference"),
+            "imported_by": imported_by,
+            "created_at": now
+        }
+        for line in lines
+    ])
+    db.commit()
+    return len(lines)
+
+
+def list_statement_lines(
+    db: Session,
+    account_id: int,
+    limit: int,
+    after_id: Optional[int] = None,
+    reconciled: Optional[bool] = None
+) -> List[Dict]:
+    """Statement lines of an account with their reconciliation link, paginated by id"""
+    query = db.query(BankStatementLine, ReconciliationLink).outerjoin(
+        ReconciliationLink, ReconciliationLink.statement_line_id == BankStatementLine.id
+    ).filter(BankStatementLine.account_id == account_id)
+    if after_id:
+        query = query.filter(BankStatementLine.id > after_id)
+    if reconciled is not None:
+        query = query.filter(ReconciliationLink.id.isnot(None) if reconciled else ReconciliationLink.id.is_(None))
+
+    return [
+        {
+            "id": line.id,
+            "account_id": line.account_id,
+            "statement_date": line.statement_date,
+            "amount": line.amount,
+            "description": line.description,
+            "reference": line.reference,
+            "transaction_id": link.transaction_id if link else None,
+            "match_type": link.match_type.value if link else None,
+            "score": link.score if link else None,
+        }
+        for line, link in query.order_by(BankStatementLine.id).limit(limit).all()
+    ]
+
+
+def _as_arrays(rows: List) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[str]]:
+    """ids, account ids, day numbers and cents as int64 arrays, plus descriptions"""
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty, []
+    ids, account_ids, days, cents, descriptions = zip(*rows)
+    return (
+        np.array(ids, dtype=np.int64),
+        np.array(account_ids, dtype=np.int64),
+        np.array(days, dtype=np.int64),
+        np.array(cents, dtype=np.int64),
+        list(descriptions)
+    )
+
+
+def _occurrence_rank(keys: np.ndarray) -> np.ndarray:
+    """0 for the first occurrence of each key, 1 for the second and so on, in input order"""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    positions = np.arange(len(keys))
+    starts = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]] if len(keys) else np.zeros(0, dtype=bool)
+    group_start = np.maximum.accumulate(np.where(starts, positions, 0)) if len(keys) else positions
+    rank = np.empty(len(keys), dtype=np.int64)
+    rank[order] = positions - group_start
+    return rank
+
+
+def match_exact(
+    statement_keys: np.ndarray,
+    transaction_keys: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One-to-one pairing of rows with identical (account, amount, day) keys.
+    The n-th statement line with a key pairs with the n-th transaction with that key,
+    so the whole pass is a couple of sorts. Returns matched (statement, transaction) indexes.
+    """
+    count = len(statement_keys)
+    if count == 0 or len(transaction_keys) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+
+    _, key_ids = np.unique(np.concatenate([statement_keys, transaction_keys]), axis=0, return_inverse=True)
+    key_ids = key_ids.reshape(-1)
+    statement_ids, transaction_ids = key_ids[:count], key_ids[count:]
+
+    stride = max(count, len(transaction_keys)) + 1
+    statement_codes = statement_ids * stride + _occurrence_rank(statement_ids)
+    transaction_codes = transaction_ids * stride + _occurrence_rank(transaction_ids)
+    _, statement_index, transaction_index = np.intersect1d(
+        statement_codes, transaction_codes, assume_unique=True, return_indices=True
+    )
+    return statement_index, transaction_index
+
+
+def candidate_pairs(
+    statement_buckets: np.ndarray,
+    statement_days: np.ndarray,
+    transaction_buckets: np.ndarray,
+    transaction_days: np.ndarray,
+    window_days: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    All (statement, transaction) index pairs in the same bucket with dates at most
+    window_days apart. Transactions are sorted once on (bucket, day); each statement
+    line finds its candidate range with two binary searches, so the work is
+    proportional to the number of candidates rather than n * m.
+    """
+    if len(statement_buckets) == 0 or len(transaction_buckets) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+
+    first_day = min(statement_days.min(), transaction_days.min()) - window_days
+    span = max(statement_days.max(), transaction_days.max()) - first_day + window_days + 1
+    order = np.lexsort((transaction_days, transaction_buckets))
+    sorted_codes = transaction_buckets[order] * span + (transaction_days[order] - first_day)
+
+    statement_codes = statement_buckets * span + (statement_days - first_day)
+    low = np.searchsorted(sorted_codes, statement_codes - window_days, side="left")
+    high = np.searchsorted(sorted_codes, statement_codes + window_days, side="right")
+
+    counts = high - low
+    total = int(counts.sum())
+    statement_index = np.repeat(np.arange(len(statement_buckets)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    transaction_index = order[np.repeat(low, counts) + offsets]
+    return statement_index, transaction_index
+
+
+def _tokens(description: str) -> frozenset:
+    return frozenset(TOKEN_PATTERN.findall((description or "").lower()))
+
+
+def _similarity(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of description tokens"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def reconcile(
+    db: Session,
+    created_by: int,
+    account_id: Optional[int] = None,
+    window_days: int = 3,
+    min_score: float = 0.4
+) -> Dict:
+    """
+    Match unreconciled statement lines to unreconciled transactions and persist the links.
+    Exact matches (same account, amount and date) are paired first in one vectorized pass.
+    The rest are matched within the same account and amount over a date window, scored
+    by description similarity and date proximity, and assigned greedily by score.
+    """
+    statement_rows = db.execute(UNMATCHED_STATEMENT_LINES_QUERY, {"account_id": account_id}).all()
+    s_ids, s_accounts, s_days, s_cents, s_descriptions = _as_arrays(statement_rows)
+    if len(s_ids) == 0:
+        return {"exact_matches": 0, "fuzzy_matches": 0, "unmatched_statement_lines": 0}
+
+    transaction_rows = db.execute(CANDIDATE_TRANSACTIONS_QUERY, {
+        "account_ids": sorted({int(a) for a in s_accounts}),
+        "date_from": EPOCH + timedelta(days=int(s_days.min()) - window_days),
+        "date_to": EPOCH + timedelta(days=int(s_days.max()) + window_days)
+    }).all()
+    t_ids, t_accounts, t_days, t_cents, t_descriptions = _as_arrays(transaction_rows)
+
+    # Exact pass
+    exact_s, exact_t = match_exact(
+        np.stack([s_accounts, s_cents, s_days], axis=1),
+        np.stack([t_accounts, t_cents, t_days], axis=1)
+    )
+    s_open = np.ones(len(s_ids), dtype=bool)
+    t_open = np.ones(len(t_ids), dtype=bool)
+    s_open[exact_s] = False
+    t_open[exact_t] = False
+
+    # Fuzzy pass over what is left, bucketed by (account, amount)
+    rest_s = np.nonzero(s_open)[0]
+    rest_t = np.nonzero(t_open)[0]
+    fuzzy_s: List[int] = []
+    fuzzy_t: List[int] = []
+    fuzzy_scores: List[float] = []
+    if len(rest_s) and len(rest_t):
+        bucket_keys = np.concatenate([
+            np.stack([s_accounts[rest_s], s_cents[rest_s]], axis=1),
+            np.stack([t_accounts[rest_t], t_cents[rest_t]], axis=1)
+        ])
+        _, buckets = np.unique(bucket_keys, axis=0, return_inverse=True)
+        buckets = buckets.reshape(-1)
+        pair_s, pair_t = candidate_pairs(
+            buckets[:len(rest_s)], s_days[rest_s], buckets[len(rest_s):], t_days[rest_t], window_days
+        )
+        pair_s, pair_t = rest_s[pair_s], rest_t[pair_t]
+
+        if len(pair_s):
+            s_tokens = {i: _tokens(s_descriptions[i]) for i in np.unique(pair_s).tolist()}
+            t_tokens = {j: _tokens(t_descriptions[j]) for j in np.unique(pair_t).tolist()}
+            similarity = np.fromiter(
+                (_similarity(s_tokens[i], t_tokens[j]) for i, j in zip(pair_s.tolist(), pair_t.tolist())),
+                dtype=np.float64, count=len(pair_s)
+            )
+            proximity = 1.0 - np.abs(s_days[pair_s] - t_days[pair_t]) / (window_days + 1)
+            scores = DESCRIPTION_WEIGHT * similarity + (1 - DESCRIPTION_WEIGHT) * proximity
+
+            keep = scores >= min_score
+            pair_s, pair_t, scores = pair_s[keep], pair_t[keep], scores[keep]
+            for k in np.argsort(-scores, kind="stable").tolist():
+                i, j = pair_s[k], pair_t[k]
+                if s_open[i] and t_open[j]:
+                    s_open[i] = False
+                    t_open[j] = False
+                    fuzzy_s.append(i)
+                    fuzzy_t.append(j)
+                    fuzzy_scores.append(round(float(scores[k]), 4))
+
+    db.execute(INSERT_LINKS_QUERY, {
+        "statement_line_ids": s_ids[exact_s].tolist() + s_ids[fuzzy_s].tolist(),
+        "transaction_ids": t_ids[exact_t].tolist() + t_ids[fuzzy_t].tolist(),
+        "match_types": ["EXACT"] * len(exact_s) + ["FUZZY"] * len(fuzzy_s),  # Enum columns store member names
+        "scores": [1.0] * len(exact_s) + fuzzy_scores,
+        "created_by": created_by
+    })
+    db.commit()
+
+    return {
+        "exact_matches": int(len(exact_s)),
+        "fuzzy_matches": len(fuzzy_s),
+        "unmatched_statement_lines": int(s_open.sum())
+    }
@@ -0,0 +1,293 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, update
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import numpy as np
+from app.models.tenant.recurring_transaction import RecurringTransaction, RecurringOccurrence, RecurrenceFrequency
+from app.models.tenant.transaction import TransactionType
+from app.models.tenant.account import Account
+from app.models.tenant.chart_of_accounts import ChartOfAccount
+from app.services.accounting_service import record_transactions, get_chart_account_by_code
+
+RRULE_FREQUENCIES = {frequency.name: frequency for frequency in RecurrenceFrequency}
+RRULE_WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# Schedules stepping by months (the rest step by days)
+MONTH_BASED = (RecurrenceFrequency.MONTHLY, RecurrenceFrequency.YEARLY)
+# Length of one period: days for daily/weekly schedules, months for monthly/yearly ones
+PERIOD_LENGTHS = {
+    RecurrenceFrequency.DAILY: 1,
+    RecurrenceFrequency.WEEKLY: 7,
+    RecurrenceFrequency.MONTHLY: 1,
+    RecurrenceFrequency.YEARLY: 12,
+}
+
+
+def parse_rrule(rule: str) -> Dict:
+    """
+    Schedule fields from an RRULE such as "FREQ=MONTHLY;BYMONTHDAY=1;COUNT=12".
+    Supports FREQ, INTERVAL, BYDAY (a single weekday, weekly only), BYMONTHDAY (a single
+    day), COUNT and UNTIL (YYYYMMDD).
+    """
+    rule = rule.strip()
+    if rule.upper().startswith("RRULE:"):
+        rule = rule[len("RRULE:"):]
+    parts = {}
+    for part in filter(None, rule.split(";")):
+        key, _, value = part.partition("=")
+        parts[key.strip().upper()] = value.strip().upper()
+
+    unsupported = parts.keys() - {"FREQ", "INTERVAL", "BYDAY", "BYMONTHDAY", "COUNT", "UNTIL"}
+    if unsupported:
+        raise ValueError(f"Unsupported RRULE part: {min(unsupported)}")
+    if parts.get("FREQ") not in RRULE_FREQUENCIES:
+        raise ValueError(f"Unsupported RRULE FREQ: {parts.get('FREQ')}")
+    if "BYDAY" in parts and parts["BYDAY"] not in RRULE_WEEKDAYS:
+        raise ValueError(f"Unsupported RRULE BYDAY: {parts['BYDAY']}")
+
+    try:
+        return {
+            "frequency": RRULE_FREQUENCIES[parts["FREQ"]],
+            "interval": int(parts.get("INTERVAL", 1)),
+            "by_weekday": RRULE_WEEKDAYS.index(parts["BYDAY"]) if "BYDAY" in parts else None,
+            "by_month_day": int(parts["BYMONTHDAY"]) if "BYMONTHDAY" in parts else None,
+            "occurrence_limit": int(parts["COUNT"]) if "COUNT" in parts else None,
+            "until_date": datetime.strptime(parts["UNTIL"][:8], "%Y%m%d").date() if "UNTIL" in parts else None,
+        }
+    except ValueError:
+        raise ValueError(f"Invalid RRULE: {rule}")
+
+
+def create_recurring_transaction(db: Session, company_id: int, data: Dict) -> RecurringTransaction:
+    """
+    Create a recurring transaction template. The schedule is given either as fields or as
+    an `rrule` string, which takes precedence; the counter account either by id or by
+    `counter_account_code` (e.g. "5300" for rent, "5200" for salaries).
+    """
+    rule = data.pop("rrule", None)
+    if rule:
+        data.update(parse_rrule(rule))
+    counter_account_code = data.pop("counter_account_code", None)
+    if counter_account_code and not data.get("counter_chart_account_id"):
+        data["counter_chart_account_id"] = get_chart_account_by_code(db, company_id, counter_account_code).id
+
+    frequency = data.get("frequency")
+    if frequency is None:
+        raise ValueError("A frequency or rrule is required")
+    if data["transaction_type"] not in (TransactionType.DEPOSIT, TransactionType.WITHDRAWAL):
+        raise ValueError("Only deposits and withdrawals can recur")
+    if data["interval"] < 1:
+        raise ValueError("Interval must be at least 1")
+    if data.get("by_weekday") is not None and frequency != RecurrenceFrequency.WEEKLY:
+        raise ValueError("A weekday applies to weekly schedules only")
+    if data.get("by_month_day") is not None and frequency not in MONTH_BASED:
+        raise ValueError("A day of month applies to monthly and yearly schedules only")
+    if data.get("until_date") and data["until_date"] < data["start_date"]:
+        raise ValueError("until_date is before start_date")
+
+    if not db.query(Account.id).filter(Account.id == data["account_id"]).first():
+        raise ValueError(f"Account {data['account_id']} not found")
+    if data.get("counter_chart_account_id") and not db.query(ChartOfAccount.id).filter(
+        ChartOfAccount.id == data["counter_chart_account_id"]
+    ).first():
+        raise ValueError(f"Chart account {data['counter_chart_account_id']} not found")
+
+    template = RecurringTransaction(company_id=company_id, **data)
+    db.add(template)
+    db.commit()
+    db.refresh(template)
+    return template
+
+
+def _first_occurrence(template: RecurringTransaction) -> date:
+    """
+    First date on or after start_date matching the schedule. Month-based schedules
+    that miss their day in the start month begin one period later.
+    """
+    start = template.start_date
+    if template.frequency == RecurrenceFrequency.WEEKLY and template.by_weekday is not None:
+        return start + timedelta(days=(template.by_weekday - start.weekday()) % 7)
+    if template.frequency in MONTH_BASED and template.by_month_day is not None:
+        first = _month_days(
+            np.array([start], dtype="datetime64[M]"), np.array([template.by_month_day])
+        )[0].item()
+        if first < start:
+            months = template.interval * PERIOD_LENGTHS[template.frequency]
+            first = _month_days(
+                np.array([start], dtype="datetime64[M]") + months, np.array([template.by_month_day])
+            )[0].item()
+        return first
+    return start
+
+
+def _month_days(months: np.ndarray, month_days: np.ndarray) -> np.ndarray:
+    """Day month_days (1-based, clipped to month end) of each datetime64[M] month"""
+    month_lengths = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+    return months.astype("datetime64[D]") + (np.minimum(month_days, month_lengths) - 1)
+
+
+def compute_due_occurrences(
+    templates: List[RecurringTransaction],
+    through_date: date,
+    limit: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every unposted occurrence on or before through_date, for all templates at once,
+    computed on a (templates x max due) matrix. Occurrence k of a template falls k
+    periods after its first occurrence; month-based schedules keep their day of month,
+    clipped to month end. With limit, at most that many per template.
+    Returns (template index, 1-based occurrence number, date) arrays, ordered by date.
+    """
+    empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype="datetime64[D]"))
+    if not templates:
+        return empty
+
+    first = np.array([_first_occurrence(template) for template in templates], dtype="datetime64[D]")
+    posted = np.array([template.occurrences_posted or 0 for template in templates], dtype=np.int64)
+    month_based = np.array([template.frequency in MONTH_BASED for template in templates])
+    step = np.array([
+        template.interval * PERIOD_LENGTHS[template.frequency] for template in templates
+    ], dtype=np.int64)
+    end = np.array([
+        min(template.until_date, through_date) if template.until_date else through_date
+        for template in templates
+    ], dtype="datetime64[D]")
+    occurrence_limit = np.array([
+        template.occurrence_limit if template.occurrence_limit else np.iinfo(np.int64).max
+        for template in templates
+    ], dtype=np.int64)
+    month_days = np.array([
+        template.by_month_day or template.start_date.day for template in templates
+    ], dtype=np.int64)
+
+    # Occurrences up to `end`, counted from the first; for month-based schedules this may
+    # count one too many (the day falls after `end` in its month), which the date mask drops
+    first_months = first.astype("datetime64[M]")
+    elapsed = np.where(
+        month_based,
+        (end.astype("datetime64[M]") - first_months).astype(np.int64),
+        (end - first).astype(np.int64)
+    )
+    scheduled = np.where(first <= end, elapsed // step + 1, 0)
+    due_counts = np.clip(np.minimum(scheduled, occurrence_limit) - posted, 0, None)
+    if limit is not None:
+        due_counts = np.minimum(due_counts, limit)
+    width = int(due_counts.max())
+    if width == 0:
+        return empty
+
+    offsets = posted[:, None] + np.arange(width)[None, :]
+    day_dates = first[:, None] + offsets * step[:, None]
+    month_dates = _month_days(
+        first_months[:, None] + offsets * np.where(month_based, step, 0)[:, None],
+        month_days[:, None]
+    )
+    dates = np.where(month_based[:, None], month_dates, day_dates)
+    due = (np.arange(width)[None, :] < due_counts[:, None]) & (dates <= end[:, None])
+
+    template_index, column = np.nonzero(due)
+    occurrence_dates = dates[template_index, column]
+    order = np.lexsort((template_index, occurrence_dates))
+    return template_index[order], offsets[template_index, column][order] + 1, occurrence_dates[order]
+
+
+def get_upcoming_occurrences(template: RecurringTransaction, through_date: date, limit: int = 100) -> List[Dict]:
+    """Unposted occurrences of one template through a date, without posting them"""
+    _, numbers, dates = compute_due_occurrences([template], through_date, limit)
+    return [
+        {"occurrence_number": int(number), "occurrence_date": occurrence_date.item()}
+        for number, occurrence_date in zip(numbers, dates)
+    ]
+
+
+def post_due_recurring_transactions(
+    db: Session,
+    through_date: date,
+    created_by: int,
+    company_id: int
+) -> Dict:
+    """
+    Materialize every occurrence due on or before through_date, for all active templates,
+    as one batch through record_transactions, and commit. Templates are row-locked and
+    their occurrences_posted advanced in the same transaction, so catching up after
+    downtime posts each missed occurrence exactly once and a rerun posts nothing.
+    Occurrences whose content already exists (e.g. entered by hand) are recorded
+    without a transaction.
+    """
+    summary = {
+        "templates": 0,
+        "occurrences": 0,
+        "transactions": 0,
+        "duplicates": 0,
+        "deposit_total": Decimal("0.00"),
+        "withdrawal_total": Decimal("0.00"),
+        "first_date": None,
+        "last_date": None,
+    }
+    templates = db.query(RecurringTransaction).filter(
+        RecurringTransaction.is_active == True,
+        RecurringTransaction.company_id == company_id
+    ).order_by(RecurringTransaction.id).with_for_update().all()
+
+    template_index, numbers, dates = compute_due_occurrences(templates, through_date)
+    if len(template_index) == 0:
+        db.rollback()
+        return summary
+
+    occurrences = [
+        (templates[index], int(number), occurrence_date.item())
+        for index, number, occurrence_date in zip(template_index, numbers, dates)
+    ]
+    transaction_ids = record_transactions(db, [
+        {
+            "account_id": template.account_id,
+            "transaction_type": template.transaction_type,
+            "amount": template.amount,
+            "description": template.description,
+            "category_id": template.category_id,
+            "counter_chart_account_id": template.counter_chart_account_id,
+            "transaction_date": occurrence_date
+        }
+        for template, _, occurrence_date in occurrences
+    ], created_by, company_id)
+
+    now = datetime.utcnow()
+    db.execute(insert(RecurringOccurrence), [
+        {
+            "recurring_transaction_id": template.id,
+            "occurrence_number": number,
+            "occurrence_date": occurrence_date,
+            "transaction_id": transaction_id,
+            "created_at": now
+        }
+        for (template, number, occurrence_date), transaction_id in zip(occurrences, transaction_ids)
+    ])
+
+    # Occurrences are ordered by date, so the last one seen per template is its latest
+    advanced = {}
+    for template, number, occurrence_date in occurrences:
+        advanced[template.id] = {
+            "id": template.id,
+            "occurrences_posted": number,
+            "last_posted_date": occurrence_date,
+            "updated_at": now
+        }
+    for (template, _, _), transaction_id in zip(occurrences, transaction_ids):
+        if transaction_id is None:
+            summary["duplicates"] += 1
+            continue
+        summary["transactions"] += 1
+        if template.transaction_type == TransactionType.DEPOSIT:
+            summary["deposit_total"] += template.amount
+        else:
+            summary["withdrawal_total"] += template.amount
+    summary.update({
+        "templates": len(advanced),
+        "occurrences": len(occurrences),
+        "first_date": occurrences[0][2],
+        "last_date": occurrences[-1][2],
+    })
+    db.execute(update(RecurringTransaction), list(advanced.values()))
+    db.commit()
+    return summary
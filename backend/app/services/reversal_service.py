@@ -0,0 +1,163 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from decimal import Decimal
+from typing import Dict, List, Optional
+from datetime import date, datetime, time, timedelta
+from app.services.accounting_service import (
+    ENTRY_NUMBER_SEQUENCE, entry_number_sql, ensure_period_open, post_journal_entries
+)
+
+# Posted, non-reversal entries matching the filters, row-locked so two reversals of the
+# same entry cannot race
+MATCH_ENTRIES_QUERY = text("""
+    SELECT je.id
+    FROM journal_entries je
+    WHERE je.is_posted
+      AND je.reversal_of_id IS NULL
+      AND (CAST(:entry_ids AS INTEGER[]) IS NULL OR je.id = ANY(:entry_ids))
+      AND (CAST(:date_from AS TIMESTAMP) IS NULL OR je.entry_date >= :date_from)
+      AND (CAST(:date_until AS TIMESTAMP) IS NULL OR je.entry_date < :date_until)
+      AND (CAST(:reference AS TEXT) IS NULL OR je.reference = :reference)
+      AND (CAST(:description AS TEXT) IS NULL OR je.description ILIKE :description)
+      AND (CAST(:created_by AS INTEGER) IS NULL OR je.created_by = :created_by)
+    ORDER BY je.id
+    FOR UPDATE OF je
+""")
+
+# Checked in a statement of its own after the lock is held: its fresh snapshot sees a
+# reversal committed by a concurrent run the lock waited for, which the locking
+# statement's subqueries would not. Entries whose lines have been archived cannot be mirrored.
+ENTRY_STATUS_QUERY = text("""
+    SELECT je.id,
+           EXISTS (SELECT 1 FROM journal_entries r WHERE r.reversal_of_id = je.id) AS reversed,
+           NOT EXISTS (SELECT 1 FROM journal_entry_lines l WHERE l.journal_entry_id = je.id) AS archived
+    FROM journal_entries je
+    WHERE je.id = ANY(:ids)
+    ORDER BY je.id
+""")
+
+TARGET_TOTALS_QUERY = text("""
+    SELECT COUNT(*) AS line_count, COALESCE(SUM(debit_amount), 0) AS total_amount
+    FROM journal_entry_lines
+    WHERE journal_entry_id = ANY(:ids)
+""")
+
+# Entry numbers are drawn from the sequence in the subquery, one block per statement
+INSERT_REVERSALS_QUERY = text(f"""
+    INSERT INTO journal_entries
+        (entry_number, entry_date, description, reference, created_by, company_id,
+         is_posted, reversal_of_id, created_at, updated_at)
+    SELECT {entry_number_sql("je.company_id", "je.number")},
+           :reversal_date,
+           'Reversal of ' || je.entry_number || COALESCE(': ' || CAST(:reason AS TEXT), ''),
+           je.reference,
+           :created_by,
+           je.company_id,
+           false,
+           je.id,
+           now(),
+           now()
+    FROM (
+        SELECT id, entry_number, reference, company_id,
+               CAST(nextval('{ENTRY_NUMBER_SEQUENCE}') AS TEXT) AS number
+        FROM journal_entries
+        WHERE id = ANY(:ids)
+        ORDER BY id
+    ) je
+    RETURNING id, reversal_of_id, entry_number
+""")
+
+# Mirrored lines: debit and credit swapped
+INSERT_REVERSAL_LINES_QUERY = text("""
+    INSERT INTO journal_entry_lines
+        (journal_entry_id, chart_account_id, debit_amount, credit_amount,
+         description, reference, entry_date, created_at, updated_at)
+    SELECT r.id, l.chart_account_id, l.credit_amount, l.debit_amount,
+           l.description, l.reference, r.entry_date, now(), now()
+    FROM journal_entries r
+    JOIN journal_entry_lines l ON l.journal_entry_id = r.reversal_of_id
+    WHERE r.id = ANY(:ids)
+""")
+
+ENTRY_CATEGORIES_QUERY = text("""
+    SELECT journal_entry_id, category_id FROM ledger_events
+    WHERE event_type = 'entry_posted' AND journal_entry_id = ANY(:ids)
+""")
+
+
+def reverse_journal_entries(
+    db: Session,
+    created_by: int,
+    entry_ids: Optional[List[int]] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    reference: Optional[str] = None,
+    description: Optional[str] = None,
+    entered_by: Optional[int] = None,
+    reversal_date: Optional[date] = None,
+    reason: Optional[str] = None,
+    dry_run: bool = False
+) -> Dict:
+    """
+    Reverse every posted entry matching the filters with a mirrored entry dated
+    reversal_date (default today), posted in the same transaction. Entries and lines are
+    copied set-based with INSERT ... SELECT; nothing is loaded as ORM objects.
+    `description` is an ILIKE pattern; `entered_by` filters on the original creator.
+    Entries already reversed, reversal entries and entries with archived lines are
+    skipped. With dry_run, only the summary is computed. Commits unless dry_run.
+    """
+    if entry_ids is None and date_from is None and date_to is None and reference is None \
+            and description is None and entered_by is None:
+        raise ValueError("At least one filter is required")
+    reversal_date = reversal_date or date.today()
+
+    try:
+        ensure_period_open(db, reversal_date)
+        locked = db.execute(MATCH_ENTRIES_QUERY, {
+            "entry_ids": entry_ids,
+            "date_from": datetime.combine(date_from, time.min) if date_from else None,
+            "date_until": datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None,
+            "reference": reference,
+            "description": description,
+            "created_by": entered_by
+        }).all()
+        matched = db.execute(ENTRY_STATUS_QUERY, {"ids": [row.id for row in locked]}).all()
+        targets = [row.id for row in matched if not row.reversed and not row.archived]
+        totals = db.execute(TARGET_TOTALS_QUERY, {"ids": targets}).one()
+
+        summary = {
+            "matched": len(matched),
+            "already_reversed": sum(1 for row in matched if row.reversed),
+            "archived": sum(1 for row in matched if row.archived and not row.reversed),
+            "reversed": len(targets),
+            "line_count": totals.line_count,
+            "total_amount": Decimal(totals.total_amount),
+            "reversal_date": reversal_date,
+            "first_entry_number": None,
+            "last_entry_number": None,
+            "dry_run": dry_run
+        }
+        if dry_run or not targets:
+            db.rollback()
+            return summary
+
+        reversals = sorted(db.execute(INSERT_REVERSALS_QUERY, {
+            "ids": targets,
+            "reversal_date": datetime.combine(reversal_date, time.min),
+            "reason": reason,
+            "created_by": created_by
+        }).all())
+        reversal_ids = [row.id for row in reversals]
+        db.execute(INSERT_REVERSAL_LINES_QUERY, {"ids": reversal_ids})
+
+        # Reversals land in the same rollup categories as the entries they offset
+        categories = dict(db.execute(ENTRY_CATEGORIES_QUERY, {"ids": targets}).all())
+        post_journal_entries(db, reversal_ids, [categories.get(row.reversal_of_id) for row in reversals])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    summary["first_entry_number"] = reversals[0].entry_number
+    summary["last_entry_number"] = reversals[-1].entry_number
+    return summary
@@ -0,0 +1,175 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from decimal import Decimal
+from typing import Dict, List, Optional
+from datetime import date, datetime, time, timedelta
+from app.models.tenant.chart_of_accounts import AccountType
+from app.services.accounting_service import get_balance_sign
+from app.services.ledger_event_service import EVENT_LINES_SQL
+from app.services.money import LEDGER_EXPONENT
+
+ROLLUP_GRAINS = ("day", "month")
+
+# The rollup cube is a projection of ledger_events (see projection_service), so the
+# projection worker holding its checkpoint lock is the only writer
+APPLY_EVENTS_QUERY = text(f"""
+    INSERT INTO ledger_rollups
+        (grain, bucket_date, chart_account_id, category_id, debit_total, credit_total, line_count, updated_at)
+    SELECT g.grain,
+           CAST(date_trunc(g.grain, e.entry_date) AS DATE),
+           l.chart_account_id,
+           e.category_id,
+           SUM(l.debit) / {10 ** LEDGER_EXPONENT}.0,
+           SUM(l.credit) / {10 ** LEDGER_EXPONENT}.0,
+           SUM(l.line_count),
+           now()
+    FROM ledger_events e
+    CROSS JOIN LATERAL {EVENT_LINES_SQL}
+    CROSS JOIN (VALUES ('day'), ('month')) AS g(grain)
+    WHERE e.id = ANY(:ids)
+      AND e.event_type = 'entry_posted'
+      AND (CAST(:hot_start AS TIMESTAMP) IS NULL OR e.entry_date >= :hot_start)
+    GROUP BY g.grain, CAST(date_trunc(g.grain, e.entry_date) AS DATE), l.chart_account_id, e.category_id
+    ON CONFLICT (grain, bucket_date, chart_account_id, category_id) DO UPDATE
+    SET debit_total = ledger_rollups.debit_total + EXCLUDED.debit_total,
+        credit_total = ledger_rollups.credit_total + EXCLUDED.credit_total,
+        line_count = ledger_rollups.line_count + EXCLUDED.line_count,
+        updated_at = EXCLUDED.updated_at
+""")
+
+def _hot_start(db: Session) -> Optional[datetime]:
+    """
+    Start of the first month after the archive horizon (always a month end). Buckets
+    before it are kept through a replay: months archived before the log existed are in
+    the log only as archived_month totals, without categories.
+    """
+    from app.services.archive_service import get_archive_horizon
+    
+    horizon = get_archive_horizon(db)
+    return datetime.combine(horizon + timedelta(days=1), time.min) if horizon else None
+
+
+def apply_events_to_rollups(db: Session, event_ids: List[int]):
+    """Add the lines of ledger events to the rollup cube in one statement. Does not commit."""
+    db.execute(APPLY_EVENTS_QUERY, {"ids": list(event_ids), "hot_start": _hot_start(db)})
+
+
+def reset_ledger_rollups(db: Session):
+    """Clear the rollup cube after the archive horizon, for a replay of the log. Does not commit."""
+    hot_start = _hot_start(db)
+    db.execute(text("""
+        DELETE FROM ledger_rollups
+        WHERE CAST(:hot_start AS DATE) IS NULL OR bucket_date >= :hot_start
+    """), {"hot_start": hot_start.date() if hot_start else None})
+
+
+def rebuild_ledger_rollups(db: Session) -> int:
+    """
+    Recompute the rollup cube by replaying the event log and commit.
+    Returns the number of rollup rows.
+    """
+    from app.services.projection_service import rebuild_projection
+    
+    rebuild_projection(db, "ledger_rollups")
+    return db.execute(text("SELECT COUNT(*) FROM ledger_rollups")).scalar()
+
+
+def get_dashboard_summary(db: Session, date_from: date, date_to: date, grain: str = "month") -> Dict:
+    """
+    Dashboard totals by account, category and period, read from the rollup cube only.
+    With the month grain, buckets are whole months overlapping the range. The cube
+    trails postings until the projection worker has applied them.
+    """
+    if grain not in ROLLUP_GRAINS:
+        raise ValueError(f"Unsupported grain: {grain}")
+
+    params = {"grain": grain, "date_from": date_from, "date_to": date_to}
+    bucket_filter = """
+        r.grain = :grain
+        AND r.bucket_date >= CAST(date_trunc(:grain, CAST(:date_from AS DATE)) AS DATE)
+        AND r.bucket_date <= :date_to
+    """
+
+    account_rows = db.execute(text(f"""
+        SELECT coa.id AS chart_account_id, coa.account_code, coa.account_name, coa.account_type,
+               SUM(r.debit_total) AS debit_total,
+               SUM(r.credit_total) AS credit_total,
+               SUM(r.line_count) AS line_count
+        FROM ledger_rollups r
+        JOIN chart_of_accounts coa ON coa.id = r.chart_account_id
+        WHERE {bucket_filter}
+        GROUP BY coa.id, coa.account_code, coa.account_name, coa.account_type
+        ORDER BY coa.account_code
+    """), params).all()
+
+    category_rows = db.execute(text(f"""
+        SELECT r.category_id, c.name AS category_name,
+               SUM(r.debit_total) AS debit_total,
+               SUM(r.credit_total) AS credit_total,
+               SUM(r.line_count) AS line_count
+        FROM ledger_rollups r
+        JOIN chart_of_accounts coa ON coa.id = r.chart_account_id
+        LEFT JOIN categories c ON c.id = r.category_id
+        WHERE {bucket_filter}
+          AND coa.account_type IN ('REVENUE', 'EXPENSE')
+        GROUP BY r.category_id, c.name
+        ORDER BY r.category_id
+    """), params).all()
+
+    period_rows = db.execute(text(f"""
+        SELECT r.bucket_date,
+               SUM(CASE WHEN coa.account_type = 'REVENUE'
+                        THEN r.credit_total - r.debit_total ELSE 0 END) AS revenue,
+               SUM(CASE WHEN coa.account_type = 'EXPENSE'
+                        THEN r.debit_total - r.credit_total ELSE 0 END) AS expenses
+        FROM ledger_rollups r
+        JOIN chart_of_accounts coa ON coa.id = r.chart_account_id
+        WHERE {bucket_filter}
+        GROUP BY r.bucket_date
+        ORDER BY r.bucket_date
+    """), params).all()
+
+    by_account = []
+    revenue = Decimal("0.00")
+    expenses = Decimal("0.00")
+    for row in account_rows:
+        account_type = AccountType[row.account_type]  # Enum columns store member names
+        change = get_balance_sign(account_type) * (row.debit_total - row.credit_total)
+        if account_type == AccountType.REVENUE:
+            revenue += change
+        elif account_type == AccountType.EXPENSE:
+            expenses += change
+        by_account.append({
+            "chart_account_id": row.chart_account_id,
+            "account_code": row.account_code,
+            "account_name": row.account_name,
+            "account_type": account_type.value,
+            "debit_total": row.debit_total,
+            "credit_total": row.credit_total,
+            "balance_change": change,
+            "line_count": row.line_count
+        })
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "grain": grain,
+        "revenue": revenue,
+        "expenses": expenses,
+        "net_income": revenue - expenses,
+        "by_account": by_account,
+        "by_category": [
+            {
+                "category_id": row.category_id or None,
+                "category_name": row.category_name,
+                "debit_total": row.debit_total,
+                "credit_total": row.credit_total,
+                "line_count": row.line_count
+            }
+            for row in category_rows
+        ],
+        "by_period": [
+            {"bucket_date": row.bucket_date, "revenue": row.revenue, "expenses": row.expenses}
+            for row in period_rows
+        ]
+    }
@@ -0,0 +1,172 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from decimal import Decimal
+from typing import Dict, List, Optional
+from datetime import date
+from app.models.tenant.account import Account
+from app.services.pagination import decode_cursor, encode_cursor
+
+# Shortest query that has a trigram to look up
+SEARCH_MIN_QUERY_LENGTH = 3
+
+# Rows match when the query is a substring of the description, or when it is at least
+# this similar to some run of words in it (pg_trgm word_similarity), so typos still match
+SEARCH_MIN_WORD_SIMILARITY = 0.5
+
+# One branch per searchable table. Every branch matches on description through the
+# table's trigram GIN index (ILIKE and <% both use it); optional filters are NULL when
+# unset. The score is the word similarity, plus 1 when q is a substring, so exact
+# matches rank first. row_key (id * 3 + the table's position) breaks ties and makes
+# the keyset unique across tables.
+SOURCE_QUERIES = {
+    "transactions": """
+        SELECT 'transactions' AS source, t.id, t.journal_entry_id, t.account_id,
+               a.chart_account_id, t.transaction_date AS entry_date, t.amount, t.description,
+               CAST(word_similarity(:q, t.description)
+                    + CASE WHEN t.description ILIKE :pattern THEN 1 ELSE 0 END AS REAL) AS score,
+               CAST(t.id AS BIGINT) * 3 + 0 AS row_key
+        FROM transactions t
+        JOIN accounts a ON a.id = t.account_id
+        WHERE (t.description ILIKE :pattern OR :q <% t.description)
+          AND (CAST(:account_id AS INTEGER) IS NULL OR t.account_id = :account_id)
+          AND (CAST(:chart_account_id AS INTEGER) IS NULL OR a.chart_account_id = :chart_account_id)
+          AND (CAST(:date_from AS DATE) IS NULL OR t.transaction_date >= :date_from)
+          AND (CAST(:date_to AS DATE) IS NULL OR t.transaction_date <= :date_to)
+          AND (CAST(:min_amount AS NUMERIC) IS NULL OR t.amount >= :min_amount)
+          AND (CAST(:max_amount AS NUMERIC) IS NULL OR t.amount <= :max_amount)
+    """,
+    # An entry's amount is its debit total; the account filter matches any of its lines
+    "journal_entries": """
+        SELECT 'journal_entries' AS source, je.id, je.id AS journal_entry_id,
+               CAST(NULL AS INTEGER) AS account_id, CAST(NULL AS INTEGER) AS chart_account_id,
+               CAST(je.entry_date AS DATE) AS entry_date, totals.amount, je.description,
+               CAST(word_similarity(:q, je.description)
+                    + CASE WHEN je.description ILIKE :pattern THEN 1 ELSE 0 END AS REAL) AS score,
+               CAST(je.id AS BIGINT) * 3 + 1 AS row_key
+        FROM journal_entries je
+        CROSS JOIN LATERAL (
+            SELECT COALESCE(SUM(l.debit_amount), 0) AS amount,
+                   COALESCE(bool_or(l.chart_account_id = :chart_account_id), false) AS has_account
+            FROM journal_entry_lines l
+            WHERE l.journal_entry_id = je.id
+        ) totals
+        WHERE (je.description ILIKE :pattern OR :q <% je.description)
+          AND (CAST(:chart_account_id AS INTEGER) IS NULL OR totals.has_account)
+          AND (CAST(:date_from AS DATE) IS NULL OR je.entry_date >= :date_from)
+          AND (CAST(:date_until AS DATE) IS NULL OR je.entry_date < :date_until)
+          AND (CAST(:min_amount AS NUMERIC) IS NULL OR totals.amount >= :min_amount)
+          AND (CAST(:max_amount AS NUMERIC) IS NULL OR totals.amount <= :max_amount)
+    """,
+    "journal_entry_lines": """
+        SELECT 'journal_entry_lines' AS source, l.id, l.journal_entry_id,
+               CAST(NULL AS INTEGER) AS account_id, l.chart_account_id,
+               CAST(l.entry_date AS DATE) AS entry_date,
+               COALESCE(l.debit_amount, l.credit_amount) AS amount, l.description,
+               CAST(word_similarity(:q, l.description)
+                    + CASE WHEN l.description ILIKE :pattern THEN 1 ELSE 0 END AS REAL) AS score,
+               CAST(l.id AS BIGINT) * 3 + 2 AS row_key
+        FROM journal_entry_lines l
+        WHERE (l.description ILIKE :pattern OR :q <% l.description)
+          AND (CAST(:chart_account_id AS INTEGER) IS NULL OR l.chart_account_id = :chart_account_id)
+          AND (CAST(:date_from AS DATE) IS NULL OR l.entry_date >= :date_from)
+          AND (CAST(:date_until AS DATE) IS NULL OR l.entry_date < :date_until)
+          AND (CAST(:min_amount AS NUMERIC) IS NULL OR COALESCE(l.debit_amount, l.credit_amount) >= :min_amount)
+          AND (CAST(:max_amount AS NUMERIC) IS NULL OR COALESCE(l.debit_amount, l.credit_amount) <= :max_amount)
+    """,
+}
+
+SEARCH_SOURCES = list(SOURCE_QUERIES)
+
+
+def _like_pattern(q: str) -> str:
+    """ILIKE pattern matching q anywhere, with its wildcards escaped"""
+    return "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def search_descriptions(
+    db: Session,
+    q: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    sources: Optional[List[str]] = None,
+    account_id: Optional[int] = None,
+    chart_account_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None
+) -> Dict:
+    """
+    Rows of transactions, journal entries and journal entry lines whose description
+    contains q or closely matches it, best match first, keyset paginated on
+    (score, row key). All filters combine; account_id limits the search to that
+    account's transactions.
+    """
+    q = q.strip()
+    if len(q) < SEARCH_MIN_QUERY_LENGTH:
+        raise ValueError(f"Search query must be at least {SEARCH_MIN_QUERY_LENGTH} characters")
+    sources = sources or list(SEARCH_SOURCES)
+    unknown = [source for source in sources if source not in SEARCH_SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown search source: {unknown[0]}")
+    if account_id:
+        # Journal rows are not tied to a physical account
+        if not db.query(Account.id).filter(Account.id == account_id).first():
+            raise ValueError(f"Account {account_id} not found")
+        sources = [source for source in sources if source == "transactions"]
+    if not sources:
+        return {"items": [], "next_cursor": None}
+
+    seek = ""
+    params = {
+        "q": q,
+        "pattern": _like_pattern(q),
+        "account_id": account_id,
+        "chart_account_id": chart_account_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "date_until": date.fromordinal(date_to.toordinal() + 1) if date_to else None,
+        "min_amount": min_amount,
+        "max_amount": max_amount,
+        "limit": limit + 1
+    }
+    if cursor:
+        params["cursor_score"], params["cursor_key"] = decode_cursor(cursor, float)
+        seek = "WHERE (score, row_key) < (CAST(:cursor_score AS REAL), :cursor_key)"
+
+    # <% compares against the word similarity threshold of this transaction
+    db.execute(
+        text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+        {"threshold": str(SEARCH_MIN_WORD_SIMILARITY)}
+    )
+    rows = db.execute(text(f"""
+        SELECT * FROM (
+            {" UNION ALL ".join(SOURCE_QUERIES[source] for source in sources)}
+        ) matches
+        {seek}
+        ORDER BY score DESC, row_key DESC
+        LIMIT :limit
+    """), params).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].score, rows[-1].row_key)
+
+    return {
+        "items": [
+            {
+                "source": row.source,
+                "id": row.id,
+                "journal_entry_id": row.journal_entry_id,
+                "account_id": row.account_id,
+                "chart_account_id": row.chart_account_id,
+                "entry_date": row.entry_date,
+                "amount": row.amount,
+                "description": row.description,
+                "score": round(float(row.score), 4)
+            }
+            for row in rows
+        ],
+        "next_cursor": next_cursor
+    }
@@ -0,0 +1,247 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from decimal import Decimal
+from typing import Dict, Iterator, Optional
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+import json
+from app.models.tenant.account import Account
+from app.models.tenant.chart_of_accounts import ChartOfAccount
+from app.services.accounting_service import get_opening_balance, get_balance_sign
+from app.services.archive_service import get_archive_horizon, iter_archived_lines
+
+# Rows fetched per round trip from the server-side cursor, and archived lines whose
+# entries are looked up together
+STATEMENT_FETCH_SIZE = 1000
+
+# Entries posted for the account: its own transactions and their reversals. Lines on a
+# chart account that several accounts share are kept to these.
+ACCOUNT_ENTRY = """
+    EXISTS (
+        SELECT 1 FROM transactions own
+        WHERE own.account_id = :account_id
+          AND own.journal_entry_id IN (je.id, je.reversal_of_id)
+    )
+"""
+
+ARCHIVED_ENTRY_QUERY = text(f"""
+    SELECT je.id, je.entry_number, je.description, t.id AS transaction_id,
+           {ACCOUNT_ENTRY} AS for_account
+    FROM journal_entries je
+    LEFT JOIN transactions t ON t.journal_entry_id = je.id AND t.account_id = :account_id
+    WHERE je.id = ANY(:ids)
+""")
+
+ACCOUNT_OPENING_QUERY = text(f"""
+    SELECT COALESCE(SUM(COALESCE(l.debit_amount, 0) - COALESCE(l.credit_amount, 0)), 0)
+    FROM journal_entry_lines l
+    JOIN journal_entries je ON je.id = l.journal_entry_id
+    WHERE l.chart_account_id = :chart_account_id
+      AND je.is_posted
+      AND l.entry_date < :before
+      AND {ACCOUNT_ENTRY}
+""")
+
+STATEMENT_QUERY = """
+    SELECT l.id AS line_id,
+           l.entry_date,
+           je.entry_number,
+           l.journal_entry_id,
+           t.id AS transaction_id,
+           COALESCE(l.description, je.description) AS description,
+           l.debit_amount,
+           l.credit_amount,
+           :opening_balance + :sign * SUM(COALESCE(l.debit_amount, 0) - COALESCE(l.credit_amount, 0))
+               OVER (ORDER BY l.entry_date, l.id ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW)
+               AS running_balance
+    FROM journal_entry_lines l
+    JOIN journal_entries je ON je.id = l.journal_entry_id
+    LEFT JOIN transactions t ON t.journal_entry_id = l.journal_entry_id AND t.account_id = :account_id
+    WHERE l.chart_account_id = :chart_account_id
+      AND je.is_posted
+      AND l.entry_date >= :period_start
+      AND l.entry_date < :period_end
+      {account_filter}
+    ORDER BY l.entry_date, l.id
+"""
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def get_statement_account(db: Session, account_id: int) -> tuple:
+    """Return (account, chart_account) or raise ValueError"""
+    account = db.query(Account).filter(Account.id == account_id).first()
+    if not account:
+        raise ValueError(f"Account {account_id} not found")
+
+    chart_account = db.query(ChartOfAccount).filter(
+        ChartOfAccount.id == account.chart_account_id
+    ).first()
+    if not chart_account:
+        raise ValueError(f"Chart account {account.chart_account_id} not found")
+
+    return account, chart_account
+
+
+def _shares_chart_account(db: Session, account: Account) -> bool:
+    """Whether other accounts post to the account's chart account too"""
+    return db.query(Account.id).filter(
+        Account.chart_account_id == account.chart_account_id,
+        Account.id != account.id
+    ).first() is not None
+
+
+def _archived_account_lines(
+    db: Session,
+    account: Account,
+    chart_account: ChartOfAccount,
+    date_from: Optional[date],
+    date_to: date,
+    shared: bool
+) -> Iterator[tuple]:
+    """
+    (line, entry) of archived lines within [date_from, date_to], oldest first, kept to
+    the account's entries when the chart account is shared. Entries are looked up per
+    STATEMENT_FETCH_SIZE lines, so only that many lines are held at a time.
+    """
+    lines = iter_archived_lines(db, chart_account.id, date_from, date_to)
+    while True:
+        chunk = list(islice(lines, STATEMENT_FETCH_SIZE))
+        if not chunk:
+            return
+        entries = {
+            row.id: row
+            for row in db.execute(ARCHIVED_ENTRY_QUERY, {
+                "account_id": account.id,
+                "ids": list({line["journal_entry_id"] for line in chunk})
+            }).all()
+        }
+        for line in chunk:
+            entry = entries[line["journal_entry_id"]]
+            if not shared or entry.for_account:
+                yield line, entry
+
+
+def _account_opening_balance(
+    db: Session,
+    account: Account,
+    chart_account: ChartOfAccount,
+    before: date,
+    shared: bool
+) -> Decimal:
+    """Balance of the account from its posted lines dated before `before`"""
+    if not shared:
+        return get_opening_balance(db, chart_account, before)
+
+    # Another account's lines are mixed into the chart account's snapshots and archive
+    # totals, so the account's own lines are summed
+    net = db.execute(ACCOUNT_OPENING_QUERY, {
+        "account_id": account.id,
+        "chart_account_id": chart_account.id,
+        "before": datetime.combine(before, time.min)
+    }).scalar()
+    horizon = get_archive_horizon(db)
+    if horizon is not None:
+        archive_to = min(before - timedelta(days=1), horizon)
+        for line, _ in _archived_account_lines(db, account, chart_account, None, archive_to, True):
+            net += (line["debit_amount"] or 0) - (line["credit_amount"] or 0)
+    return get_balance_sign(chart_account.account_type) * net
+
+
+def _archived_statement_lines(
+    db: Session,
+    account: Account,
+    chart_account: ChartOfAccount,
+    date_from: date,
+    date_to: date,
+    opening_balance: Decimal,
+    shared: bool
+) -> Iterator[Dict]:
+    """Statement lines for an archived date range, in the same shape as STATEMENT_QUERY rows"""
+    sign = get_balance_sign(chart_account.account_type)
+    running_balance = opening_balance
+    for line, entry in _archived_account_lines(db, account, chart_account, date_from, date_to, shared):
+        running_balance += sign * ((line["debit_amount"] or 0) - (line["credit_amount"] or 0))
+        yield {
+            "line_id": line["id"],
+            "entry_date": line["entry_date"],
+            "entry_number": entry.entry_number,
+            "journal_entry_id": line["journal_entry_id"],
+            "transaction_id": entry.transaction_id,
+            "description": line["description"] or entry.description,
+            "debit_amount": line["debit_amount"],
+            "credit_amount": line["credit_amount"],
+            "running_balance": running_balance,
+        }
+
+
+def stream_account_statement(
+    db: Session,
+    account: Account,
+    chart_account: ChartOfAccount,
+    date_from: date,
+    date_to: date
+) -> Iterator[str]:
+    """
+    Stream a bank-style statement as JSON chunks.
+    The opening balance is computed once; running balances come from a window
+    function read through a server-side cursor, so memory use does not grow
+    with the number of lines. Archived months are served from the archive.
+    When other accounts share the chart account, only entries posted for this
+    account (its transactions and their reversals) are included.
+    """
+    shared = _shares_chart_account(db, account)
+    opening_balance = _account_opening_balance(db, account, chart_account, date_from, shared)
+    closing_balance = opening_balance
+
+    header = {
+        "account_id": account.id,
+        "account_name": account.name,
+        "chart_account_id": chart_account.id,
+        "currency": account.currency,
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "opening_balance": str(opening_balance),
+    }
+    yield json.dumps(header)[:-1] + ', "lines": ['
+
+    # Lines from archived months are read lazily from the archive, then the statement
+    # continues from the hot table after the horizon
+    first = True
+    hot_start = date_from
+    horizon = get_archive_horizon(db)
+    if horizon is not None and date_from <= horizon:
+        for line in _archived_statement_lines(
+            db, account, chart_account, date_from, min(date_to, horizon), opening_balance, shared
+        ):
+            closing_balance = line["running_balance"]
+            yield ("" if first else ",") + json.dumps({key: _json_value(value) for key, value in line.items()})
+            first = False
+        hot_start = horizon + timedelta(days=1)
+
+    result = db.execute(
+        text(STATEMENT_QUERY.format(account_filter=f"AND {ACCOUNT_ENTRY}" if shared else "")),
+        {
+            "opening_balance": closing_balance,
+            "sign": get_balance_sign(chart_account.account_type),
+            "account_id": account.id,
+            "chart_account_id": chart_account.id,
+            "period_start": datetime.combine(hot_start, time.min),
+            "period_end": datetime.combine(date_to + timedelta(days=1), time.min),
+        },
+        execution_options={"stream_results": True, "yield_per": STATEMENT_FETCH_SIZE}
+    )
+
+    for row in result:
+        line = {key: _json_value(value) for key, value in row._mapping.items()}
+        closing_balance = row.running_balance
+        yield ("" if first else ",") + json.dumps(line)
+        first = False
+
+    yield '], "closing_balance": ' + json.dumps(str(closing_balance)) + "}"
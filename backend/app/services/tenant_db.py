@@ -11,11 +11,175 @@ from app.models.tenant.journal_entry import JournalEntry
 from app.models.tenant.journal_entry_line import JournalEntryLine
 from app.models.tenant.transaction import Transaction
 from app.models.tenant.category import Category
-from sqlalchemy import create_engine
+from app.models.tenant.balance_snapshot import AccountBalanceSnapshot
+from app.models.tenant.ledger_rollup import LedgerRollup
+from app.models.tenant.loan import Loan, LoanPayment
+from app.models.tenant.fixed_asset import FixedAsset, DepreciationRun, AssetDepreciation
+from app.models.tenant.period_close import PeriodClose
+from app.models.tenant.ledger_archive import LedgerArchiveBatch, LedgerArchiveRun
+from app.models.tenant.reconciliation import BankStatementLine, ReconciliationLink
+from app.models.tenant.idempotency_key import IdempotencyKey
+from app.models.tenant.posting_queue import PostingQueueItem
+from app.models.tenant.fx_rate import FxRate
+from app.models.tenant.ledger_event import LedgerEvent, ProjectionCheckpoint
+from app.models.tenant.projected_balance import ProjectedBalance
+from app.models.tenant.chain_verification import ChainVerification
+from app.models.tenant.recurring_transaction import RecurringTransaction, RecurringOccurrence
+from app.models.tenant.budget import Budget
+from app.models.tenant.categorization_rule import CategorizationRule
+from app.models.tenant.transaction_anomaly import TransactionAnomaly, AnomalyScan
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.services.partition_service import apply_partitioning
+from app.services.dedup_service import TRANSACTION_HASH_SQL
+from app.services.ledger_event_service import CURRENT_XACT_SQL, ENTRY_LINES_JSON_SQL
+from app.services.money import LEDGER_EXPONENT
 from typing import Optional
 
+# Extensions the tenant schema depends on (e.g. pg_trgm for the trigram indexes),
+# created before any table or index
+TENANT_EXTENSIONS = ["pg_trgm"]
+
+# Idempotent DDL applied to existing tenant databases after create_all.
+# create_all only creates missing tables, so new columns on existing tables
+# and their backfills have to be listed here.
+TENANT_SCHEMA_UPGRADES = [
+    # Denormalized entry_date on journal_entry_lines for keyset ledger listing
+    "ALTER TABLE journal_entry_lines ADD COLUMN IF NOT EXISTS entry_date TIMESTAMP",
+    """
+    UPDATE journal_entry_lines l
+    SET entry_date = je.entry_date
+    FROM journal_entries je
+    WHERE l.journal_entry_id = je.id AND l.entry_date IS NULL
+    """,
+    "ALTER TABLE journal_entry_lines ALTER COLUMN entry_date SET NOT NULL",
+    # Content fingerprint on transactions. Only the first row of each existing duplicate
+    # group gets a hash, so the unique index can be built; the rest show up in duplicate scans.
+    "ALTER TABLE transactions ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+    f"""
+    UPDATE transactions t
+    SET content_hash = h.content_hash
+    FROM (
+        SELECT id, content_hash,
+               ROW_NUMBER() OVER (
+                   PARTITION BY account_id, transaction_date, content_hash
+                   ORDER BY has_hash DESC, id
+               ) AS position
+        FROM (
+            SELECT id, account_id, transaction_date, content_hash IS NOT NULL AS has_hash,
+                   {TRANSACTION_HASH_SQL} AS content_hash
+            FROM transactions
+        ) hashed
+    ) h
+    WHERE t.id = h.id AND h.position = 1 AND t.content_hash IS NULL
+    """,
+    # Rollup counter slots are gone (the cube has one writer, the projection worker):
+    # fold slot rows back into slot 0, then return to one row per key
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'ledger_rollups' AND column_name = 'slot'
+        ) THEN
+            WITH moved AS (
+                DELETE FROM ledger_rollups WHERE slot > 0
+                RETURNING grain, bucket_date, chart_account_id, category_id, debit_total, credit_total, line_count
+            )
+            INSERT INTO ledger_rollups
+                (grain, bucket_date, chart_account_id, category_id, slot, debit_total, credit_total, line_count, updated_at)
+            SELECT grain, bucket_date, chart_account_id, category_id, 0,
+                   SUM(debit_total), SUM(credit_total), SUM(line_count), now()
+            FROM moved
+            GROUP BY grain, bucket_date, chart_account_id, category_id
+            ON CONFLICT (grain, bucket_date, chart_account_id, category_id, slot) DO UPDATE
+            SET debit_total = ledger_rollups.debit_total + EXCLUDED.debit_total,
+                credit_total = ledger_rollups.credit_total + EXCLUDED.credit_total,
+                line_count = ledger_rollups.line_count + EXCLUDED.line_count,
+                updated_at = EXCLUDED.updated_at;
+            ALTER TABLE ledger_rollups DROP CONSTRAINT IF EXISTS uq_ledger_rollup_slot_key;
+            ALTER TABLE ledger_rollups DROP COLUMN slot;
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_ledger_rollup_key') THEN
+            ALTER TABLE ledger_rollups ADD CONSTRAINT uq_ledger_rollup_key
+                UNIQUE (grain, bucket_date, chart_account_id, category_id);
+        END IF;
+    END $$
+    """,
+    # The ledger event log is append-only
+    """
+    CREATE OR REPLACE FUNCTION ledger_events_append_only() RETURNS trigger AS $$
+    BEGIN
+        RAISE EXCEPTION 'ledger_events is append-only';
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER ledger_events_no_change
+    BEFORE UPDATE OR DELETE ON ledger_events
+    FOR EACH ROW EXECUTE FUNCTION ledger_events_append_only()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER ledger_events_no_truncate
+    BEFORE TRUNCATE ON ledger_events
+    FOR EACH STATEMENT EXECUTE FUNCTION ledger_events_append_only()
+    """,
+    # Journal entry numbers come from a sequence, started after the highest existing number
+    "CREATE SEQUENCE IF NOT EXISTS journal_entry_number_seq",
+    """
+    SELECT setval('journal_entry_number_seq', GREATEST(m.max_number, s.last_value), m.max_number > 0 OR s.is_called)
+    FROM (
+        SELECT COALESCE(MAX(CAST(substring(entry_number FROM '([0-9]+)$') AS BIGINT)), 0) AS max_number
+        FROM journal_entries
+    ) m, journal_entry_number_seq s
+    """,
+    # Link from a reversal entry to the entry it reverses
+    "ALTER TABLE journal_entries ADD COLUMN IF NOT EXISTS reversal_of_id INTEGER REFERENCES journal_entries(id)",
+    # Hash chain over posted journal entries, sealed by the hash_chain projection
+    "ALTER TABLE journal_entries ADD COLUMN IF NOT EXISTS chain_position BIGINT",
+    "ALTER TABLE journal_entries ADD COLUMN IF NOT EXISTS chain_hash VARCHAR(64)",
+    # Seed an empty log with the existing ledger: archived months as per-account totals,
+    # then every posted entry. The rollup cube already contains all of it, so its
+    # checkpoint starts after the seed; other projections replay it.
+    f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM ledger_events) THEN
+            INSERT INTO ledger_events (xact_id, event_type, journal_entry_id, category_id, entry_date, lines, recorded_at)
+            SELECT {CURRENT_XACT_SQL}, 'archived_month', NULL, 0, b.month_start,
+                   json_build_array(json_build_object(
+                       'chart_account_id', b.chart_account_id,
+                       'debit', CAST(round(b.total_debits * {10 ** LEDGER_EXPONENT}) AS BIGINT),
+                       'credit', CAST(round(b.total_credits * {10 ** LEDGER_EXPONENT}) AS BIGINT),
+                       'line_count', b.line_count
+                   )),
+                   now()
+            FROM ledger_archive_batches b
+            ORDER BY b.month_start, b.chart_account_id;
+            
+            INSERT INTO ledger_events (xact_id, event_type, journal_entry_id, category_id, entry_date, lines, recorded_at)
+            SELECT {CURRENT_XACT_SQL}, 'entry_posted', je.id, COALESCE(t.category_id, 0), je.entry_date, lines.lines, now()
+            FROM journal_entries je
+            CROSS JOIN LATERAL ({ENTRY_LINES_JSON_SQL}) AS lines(lines)
+            LEFT JOIN LATERAL (
+                SELECT category_id FROM transactions
+                WHERE journal_entry_id = je.id
+                ORDER BY id
+                LIMIT 1
+            ) t ON true
+            WHERE je.is_posted AND lines.lines IS NOT NULL
+            ORDER BY je.id;
+            
+            INSERT INTO projection_checkpoints (name, xact_id, event_id, updated_at)
+            SELECT 'ledger_rollups', {CURRENT_XACT_SQL}, COALESCE(MAX(id), 0), now()
+            FROM ledger_events
+            ON CONFLICT (name) DO NOTHING;
+        END IF;
+    END $$
+    """,
+]
+
 def create_tenant_database(company_id: int, company_slug: str, db: Session) -> Optional[str]:
     """Create tenant database and initialize schema"""
     company = db.query(Company).filter(Company.id == company_id).first()
@@ -32,7 +196,7 @@ def create_tenant_database(company_id: int, company_slug: str, db: Session) -> O
     tenant_engine = create_engine(connection_string, echo=False)
     
     # Create all tenant tables (including financial models)
-    TenantBase.metadata.create_all(bind=tenant_engine)
+    upgrade_tenant_schema(tenant_engine)
     
     # Initialize default roles and permissions
     initialize_tenant_rbac(tenant_engine, company_id)
@@ -42,6 +206,30 @@ def create_tenant_database(company_id: int, company_slug: str, db: Session) -> O
     
     return database_name
 
+def upgrade_tenant_schema(engine):
+    """
+    Create missing tenant tables and indexes, then apply idempotent schema upgrades.
+    With TENANT_PARTITION_INTERVAL set, ledger tables are partitioned in place and
+    partitions are rolled forward.
+    """
+    with engine.begin() as conn:
+        for extension in TENANT_EXTENSIONS:
+            conn.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+    
+    TenantBase.metadata.create_all(bind=engine)
+    
+    with engine.begin() as conn:
+        for statement in TENANT_SCHEMA_UPGRADES:
+            conn.execute(text(statement))
+        
+        if settings.TENANT_PARTITION_INTERVAL:
+            apply_partitioning(conn, settings.TENANT_PARTITION_INTERVAL)
+        
+        # create_all skips indexes on tables that already exist
+        for table in TenantBase.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
 def initialize_tenant_rbac(engine, company_id: int):
     """Initialize default RBAC roles and permissions for a tenant"""
     TenantSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
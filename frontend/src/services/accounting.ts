@@ -0,0 +1,47 @@
+import api from './api'
+
+export interface DashboardAccountTotal {
+  chart_account_id: number
+  account_code: string
+  account_name: string
+  account_type: string
+  debit_total: string
+  credit_total: string
+  balance_change: string
+  line_count: number
+}
+
+export interface DashboardCategoryTotal {
+  category_id: number | null
+  category_name: string | null
+  debit_total: string
+  credit_total: string
+  line_count: number
+}
+
+export interface DashboardPeriodTotal {
+  bucket_date: string
+  revenue: string
+  expenses: string
+}
+
+export interface DashboardSummary {
+  date_from: string
+  date_to: string
+  grain: 'day' | 'month'
+  revenue: string
+  expenses: string
+  net_income: string
+  by_account: DashboardAccountTotal[]
+  by_category: DashboardCategoryTotal[]
+  by_period: DashboardPeriodTotal[]
+}
+
+export const accountingService = {
+  async getDashboardSummary(dateFrom: string, dateTo: string, grain: 'day' | 'month' = 'month'): Promise<DashboardSummary> {
+    const response = await api.get<DashboardSummary>('/api/accounting/dashboard/summary', {
+      params: { date_from: dateFrom, date_to: dateTo, grain }
+    })
+    return response.data
+  }
+}